@@ -55,8 +55,10 @@ export const api = {
     },
 
     // History
-    getHistory: (page = 1, limit = 20) =>
-        client.get(`/api/history?page=${page}&limit=${limit}`),
+    // Pass the previous page's next_cursor to fetch the following page;
+    // view "summary" skips the description and treatment text
+    getHistory: (limit = 20, cursor = null, view = "full") =>
+        client.get(`/api/history?limit=${limit}&view=${view}${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ""}`),
 
     // Diseases
     getDiseases: (crop) =>
@@ -28,6 +28,8 @@ const History = () => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState("");
     const [page, setPage] = useState(1);
+    // cursors[n] fetches page n + 1; page 1 needs no cursor
+    const [cursors, setCursors] = useState([null]);
 
     useEffect(() => {
         if (!isAuthenticated) {
@@ -40,9 +42,14 @@ const History = () => {
     const fetchHistory = async () => {
         setLoading(true);
         try {
-            const res = await api.getHistory(page, 10);
+            const res = await api.getHistory(10, cursors[page - 1], "summary");
             setPredictions(res.data.predictions);
             setTotal(res.data.total);
+            setCursors((prev) => {
+                const next = prev.slice(0, page);
+                next[page] = res.data.next_cursor;
+                return next;
+            });
         } catch (err) {
             setError("Failed to load history. Please try again.");
         } finally {
@@ -186,7 +193,7 @@ const History = () => {
                                     </Button>
                                     <Button
                                         variant="outlined"
-                                        disabled={page * 10 >= total}
+                                        disabled={!cursors[page]}
                                         onClick={() => setPage((p) => p + 1)}
                                     >
                                         Next
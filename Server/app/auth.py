@@ -1,9 +1,8 @@
 """
-JWT authentication and password hashing.
+JWT authentication.  Password hashing lives in app/services/passwords.py;
+hash_password / verify_password are re-exported here for existing callers.
 """
 
-import hashlib
-import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -11,63 +10,69 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 
-from app.config import JWT_SECRET, JWT_ALGORITHM, JWT_EXPIRE_MINUTES
+from app.config import JWT_SECRET, JWT_ALGORITHM, JWT_EXPIRE_MINUTES, AUTH_TRUST_JWT_CLAIMS
 from app.database import get_db
-
-
-# ── Password hashing (hashlib — Python 3.14 compatible) ──────────────
-def hash_password(password: str) -> str:
-    salt = secrets.token_hex(16)
-    pw_hash = hashlib.sha256(f"{salt}{password}".encode()).hexdigest()
-    return f"{salt}${pw_hash}"
-
-
-def verify_password(plain: str, hashed: str) -> bool:
-    try:
-        salt, pw_hash = hashed.split("$", 1)
-        return hashlib.sha256(f"{salt}{plain}".encode()).hexdigest() == pw_hash
-    except ValueError:
-        return False
+from app.services.passwords import hash_password, verify_password  # noqa: F401 — re-exported
+from app.services.token_cache import token_cache
+from app.services.user_cache import user_cache
 
 
 # ── JWT tokens ────────────────────────────────────────────────────────
-def create_access_token(user_id: str, email: str, name: str) -> str:
+def create_access_token(user_id: str, email: str, name: str, role: str = "farmer") -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=JWT_EXPIRE_MINUTES)
     payload = {
         "sub": user_id,
         "email": email,
         "name": name,
+        "role": role,
         "exp": expire,
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
 def decode_token(token: str) -> dict:
+    if token_cache is not None:
+        claims = token_cache.get(token)
+        if claims is not None:
+            return claims
+
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        claims = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
 
+    if token_cache is not None:
+        token_cache.put(token, claims)
+    return claims
+
 
 # ── FastAPI dependency ────────────────────────────────────────────────
 security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-):
-    """Return the current user dict or None if no token provided."""
-    if credentials is None:
-        return None
-
-    payload = decode_token(credentials.credentials)
+async def _load_principal(token: str) -> dict:
+    """Decode the JWT and return the user it belongs to (without password hash)."""
+    payload = decode_token(token)
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
+    if AUTH_TRUST_JWT_CLAIMS:
+        return {
+            "_id": user_id,
+            "email": payload.get("email"),
+            "name": payload.get("name"),
+            "role": payload.get("role", "farmer"),
+        }
+
+    if user_cache is not None:
+        cached = user_cache.get(user_id)
+        if cached is not None:
+            return cached
+
     db = get_db()
     from bson import ObjectId
 
@@ -76,24 +81,23 @@ async def get_current_user(
         raise HTTPException(status_code=401, detail="User not found")
 
     user["_id"] = str(user["_id"])
+    user.pop("password_hash", None)
+    if user_cache is not None:
+        user_cache.put(user_id, user)
     return user
 
 
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+):
+    """Return the current user dict or None if no token provided."""
+    if credentials is None:
+        return None
+    return await _load_principal(credentials.credentials)
+
+
 async def require_auth(
     credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
 ):
     """Strict auth — raises 401 if no token."""
-    payload = decode_token(credentials.credentials)
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Invalid token payload")
-
-    db = get_db()
-    from bson import ObjectId
-
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    user["_id"] = str(user["_id"])
-    return user
+    return await _load_principal(credentials.credentials)
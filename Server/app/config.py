@@ -17,15 +17,81 @@ DATABASE_NAME = os.getenv("DATABASE_NAME", "cropguard")
 JWT_SECRET = os.getenv("JWT_SECRET", "cropguard-hackathon-secret-key-change-in-prod")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "1440"))  # 24 hours
+# Build the request principal from signed token claims (no MongoDB lookup).
+# Role/name changes then only take effect when the user's token is reissued.
+AUTH_TRUST_JWT_CLAIMS = os.getenv("AUTH_TRUST_JWT_CLAIMS", "false").lower() == "true"
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))  # cached principals, 0 disables
+# Cached principals are never invalidated, so this is how long a deleted or
+# demoted user can keep authenticating (with AUTH_TRUST_JWT_CLAIMS=false).
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))  # seconds
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))  # verified tokens, 0 disables
+
+# ── Password hashing ─────────────────────────────────────────────────
+PASSWORD_KDF = os.getenv("PASSWORD_KDF", "scrypt").lower()  # "scrypt" | "pbkdf2"
+SCRYPT_N = int(os.getenv("SCRYPT_N", "16384"))  # CPU/memory cost (power of two; 128·N·r bytes)
+SCRYPT_R = int(os.getenv("SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("SCRYPT_P", "1"))
+PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", "600000"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "64"))  # logins beyond → 503
 
 # ── ML Model ─────────────────────────────────────────────────────────
 MODEL_PATH = os.getenv("MODEL_PATH", str(MODEL_DIR / "crop_disease_model.pt"))
 CLASS_MAP_PATH = os.getenv("CLASS_MAP_PATH", str(MODEL_DIR / "class_map.json"))
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torchscript")  # torchscript / onnx
+ONNX_MODEL_PATH = os.getenv("ONNX_MODEL_PATH", str(MODEL_DIR / "crop_disease_model.onnx"))
+MODEL_VARIANT = os.getenv("MODEL_VARIANT", "fp32")  # fp32 / int8
+QUANTIZED_MODEL_PATH = os.getenv("QUANTIZED_MODEL_PATH", str(MODEL_DIR / "crop_disease_model.int8.onnx"))
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "0"))  # seconds between model-file polls, 0 = off
+ORT_INTRA_OP_THREADS = int(os.getenv("ORT_INTRA_OP_THREADS", "0"))  # 0 = onnxruntime default
+ORT_INTER_OP_THREADS = int(os.getenv("ORT_INTER_OP_THREADS", "0"))
 CONFIDENCE_THRESHOLD = float(os.getenv("CONFIDENCE_THRESHOLD", "0.40"))
+RESIZE_MODE = os.getenv("RESIZE_MODE", "lanczos")  # lanczos / bilinear / reduce_bilinear / torch
+
+# ── Inference batching ───────────────────────────────────────────────
+INFERENCE_BATCHING = os.getenv("INFERENCE_BATCHING", "true").lower() == "true"
+INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "8"))
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "5"))
+BATCH_FORWARD_SIZE = int(os.getenv("BATCH_FORWARD_SIZE", "16"))  # images per forward pass in batch uploads
+WARMUP_ITERATIONS = int(os.getenv("WARMUP_ITERATIONS", "3"))  # synthetic passes per batch size before ready
+TORCHSCRIPT_OPTIMIZE = os.getenv("TORCHSCRIPT_OPTIMIZE", "true").lower() == "true"  # jit.freeze + optimize_for_inference
+
+# ── Inference workers ────────────────────────────────────────────────
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")  # thread / process
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "4"))
+INFERENCE_TORCH_THREADS = int(os.getenv("INFERENCE_TORCH_THREADS", "0"))  # 0 = torch default
+INFERENCE_QUEUE_LIMIT = int(os.getenv("INFERENCE_QUEUE_LIMIT", "32"))
+INFERENCE_RETRY_AFTER = int(os.getenv("INFERENCE_RETRY_AFTER", "2"))  # seconds
+
+# ── Readiness probe (/readyz) ────────────────────────────────────────
+READINESS_CACHE_TTL = float(os.getenv("READINESS_CACHE_TTL", "1"))  # seconds a MongoDB ping result is reused
+READINESS_DB_TIMEOUT_MS = float(os.getenv("READINESS_DB_TIMEOUT_MS", "500"))
+READINESS_MAX_DB_LATENCY_MS = float(os.getenv("READINESS_MAX_DB_LATENCY_MS", "250"))
+READINESS_MAX_QUEUE_DEPTH = int(os.getenv("READINESS_MAX_QUEUE_DEPTH", str(INFERENCE_QUEUE_LIMIT)))
+
+# ── Prediction cache ─────────────────────────────────────────────────
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "2048"))  # 0 disables
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", str(24 * 3600)))  # seconds
+PREDICTION_CACHE_DB = os.getenv("PREDICTION_CACHE_DB", "")  # SQLite path, empty = memory only
+NEAR_DUP_THRESHOLD = int(os.getenv("NEAR_DUP_THRESHOLD", "12"))  # max Hamming distance of 256 bits, -1 disables
+NEAR_DUP_CACHE_SIZE = int(os.getenv("NEAR_DUP_CACHE_SIZE", "4096"))  # 0 disables
+NEAR_DUP_TTL = float(os.getenv("NEAR_DUP_TTL", "3600"))  # seconds
+
+# ── History ───────────────────────────────────────────────────────────
+HISTORY_TOTAL_TTL = float(os.getenv("HISTORY_TOTAL_TTL", "60"))  # cached per-user total, 0 = count every page
 
 # ── Upload ────────────────────────────────────────────────────────────
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024)))  # 10 MB
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "50"))  # images per /api/predict/batch
+BATCH_MAX_ZIP_BYTES = int(os.getenv("BATCH_MAX_ZIP_BYTES", str(200 * 1024 * 1024)))  # uncompressed, per zip
+STREAM_MAX_FILES = int(os.getenv("STREAM_MAX_FILES", "500"))  # images per /api/predict/batch/stream
+STREAM_MAX_INFLIGHT = int(os.getenv("STREAM_MAX_INFLIGHT", "8"))  # images buffered/predicting at once
+STREAM_HISTORY_FLUSH = int(os.getenv("STREAM_HISTORY_FLUSH", "20"))  # history docs per insert_many
+DECODE_OVERSAMPLE = int(os.getenv("DECODE_OVERSAMPLE", "2"))  # decoded size ≥ N × model input
+
+# ── Disease catalogue ────────────────────────────────────────────────
+CATALOGUE_MAX_AGE = int(os.getenv("CATALOGUE_MAX_AGE", "86400"))  # Cache-Control max-age (s); ETag revalidates after
 
 # ── Server ────────────────────────────────────────────────────────────
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
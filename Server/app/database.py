@@ -4,6 +4,7 @@ MongoDB connection using Motor (async driver).
 
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.config import MONGODB_URI, DATABASE_NAME
+from app.services.indexes import ensure_indexes
 
 client: AsyncIOMotorClient = None
 db = None
@@ -15,11 +16,8 @@ async def connect_db():
     client = AsyncIOMotorClient(MONGODB_URI)
     db = client[DATABASE_NAME]
 
-    # Create indexes
-    await db.users.create_index("email", unique=True)
-    await db.predictions.create_index("user_id")
-    await db.predictions.create_index("created_at")
-    await db.diseases.create_index("disease_name", unique=True)
+    # Indexes per query shape (app/services/indexes.py)
+    await ensure_indexes(db)
 
     print(f"✅ Connected to MongoDB: {DATABASE_NAME}")
 
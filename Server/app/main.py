@@ -6,11 +6,21 @@ import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.config import CORS_ORIGINS, LOG_LEVEL
+from app.config import CORS_ORIGINS, LOG_LEVEL, INFERENCE_EXECUTOR
 from app.database import connect_db, close_db
-from app.services.ml_service import load_model, is_model_loaded
+from app.services.ml_service import (
+    load_model, warm_up_model, watch_worker_model, is_model_loaded, shutdown, refresh_serving_stats,
+)
+from app.services.executor import start_executor, warm_up_executor, shutdown_executor, get_executor_stats, queue_depth
+from app.services.metrics import GaugeFunction, render_metrics
+from app.services.health import liveness, readiness
+from app.services.startup import phase, mark_ready, mark_not_ready, is_ready, get_startup_report
+from app.services.passwords import shutdown_password_pool, get_password_stats
+from app.services.token_cache import token_cache
+from app.services.user_cache import get_auth_stats
 
 # ── Logging ───────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -28,19 +38,41 @@ async def lifespan(app: FastAPI):
     logger.info("🌱 Starting CropGuard AI...")
 
     # Connect to MongoDB
-    await connect_db()
+    with phase("mongodb"):
+        await connect_db()
     logger.info("✅ MongoDB connected")
 
-    # Load ML model
-    model_loaded = load_model()
-    if model_loaded:
+    # With the process executor each pool worker loads its own model (executor phase)
+    if INFERENCE_EXECUTOR != "process":
+        # Load ML model (includes TorchScript freeze/optimize)
+        with phase("model_load"):
+            load_model()
+
+        # Synthetic passes so the first real request runs at steady-state speed
+        with phase("warm_up"):
+            warm_up_model()
+
+    # Inference runs off the event loop
+    with phase("executor"):
+        start_executor()
+        warm_up_executor()
+    if INFERENCE_EXECUTOR == "process":
+        watch_worker_model()
+
+    if is_model_loaded():
         logger.info("✅ ML model loaded — real inference active")
     else:
         logger.info("🎭 ML model not found — running in DEMO mode")
 
+    mark_ready()
+
     yield
 
     # Shutdown
+    mark_not_ready()
+    shutdown_executor()
+    shutdown_password_pool()
+    shutdown()
     await close_db()
     logger.info("👋 CropGuard AI shut down")
 
@@ -68,11 +100,13 @@ from app.routes.auth_routes import router as auth_router
 from app.routes.predict_routes import router as predict_router
 from app.routes.history_routes import router as history_router
 from app.routes.disease_routes import router as disease_router
+from app.routes.admin_routes import router as admin_router
 
 app.include_router(auth_router)
 app.include_router(predict_router)
 app.include_router(history_router)
 app.include_router(disease_router)
+app.include_router(admin_router)
 
 
 # ── Root health check ─────────────────────────────────────────────────
@@ -84,21 +118,61 @@ async def health_check():
         "version": "1.0.0",
         "model_loaded": is_model_loaded(),
         "mode": "inference" if is_model_loaded() else "demo",
+        "ready": is_ready(),
     }
 
 
+@app.get("/healthz", tags=["Health"])
+async def healthz():
+    """Liveness — the process is up and serving requests."""
+    return liveness()
+
+
+@app.get("/readyz", tags=["Health"])
+async def readyz():
+    """Readiness — model warm, MongoDB reachable and fast, inference queue not saturated."""
+    ready, detail = await readiness()
+    return JSONResponse(detail, status_code=200 if ready else 503)
+
+
+GaugeFunction("cropguard_inference_queue_depth", "Predictions queued or running", queue_depth)
+GaugeFunction("cropguard_model_loaded", "1 when a real model is serving, 0 in demo mode", lambda: int(is_model_loaded()))
+if token_cache is not None:
+    GaugeFunction("cropguard_token_cache_entries", "Verified tokens currently cached", lambda: len(token_cache))
+
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint — per-stage latency histograms and prediction counters."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/api/status", tags=["Health"])
 async def api_status():
     return {
         "api": "running",
         "model": "loaded" if is_model_loaded() else "demo_mode",
+        "inference": {**await refresh_serving_stats(), **get_executor_stats()},
+        "auth": {**get_auth_stats(), "password_hashing": get_password_stats()},
         "endpoints": [
             "POST /api/register",
             "POST /api/login",
             "POST /api/predict",
+            "POST /api/predict/batch",
+            "POST /api/predict/batch/stream",
             "GET  /api/history",
             "GET  /api/diseases",
             "GET  /api/diseases/{class_key}",
             "GET  /api/crops",
+            "GET  /api/status/startup",
+            "GET  /metrics",
+            "GET  /api/admin/models",
+            "POST /api/admin/models/reload",
         ],
     }
+
+
+@app.get("/api/status/startup", tags=["Health"])
+async def startup_status():
+    """Start-up time breakdown per phase and readiness."""
+    return get_startup_report()
@@ -61,6 +61,8 @@ class PredictionResponse(BaseModel):
     dosage: str
     prevention: List[str]
     status: str  # Healthy / Diseased
+    class_key: Optional[str] = None  # DISEASE_DATABASE key, for /api/diseases/{class_key}
+    model_version: Optional[str] = None
     created_at: Optional[datetime] = None
 
 
@@ -72,9 +74,11 @@ class HistoryItem(BaseModel):
     confidence: int
     severity: str
     status: str
+    model_version: Optional[str] = None
     created_at: datetime
 
 
 class HistoryResponse(BaseModel):
     total: int
+    next_cursor: Optional[str] = None
     predictions: List[HistoryItem]
@@ -0,0 +1,44 @@
+"""
+Admin routes — Model management
+"""
+
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.auth import require_auth
+from app.services.ml_service import get_serving_stats, refresh_serving_stats, reload_model
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+
+async def require_admin(current_user=Depends(require_auth)):
+    """Only users with role "admin" may manage models."""
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
+
+
+@router.get("/models")
+async def get_models(current_user=Depends(require_admin)):
+    """Currently serving model version, backend and reload status."""
+    return await refresh_serving_stats()
+
+
+@router.post("/models/reload")
+async def reload_models(current_user=Depends(require_admin)):
+    """
+    Load the model currently on disk, warm it up and swap it in.
+    The old model keeps serving until the swap; on failure it stays active.
+    With INFERENCE_EXECUTOR=process this replaces the worker pool.
+    """
+    # Loading and warm-up block for seconds — keep them off the event loop
+    reloaded = await asyncio.to_thread(reload_model)
+    if not reloaded:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Model reload failed: {get_serving_stats()['last_reload_error']}",
+        )
+    return get_serving_stats()
@@ -2,16 +2,28 @@
 Authentication routes — Register & Login
 """
 
+import logging
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, HTTPException, status
 from app.database import get_db
-from app.auth import hash_password, verify_password, create_access_token
+from app.auth import create_access_token
 from app.models import RegisterRequest, LoginRequest, AuthResponse
+from app.services.passwords import PasswordHasherBusyError, check_password_async, hash_password_async
+
+logger = logging.getLogger("cropguard.auth")
 
 router = APIRouter(prefix="/api", tags=["Authentication"])
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins right now. Please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
 async def register(req: RegisterRequest):
     """Register a new user."""
@@ -25,11 +37,16 @@ async def register(req: RegisterRequest):
             detail="An account with this email already exists",
         )
 
+    try:
+        password_hash = await hash_password_async(req.password)
+    except PasswordHasherBusyError:
+        raise _hasher_busy()
+
     # Create user document
     user_doc = {
         "name": req.name,
         "email": req.email,
-        "password_hash": hash_password(req.password),
+        "password_hash": password_hash,
         "role": "farmer",
         "created_at": datetime.now(timezone.utc),
     }
@@ -56,14 +73,21 @@ async def login(req: LoginRequest):
     db = get_db()
 
     user = await db.users.find_one({"email": req.email})
-    if not user or not verify_password(req.password, user["password_hash"]):
+    try:
+        # Unknown emails still pay for a hash check, so timing does not reveal accounts
+        matches, needs_rehash = await check_password_async(req.password, user["password_hash"] if user else None)
+    except PasswordHasherBusyError:
+        raise _hasher_busy()
+    if not matches:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
     user_id = str(user["_id"])
-    token = create_access_token(user_id, user["email"], user["name"])
+    if needs_rehash:
+        await _rehash(db, user, req.password)
+    token = create_access_token(user_id, user["email"], user["name"], user.get("role", "farmer"))
 
     return AuthResponse(
         token=token,
@@ -74,3 +98,16 @@ async def login(req: LoginRequest):
             "role": user.get("role", "farmer"),
         },
     )
+
+
+async def _rehash(db, user: dict, password: str):
+    """Upgrade a legacy or outdated hash to the current KDF; never fails the login."""
+    try:
+        new_hash = await hash_password_async(password)
+        # Conditional on the old hash so a concurrent password change wins
+        await db.users.update_one(
+            {"_id": user["_id"], "password_hash": user["password_hash"]},
+            {"$set": {"password_hash": new_hash}},
+        )
+    except Exception as e:
+        logger.warning(f"Password rehash for user {user['_id']} failed: {e}")
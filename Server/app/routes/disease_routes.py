@@ -1,29 +1,25 @@
 """
 Disease information routes
+
+The catalogue is static per deploy, so every response is serialised once at
+import and served as cached bytes with a strong ETag; clients revalidating
+with If-None-Match get 304 Not Modified.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from app.services.disease_data import (
-    get_disease_info,
     get_all_diseases,
     get_diseases_by_crop,
     DISEASE_DATABASE,
 )
+from app.services.http_cache import CachedPayload, cached_response
 
 router = APIRouter(prefix="/api", tags=["Disease Info"])
 
 
-@router.get("/diseases")
-async def list_diseases(crop: str | None = Query(None, description="Filter by crop name")):
-    """
-    List all known diseases, optionally filtered by crop.
-    """
-    if crop:
-        diseases = get_diseases_by_crop(crop)
-    else:
-        diseases = get_all_diseases()
-
-    return {
+# ── Pre-rendered catalogue ────────────────────────────────────────────
+def _disease_list(diseases: list[dict]) -> CachedPayload:
+    return CachedPayload.of({
         "total": len(diseases),
         "diseases": [
             {
@@ -34,22 +30,45 @@ async def list_diseases(crop: str | None = Query(None, description="Filter by cr
             }
             for d in diseases
         ],
-    }
+    })
+
+
+_CROPS = sorted(set(v["crop"] for v in DISEASE_DATABASE.values()))
+
+_ALL_DISEASES = _disease_list(get_all_diseases())
+_DISEASES_BY_CROP = {crop.lower(): _disease_list(get_diseases_by_crop(crop)) for crop in _CROPS}
+_NO_DISEASES = _disease_list([])
+_DISEASE_DETAILS = {
+    class_key: CachedPayload.of({**info, "class_key": class_key})
+    for class_key, info in DISEASE_DATABASE.items()
+}
+_CROP_LIST = CachedPayload.of({"crops": _CROPS})
+
+
+@router.get("/diseases")
+async def list_diseases(request: Request, crop: str | None = Query(None, description="Filter by crop name")):
+    """
+    List all known diseases, optionally filtered by crop.
+    """
+    if crop:
+        payload = _DISEASES_BY_CROP.get(crop.lower(), _NO_DISEASES)
+    else:
+        payload = _ALL_DISEASES
+    return cached_response(request, payload)
 
 
 @router.get("/diseases/{class_key}")
-async def get_disease_detail(class_key: str):
+async def get_disease_detail(request: Request, class_key: str):
     """
     Get full disease details including treatments, dosage, and prevention.
     """
-    info = get_disease_info(class_key)
-    if not info:
+    payload = _DISEASE_DETAILS.get(class_key)
+    if payload is None:
         raise HTTPException(status_code=404, detail=f"Disease '{class_key}' not found")
-    return {**info, "class_key": class_key}
+    return cached_response(request, payload)
 
 
 @router.get("/crops")
-async def list_crops():
+async def list_crops(request: Request):
     """List all supported crops."""
-    crops = sorted(set(v["crop"] for v in DISEASE_DATABASE.values()))
-    return {"crops": crops}
+    return cached_response(request, _CROP_LIST)
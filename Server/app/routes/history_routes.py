@@ -2,62 +2,82 @@
 History routes — User prediction history
 """
 
-from fastapi import APIRouter, Depends, Query
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from app.auth import require_auth
 from app.database import get_db
+from app.services.history import SORT, InvalidCursorError, after_cursor, count_history, encode_cursor
+from app.services.indexes import HISTORY_SUMMARY_PROJECTION
 
 router = APIRouter(prefix="/api", tags=["History"])
 
 
 @router.get("/history")
 async def get_history(
-    page: int = Query(1, ge=1),
+    page: int = Query(1, ge=1, description="Page number; ignored when a cursor is given"),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    view: Literal["full", "summary"] = Query("full", description="summary: HistoryItem fields only"),
     current_user=Depends(require_auth),
 ):
     """
     Get the current user's prediction history (paginated, newest first).
+    Pass the returned next_cursor to fetch the following page; it stays fast
+    however deep the history goes.  view=summary omits the description and
+    treatment text and is answered from the history index alone.
     Requires authentication.
     """
     db = get_db()
     user_id = current_user["_id"]
+    projection = HISTORY_SUMMARY_PROJECTION if view == "summary" else None
 
-    skip = (page - 1) * limit
+    if cursor:
+        try:
+            query = after_cursor(user_id, cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        cursor_query = db.predictions.find(query, projection).sort(SORT)
+    else:
+        # Offset paging, kept for clients that jump straight to page N
+        cursor_query = db.predictions.find({"user_id": user_id}, projection).sort(SORT).skip((page - 1) * limit)
 
-    # Count total
-    total = await db.predictions.count_documents({"user_id": user_id})
+    # One extra document tells us whether another page exists
+    docs = await cursor_query.limit(limit + 1).to_list(length=limit + 1)
+    has_more = len(docs) > limit
+    docs = docs[:limit]
 
-    # Fetch predictions
-    cursor = (
-        db.predictions.find({"user_id": user_id})
-        .sort("created_at", -1)
-        .skip(skip)
-        .limit(limit)
-    )
+    total = await count_history(db, user_id)
 
     predictions = []
-    async for doc in cursor:
-        predictions.append(
-            {
-                "prediction_id": str(doc["_id"]),
-                "crop_name": doc.get("crop_name", ""),
-                "disease_name": doc.get("disease_name", ""),
-                "confidence": doc.get("confidence", 0),
-                "severity": doc.get("severity", ""),
-                "status": doc.get("status", ""),
-                "description": doc.get("description", ""),
-                "organic_treatment": doc.get("organic_treatment", []),
-                "chemical_treatment": doc.get("chemical_treatment", []),
-                "dosage": doc.get("dosage", ""),
-                "prevention": doc.get("prevention", []),
-                "filename": doc.get("filename", ""),
-                "created_at": doc.get("created_at", ""),
-            }
-        )
+    for doc in docs:
+        item = {
+            "prediction_id": str(doc["_id"]),
+            "crop_name": doc.get("crop_name", ""),
+            "disease_name": doc.get("disease_name", ""),
+            "confidence": doc.get("confidence", 0),
+            "severity": doc.get("severity", ""),
+            "status": doc.get("status", ""),
+            "model_version": doc.get("model_version"),
+            "created_at": doc.get("created_at", ""),
+        }
+        if view == "full":
+            item.update(
+                {
+                    "description": doc.get("description", ""),
+                    "organic_treatment": doc.get("organic_treatment", []),
+                    "chemical_treatment": doc.get("chemical_treatment", []),
+                    "dosage": doc.get("dosage", ""),
+                    "prevention": doc.get("prevention", []),
+                    "filename": doc.get("filename", ""),
+                }
+            )
+        predictions.append(item)
 
     return {
         "total": total,
-        "page": page,
+        "page": None if cursor else page,
         "limit": limit,
+        "next_cursor": encode_cursor(docs[-1]) if has_more else None,
         "predictions": predictions,
     }
@@ -1,23 +1,44 @@
 """
-Prediction route — Accept image → Run model → Return result
+Prediction routes — Accept image(s) → Run model → Return result(s)
 """
 
+import asyncio
 import logging
+import zipfile
+import zlib
+from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import List
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from bson import ObjectId
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
 from app.auth import get_current_user
-from app.config import ALLOWED_EXTENSIONS, MAX_FILE_SIZE
+from app.config import (
+    ALLOWED_EXTENSIONS,
+    MAX_FILE_SIZE,
+    INFERENCE_RETRY_AFTER,
+    BATCH_MAX_FILES,
+    BATCH_MAX_ZIP_BYTES,
+    STREAM_MAX_FILES,
+    STREAM_MAX_INFLIGHT,
+    STREAM_HISTORY_FLUSH,
+)
 from app.database import get_db
-from app.services.ml_service import predict
+from app.services import metrics
+from app.services.executor import InferenceBusyError, run_in_executor
+from app.services.history import record_inserted
+from app.services.ml_service import predict, predict_many
+from app.services.payloads import PredictionJSONResponse, dumps, render_prediction
+from app.services.upload_stream import UploadedImage, image_type_error, iter_uploaded_images
 
 logger = logging.getLogger("cropguard.predict")
 
 router = APIRouter(prefix="/api", tags=["Prediction"])
 
 
-@router.post("/predict")
+@router.post("/predict", response_class=PredictionJSONResponse)
 async def predict_disease(
     file: UploadFile = File(...),
     current_user=Depends(get_current_user),
@@ -28,21 +49,15 @@ async def predict_disease(
     but results won't be saved to history.
     """
     # ── Validate file ─────────────────────────────────────────────────
-    if not file.content_type or not file.content_type.startswith("image/"):
+    error = image_type_error(file.filename, file.content_type)
+    if error:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File must be an image (JPEG, PNG, or WEBP)",
-        )
-
-    ext = Path(file.filename or "").suffix.lower()
-    if ext and ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Unsupported file type '{ext}'. Allowed: {', '.join(ALLOWED_EXTENSIONS)}",
+            detail=error,
         )
 
     # Read and check size
-    image_bytes = await file.read()
+    image_bytes = await metrics.timed(metrics.UPLOAD_READ, file.read())
     if len(image_bytes) > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
@@ -57,7 +72,13 @@ async def predict_disease(
 
     # ── Run prediction ────────────────────────────────────────────────
     try:
-        result = predict(image_bytes)
+        result = await run_in_executor(predict, image_bytes)
+    except InferenceBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy analysing other images. Please retry shortly.",
+            headers={"Retry-After": str(INFERENCE_RETRY_AFTER)},
+        )
     except Exception as e:
         logger.error(f"Prediction failed: {e}")
         raise HTTPException(
@@ -69,25 +90,368 @@ async def predict_disease(
     prediction_id = None
     if current_user:
         db = get_db()
-        prediction_doc = {
-            "user_id": current_user["_id"],
-            "crop_name": result["crop_name"],
-            "disease_name": result["disease_name"],
-            "confidence": result["confidence"],
-            "severity": result["severity"],
-            "status": result["status"],
-            "description": result["description"],
-            "organic_treatment": result["organic_treatment"],
-            "chemical_treatment": result["chemical_treatment"],
-            "dosage": result["dosage"],
-            "prevention": result["prevention"],
-            "filename": file.filename,
-            "created_at": datetime.now(timezone.utc),
-        }
-        insert_result = await db.predictions.insert_one(prediction_doc)
+        prediction_doc = _history_doc(current_user["_id"], result, file.filename)
+        insert_result = await metrics.timed(metrics.MONGO_INSERT, db.predictions.insert_one(prediction_doc))
         prediction_id = str(insert_result.inserted_id)
+        record_inserted(current_user["_id"])
+
+    # Static per-class text is pre-serialised; only per-request fields are encoded here
+    return PredictionJSONResponse(render_prediction(
+        result,
+        prediction_id=prediction_id,
+        created_at=datetime.now(timezone.utc).isoformat(),
+    ))
+
+
+def _history_doc(user_id: str, result: dict, filename: str | None) -> dict:
+    """Prediction document stored in the user's history."""
+    return {
+        "user_id": user_id,
+        "crop_name": result["crop_name"],
+        "disease_name": result["disease_name"],
+        "confidence": result["confidence"],
+        "severity": result["severity"],
+        "status": result["status"],
+        "description": result["description"],
+        "organic_treatment": result["organic_treatment"],
+        "chemical_treatment": result["chemical_treatment"],
+        "dosage": result["dosage"],
+        "prevention": result["prevention"],
+        "filename": filename,
+        "model_version": result.get("model_version"),
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+# ── Batch prediction ──────────────────────────────────────────────────
+def _is_zip(file: UploadFile) -> bool:
+    return (
+        Path(file.filename or "").suffix.lower() == ".zip"
+        or file.content_type in ("application/zip", "application/x-zip-compressed")
+    )
+
+
+def _too_many_images() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Too many images. Maximum is {BATCH_MAX_FILES} per batch",
+    )
+
+
+_ZIP_ENTRY_ERRORS = (zipfile.BadZipFile, zlib.error, RuntimeError, NotImplementedError, EOFError)
+
+
+def _read_zip(file: UploadFile, max_entries: int) -> list[tuple[str, bytes | None, str | None]]:
+    """
+    Extract image entries from a zip upload → (filename, bytes, error).
+
+    Entries are counted and sized from the central directory before anything
+    is decompressed, so an archive with too many images or too many bytes is
+    rejected without inflating it.  Blocking — run it off the event loop.
+    """
+    entries = []
+    try:
+        with zipfile.ZipFile(file.file) as archive:
+            images = [
+                info for info in archive.infolist()
+                if not info.is_dir()
+                and not info.filename.startswith("__MACOSX/")
+                and not Path(info.filename).name.startswith(".")
+                and Path(info.filename).suffix.lower() in ALLOWED_EXTENSIONS
+            ]
+            if len(images) > max_entries:
+                raise _too_many_images()
+            # zipfile stops inflating at the declared size, so this bounds the real output
+            total_bytes = sum(info.file_size for info in images if info.file_size <= MAX_FILE_SIZE)
+            if total_bytes > BATCH_MAX_ZIP_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Zip archive too large. Maximum is {BATCH_MAX_ZIP_BYTES // (1024*1024)} MB uncompressed",
+                )
+
+            for info in images:
+                if info.file_size > MAX_FILE_SIZE:
+                    entries.append((info.filename, None, "File too large"))
+                    continue
+                try:
+                    entries.append((info.filename, archive.read(info), None))
+                except _ZIP_ENTRY_ERRORS as e:
+                    # Corrupt data, bad CRC, encryption or an unsupported compression method
+                    logger.warning(f"Could not extract '{info.filename}' from '{file.filename}': {e!r}")
+                    entries.append((info.filename, None, "Could not be extracted from the zip archive"))
+    except zipfile.BadZipFile:
+        entries.append((file.filename, None, "Invalid zip archive"))
+    return entries
+
+
+async def _read_upload(file: UploadFile) -> tuple[str, bytes | None, str | None]:
+    """Validate and read one image upload → (filename, bytes, error)."""
+    name = file.filename or ""
+    error = image_type_error(name, file.content_type)
+    if error:
+        return name, None, error
+
+    image_bytes = await metrics.timed(metrics.UPLOAD_READ, file.read())
+    if len(image_bytes) > MAX_FILE_SIZE:
+        return name, None, "File too large"
+    if not image_bytes:
+        return name, None, "Uploaded file is empty"
+    return name, image_bytes, None
+
+
+class _PlotSummary:
+    """Running plot-level aggregate over successful predictions."""
+
+    def __init__(self):
+        self.analysed = 0
+        self.statuses: Counter = Counter()
+        self.diseases: Counter = Counter()
+
+    def add(self, result: dict):
+        self.analysed += 1
+        self.statuses[result["status"]] += 1
+        if result["status"] == "Diseased":
+            self.diseases[result["disease_name"]] += 1
+
+    def as_dict(self) -> dict:
+        diseased = self.statuses["Diseased"]
+        return {
+            "analysed": self.analysed,
+            "diseased": diseased,
+            "healthy": self.statuses["Healthy"],
+            "uncertain": self.statuses["Uncertain"],
+            "fraction_diseased": round(diseased / self.analysed, 3) if self.analysed else 0.0,
+            "dominant_disease": self.diseases.most_common(1)[0][0] if self.diseases else None,
+            "disease_counts": dict(self.diseases.most_common()),
+        }
+
+
+@router.post("/predict/batch")
+async def predict_disease_batch(
+    files: List[UploadFile] = File(...),
+    current_user=Depends(get_current_user),
+):
+    """
+    Accept many leaf images (or zip archives of images) from a plot survey,
+    run them through batched inference and return per-image results plus a
+    plot-level summary.  History is saved in one write when authenticated.
+    """
+    entries = []
+    for file in files:
+        if _is_zip(file):
+            entries.extend(await asyncio.to_thread(_read_zip, file, BATCH_MAX_FILES - len(entries)))
+        else:
+            if len(entries) >= BATCH_MAX_FILES:
+                raise _too_many_images()
+            entries.append(await _read_upload(file))
+
+    if not entries:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No images found in upload",
+        )
+
+    # ── Run prediction ────────────────────────────────────────────────
+    valid = [(i, data) for i, (_, data, error) in enumerate(entries) if error is None]
+    try:
+        predictions = await run_in_executor(predict_many, [data for _, data in valid])
+    except InferenceBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy analysing other images. Please retry shortly.",
+            headers={"Retry-After": str(INFERENCE_RETRY_AFTER)},
+        )
+    except Exception as e:
+        logger.error(f"Batch prediction failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Prediction failed. Please try again.",
+        )
+
+    results: list[dict] = [
+        {"filename": name, "error": error} for name, _, error in entries
+    ]
+    succeeded = []
+    for (i, _), prediction in zip(valid, predictions):
+        if prediction is None:
+            results[i]["error"] = "Image could not be decoded"
+            continue
+        results[i] = {"filename": entries[i][0], "error": None, **prediction}
+        succeeded.append(results[i])
+
+    # ── Save to history (if authenticated) ────────────────────────────
+    prediction_ids = [None] * len(succeeded)
+    if current_user and succeeded:
+        db = get_db()
+        docs = [_history_doc(current_user["_id"], r, r["filename"]) for r in succeeded]
+        insert_result = await metrics.timed(metrics.MONGO_INSERT, db.predictions.insert_many(docs))
+        prediction_ids = [str(_id) for _id in insert_result.inserted_ids]
+        record_inserted(current_user["_id"], len(docs))
+
+    created_at = datetime.now(timezone.utc).isoformat()
+    for result, prediction_id in zip(succeeded, prediction_ids):
+        result["prediction_id"] = prediction_id
+        result["created_at"] = created_at
+
+    summary = _PlotSummary()
+    for result in succeeded:
+        summary.add(result)
+
+    # Items are rendered like /api/predict bodies and spliced into the envelope
+    envelope = dumps({
+        "total": len(entries),
+        "succeeded": len(succeeded),
+        "failed": len(entries) - len(succeeded),
+        "summary": summary.as_dict(),
+    })
+    items = b",".join(render_prediction(result) for result in results)
+    return PredictionJSONResponse(envelope[:-1] + b',"results":[' + items + b"]}")
+
+
+# ── Streaming batch prediction ────────────────────────────────────────
+async def _predict_upload(upload: UploadedImage) -> dict:
+    if upload.error:
+        return {"filename": upload.filename, "error": upload.error}
+    try:
+        result = await run_in_executor(predict, upload.data)
+    except InferenceBusyError:
+        return {"filename": upload.filename, "error": "Server busy — retry this image"}
+    except Exception as e:
+        logger.warning(f"Streamed prediction failed for '{upload.filename}': {e}")
+        return {"filename": upload.filename, "error": "Image could not be decoded"}
+    return {"filename": upload.filename, "error": None, **result}
+
+
+def _encode_event(event: str, data: bytes, fmt: str) -> bytes:
+    """Frame one already-encoded JSON document as an NDJSON line or SSE event."""
+    if fmt == "sse":
+        return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+    return data + b"\n"
+
+
+class _UploadStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body reads the request body.  Starlette's default
+    also calls receive() to watch for disconnects, which would swallow the
+    upload's chunks; a disconnect surfaces from request.stream() instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+@router.post("/predict/batch/stream")
+async def predict_disease_batch_stream(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$"),
+    current_user=Depends(get_current_user),
+):
+    """
+    Streaming variant of /predict/batch for large surveys.  The response
+    starts immediately; the multipart body is parsed one image at a time
+    inside it and each image is submitted for inference as soon as it
+    arrives, so only STREAM_MAX_INFLIGHT images are held in memory.  Each
+    result is emitted as an NDJSON line (or SSE ``result`` event) as soon as
+    it completes, tagged with its upload ``index``, followed by a final
+    ``summary``.  Problems with the upload as a whole (no images, too many
+    images, malformed body) end the stream with an ``error`` event.
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a multipart/form-data upload",
+        )
+
+    async def body():
+        # Bounded both ways: STREAM_MAX_INFLIGHT images predicting, and as many
+        # finished results waiting for a slow reader before uploads pause
+        slots = asyncio.Semaphore(STREAM_MAX_INFLIGHT)
+        events: asyncio.Queue = asyncio.Queue(maxsize=STREAM_MAX_INFLIGHT)
+        running: set[asyncio.Task] = set()
+
+        async def predict_one(index: int, upload: UploadedImage):
+            try:
+                result = await _predict_upload(upload)
+            finally:
+                slots.release()
+            await events.put(("result", (index, result)))
+
+        async def read_uploads():
+            total = 0
+            try:
+                async for upload in iter_uploaded_images(request):
+                    if total == STREAM_MAX_FILES:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"Too many images. Maximum is {STREAM_MAX_FILES} per stream",
+                        )
+                    await slots.acquire()
+                    task = asyncio.create_task(predict_one(total, upload))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+                    total += 1
+                if total == 0:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="No images found in upload",
+                    )
+                await asyncio.gather(*running)
+                await events.put(("done", total))
+            except HTTPException as e:
+                await events.put(("error", e))
+            except Exception as e:
+                logger.warning(f"Streamed upload interrupted: {e}")
+                await events.put(("error", HTTPException(status.HTTP_400_BAD_REQUEST, "Upload interrupted")))
+
+        db = get_db() if current_user else None
+        summary = _PlotSummary()
+        history_docs: list[dict] = []
+        created_at = datetime.now(timezone.utc).isoformat()
+        reader = asyncio.create_task(read_uploads())
+
+        try:
+            while True:
+                kind, payload = await events.get()
+                if kind == "error":
+                    yield _encode_event("error", dumps({"status": payload.status_code, "detail": payload.detail}), format)
+                    break
+                if kind == "done":
+                    yield _encode_event(
+                        "summary",
+                        dumps({"summary": {"total": payload, **summary.as_dict()}}),
+                        format,
+                    )
+                    break
+
+                index, result = payload
+                if result["error"] is None:
+                    summary.add(result)
+                    result["prediction_id"] = None
+                    result["created_at"] = created_at
+                    if db is not None:
+                        doc = _history_doc(current_user["_id"], result, result["filename"])
+                        doc["_id"] = ObjectId()
+                        result["prediction_id"] = str(doc["_id"])
+                        history_docs.append(doc)
+
+                # Same rendering as /api/predict and /predict/batch items
+                yield _encode_event("result", render_prediction({"index": index, **result}), format)
 
-    result["prediction_id"] = prediction_id
-    result["created_at"] = datetime.now(timezone.utc).isoformat()
+                if len(history_docs) >= STREAM_HISTORY_FLUSH:
+                    await metrics.timed(metrics.MONGO_INSERT, db.predictions.insert_many(history_docs))
+                    record_inserted(current_user["_id"], len(history_docs))
+                    history_docs = []
+        finally:
+            reader.cancel()
+            for task in list(running):
+                task.cancel()
+            if history_docs:
+                try:
+                    await metrics.timed(metrics.MONGO_INSERT, db.predictions.insert_many(history_docs))
+                    record_inserted(current_user["_id"], len(history_docs))
+                except Exception as e:
+                    logger.error(f"Failed to save streamed history: {e}")
 
-    return result
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return _UploadStreamingResponse(body(), media_type=media_type)
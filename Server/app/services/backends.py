@@ -0,0 +1,92 @@
+"""
+Inference Backends
+-------------------
+Thin wrappers giving every model format the same contract:
+
+    backend.run(batch: float32 (N, 3, 224, 224)) -> float32 (N, num_classes) probabilities
+
+  - TorchScriptBackend — ``torch.jit.load`` of model/crop_disease_model.pt,
+                         frozen and passed through ``optimize_for_inference``
+                         (conv/bn folding, fused ops) when TORCHSCRIPT_OPTIMIZE
+  - OnnxBackend        — ONNX Runtime session on the exported .onnx graph
+                         (scripts/export_onnx.py), with full graph
+                         optimisation and configurable intra/inter-op threads;
+                         avoids importing torch at all
+  - KerasBackend       — legacy TensorFlow fallback
+
+Framework imports happen inside the constructors so a missing framework
+only raises ImportError when that backend is actually selected.
+"""
+
+import logging
+
+import numpy as np
+
+from app.config import ORT_INTRA_OP_THREADS, ORT_INTER_OP_THREADS, TORCHSCRIPT_OPTIMIZE
+
+logger = logging.getLogger("cropguard.backends")
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+
+class TorchScriptBackend:
+    name = "torchscript"
+
+    def __init__(self, path: str):
+        import torch
+
+        self._torch = torch
+        self.model = torch.jit.load(path, map_location="cpu")
+        self.model.eval()
+        self.optimized = False
+        if TORCHSCRIPT_OPTIMIZE:
+            try:
+                self.model = torch.jit.optimize_for_inference(torch.jit.freeze(self.model))
+                self.optimized = True
+            except Exception as e:
+                logger.warning(f"TorchScript freeze/optimize failed, using the graph as exported: {e}")
+
+    def run(self, batch: np.ndarray) -> np.ndarray:
+        torch = self._torch
+        with torch.no_grad():
+            outputs = self.model(torch.from_numpy(batch))
+            return torch.nn.functional.softmax(outputs, dim=1).numpy()
+
+
+class OnnxBackend:
+    name = "onnx"
+
+    def __init__(self, path: str):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if ORT_INTRA_OP_THREADS > 0:
+            options.intra_op_num_threads = ORT_INTRA_OP_THREADS
+        if ORT_INTER_OP_THREADS > 0:
+            options.inter_op_num_threads = ORT_INTER_OP_THREADS
+
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def run(self, batch: np.ndarray) -> np.ndarray:
+        logits = self.session.run(None, {self.input_name: batch})[0]
+        return _softmax(logits.astype(np.float32, copy=False))
+
+
+class KerasBackend:
+    name = "tensorflow"
+
+    def __init__(self, path: str):
+        import tensorflow as tf
+
+        self.model = tf.keras.models.load_model(path)
+
+    def run(self, batch: np.ndarray) -> np.ndarray:
+        return np.asarray(self.model.predict(batch, verbose=0))
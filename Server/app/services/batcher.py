@@ -0,0 +1,190 @@
+"""
+Dynamic Micro-Batching
+-----------------------
+Coalesces single-image inference requests into small batches so the model
+runs one forward pass for several concurrent uploads instead of one pass
+per HTTP request.
+
+Callers submit an image and block on the returned Future.  A background
+thread collects up to INFERENCE_MAX_BATCH_SIZE images (or whatever arrived
+within INFERENCE_MAX_WAIT_MS of the first one), writes each into its slot of
+a reusable input buffer via ``fill_slot``, calls the model once and fans each
+row of probabilities back to its caller.
+
+Callers block while they wait, so only so many can ever be waiting at
+once.  ``submitters`` reports that ceiling (executor.active_submitters),
+and a batch is dispatched as soon as it holds that many items rather than
+waiting out the window for items that cannot arrive.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+import numpy as np
+
+from app.services.preprocess import BatchBuffer
+
+logger = logging.getLogger("cropguard.batcher")
+
+_STOP = object()
+
+
+def _copy_slot(item: np.ndarray, out: np.ndarray):
+    """Default slot filler for already-preprocessed (3, H, W) tensors."""
+    np.copyto(out, item)
+
+
+class MicroBatcher:
+    """Background batching loop around a ``run_batch(np.ndarray) -> np.ndarray`` callable."""
+
+    def __init__(
+        self,
+        run_batch: Callable[[np.ndarray], np.ndarray],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        fill_slot: Callable[[np.ndarray, np.ndarray], Any] | None = None,
+        submitters: Callable[[], int] | None = None,
+    ):
+        self._run_batch = run_batch
+        self._fill_slot = fill_slot or _copy_slot
+        self._submitters = submitters
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        # Only the worker thread touches the buffer, so it can be reused across batches
+        self._buffer = BatchBuffer(self.max_batch_size)
+
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()  # orders submit() against stop()
+
+        # Stats — batch size → number of forward passes with that size
+        self._batch_counts = [0] * (self.max_batch_size + 1)
+        self._items = 0
+        self._batches = 0
+
+    # ── Lifecycle ─────────────────────────────────────────────────────
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name="cropguard-batcher", daemon=True)
+            self._thread.start()
+        logger.info(
+            f"Micro-batcher started (max_batch={self.max_batch_size}, "
+            f"max_wait={self.max_wait * 1000:.1f} ms)"
+        )
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Finish the items already queued, then stop.  Any caller still waiting
+        afterwards (the loop did not drain in time) gets a RuntimeError
+        instead of blocking forever; later submit() calls raise at once.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Micro-batcher did not stop in time — failing its queued requests")
+
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(item)  # still needed by a loop that has not exited yet
+                break
+            _, future = item
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("micro-batcher stopped"))
+
+    # ── Submission ────────────────────────────────────────────────────
+    def submit(self, item: np.ndarray) -> Future:
+        """Queue a single image for ``fill_slot``; the Future resolves to its probability row."""
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None:
+                raise RuntimeError("micro-batcher is not running")
+            self._queue.put((item, future))
+        return future
+
+    # ── Worker loop ───────────────────────────────────────────────────
+    def _collect(self, first) -> tuple[list, bool]:
+        """Gather a batch starting from ``first``. Returns (items, stop_requested)."""
+        items = [first]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(items) < self.max_batch_size:
+            # Everyone who could submit already has — waiting longer only adds latency
+            if self._submitters is not None and len(items) >= self._submitters() and self._queue.empty():
+                break
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    item = self._queue.get_nowait()
+                else:
+                    item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return items, True
+            items.append(item)
+
+        return items, False
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            items, stop = self._collect(first)
+            self._dispatch(items)
+            if stop:
+                return
+
+    def _dispatch(self, items: list):
+        # Skip requests whose callers already gave up
+        items = [(t, f) for t, f in items if f.set_running_or_notify_cancel()]
+        if not items:
+            return
+
+        try:
+            for i, (item, _) in enumerate(items):
+                self._fill_slot(item, self._buffer.slot(i))
+            probs = self._run_batch(self._buffer.view(len(items)))
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+            return
+
+        for row, (_, future) in zip(probs, items):
+            future.set_result(row)
+
+        size = len(items)
+        self._batch_counts[size] += 1
+        self._items += size
+        self._batches += 1
+
+    # ── Reporting ─────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        """Achieved batch sizes — used to tune throughput vs. tail latency."""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self._batches,
+            "items": self._items,
+            "mean_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "batch_size_counts": {
+                str(size): count for size, count in enumerate(self._batch_counts) if count
+            },
+            "queue_depth": self._queue.qsize(),
+        }
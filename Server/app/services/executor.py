@@ -0,0 +1,303 @@
+"""
+Inference Execution Backend
+----------------------------
+Runs the synchronous ``ml_service.predict`` pipeline (PIL decode, resize,
+NumPy normalisation, model forward) off the asyncio event loop so that
+history, catalogue and health requests stay responsive during inference.
+
+Two backends, selected with INFERENCE_EXECUTOR:
+  - "thread"  — ThreadPoolExecutor sharing the model (and micro-batcher)
+                loaded in the main process.  Default.  Every waiting request
+                holds a pool thread, so with batching the pool has at least
+                INFERENCE_MAX_BATCH_SIZE threads or a full batch could never
+                form.
+  - "process" — ProcessPoolExecutor; every worker loads its own copy of
+                the model at start-up, so preprocessing scales past the GIL.
+                The main process then loads no model.  Its view of the
+                serving model is a snapshot reported by a worker
+                (worker_model_stats), and workers ship their stage metrics
+                back with each result.  A model reload starts a fresh pool
+                (recycle_workers), swaps it in once its workers are warm and
+                lets the old pool finish its jobs — briefly holding two
+                copies of the model per worker slot.
+
+Admission is bounded: once INFERENCE_QUEUE_LIMIT predictions are queued or
+running, new ones are rejected with InferenceBusyError so the route can
+answer 503 + Retry-After instead of piling up latency.  A job counts
+against the limit until it finishes on the pool, even if the request
+awaiting it was cancelled.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.config import (
+    INFERENCE_EXECUTOR,
+    INFERENCE_WORKERS,
+    INFERENCE_QUEUE_LIMIT,
+    INFERENCE_TORCH_THREADS,
+    INFERENCE_BATCHING,
+    INFERENCE_MAX_BATCH_SIZE,
+)
+from app.services import metrics
+
+logger = logging.getLogger("cropguard.executor")
+
+_pool: Executor | None = None
+_workers = 0
+_inflight = 0
+_worker_model: dict | None = None  # process mode: inference stats reported by a worker
+_recycle_lock = threading.Lock()
+_recycles = 0
+_recycle_error: str | None = None
+
+
+class InferenceBusyError(Exception):
+    """Raised when the inference queue is saturated."""
+
+
+def _pin_torch_threads():
+    if INFERENCE_TORCH_THREADS <= 0:
+        return
+    try:
+        import torch
+
+        torch.set_num_threads(INFERENCE_TORCH_THREADS)
+    except ImportError:
+        pass
+
+
+def _init_process_worker():
+    """Process-pool initializer: preload the model once per worker."""
+    from app.services import ml_service
+
+    _pin_torch_threads()
+    # A worker handles one prediction at a time, so batching would only add wait.
+    # The main process watches the model files and recycles the whole pool.
+    ml_service.load_model(batching=False, watch=False)
+    ml_service.warm_up_model()
+    # A forked worker inherits the parent's metric shards; shipping those back
+    # with the first result would count them twice (recycle_workers forks a
+    # busy parent).  Warm-up passes are not served requests either.
+    metrics.drain_delta()
+
+
+def _worker_pid(hold: float = 0.0) -> int:
+    time.sleep(hold)  # keeps a ready worker busy so the others get a job too
+    return os.getpid()
+
+
+def _worker_stats() -> dict:
+    """Runs in a pool worker: the model it serves and its batching/cache stats."""
+    from app.services import ml_service
+
+    return ml_service.get_inference_stats()
+
+
+def _call_with_metrics(func: Callable[..., Any], *args) -> tuple[Any, list]:
+    """Runs in a pool worker: ``func(*args)`` plus the metrics it recorded."""
+    try:
+        return func(*args), metrics.drain_delta()
+    except Exception as e:
+        e.metrics_delta = metrics.drain_delta()
+        raise
+
+
+def _thread_workers() -> int:
+    if INFERENCE_BATCHING:
+        return max(INFERENCE_WORKERS, INFERENCE_MAX_BATCH_SIZE)
+    return INFERENCE_WORKERS
+
+
+# ── Lifecycle ─────────────────────────────────────────────────────────
+def start_executor():
+    """Create the worker pool configured by INFERENCE_EXECUTOR."""
+    global _pool, _workers
+    if _pool is not None:
+        return
+
+    if INFERENCE_EXECUTOR == "process":
+        _workers = INFERENCE_WORKERS
+        _pool = _new_process_pool()
+    else:
+        _pin_torch_threads()
+        _workers = _thread_workers()
+        _pool = ThreadPoolExecutor(
+            max_workers=_workers,
+            thread_name_prefix="cropguard-infer",
+        )
+
+    logger.info(
+        f"Inference executor started ({INFERENCE_EXECUTOR}, workers={_workers}, "
+        f"queue_limit={INFERENCE_QUEUE_LIMIT})"
+    )
+
+
+def _new_process_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=_workers, initializer=_init_process_worker)
+
+
+def _spawn_workers(pool: ProcessPoolExecutor) -> dict:
+    """Start every worker of ``pool`` (each loads and warms the model) → one worker's stats."""
+    # A worker only takes jobs once its initializer (model load + warm-up) has run
+    pids: set[int] = set()
+    while len(pids) < _workers:
+        futures = [pool.submit(_worker_pid, 0.05) for _ in range(_workers)]
+        pids.update(f.result() for f in futures)
+    snapshot = pool.submit(_worker_stats).result()
+    logger.info(f"{len(pids)} inference worker processes warmed ({snapshot['model_version']})")
+    return snapshot
+
+
+def warm_up_executor():
+    """
+    Spawn process-pool workers now (ProcessPoolExecutor starts them lazily on
+    submit) so their model load and warm-up happen before the app is ready.
+    """
+    global _worker_model
+    if INFERENCE_EXECUTOR != "process" or _pool is None:
+        return
+    _worker_model = _spawn_workers(_pool)
+
+
+def recycle_workers() -> bool:
+    """
+    Process mode: reload the model on disk by replacing the worker pool.
+    The new workers load and warm up while the old ones keep serving; jobs
+    already submitted finish on the old pool.  Keeps the old pool on failure.
+    """
+    global _pool, _worker_model, _recycles, _recycle_error
+    if INFERENCE_EXECUTOR != "process" or _pool is None:
+        return False
+
+    with _recycle_lock:
+        pool = _new_process_pool()
+        try:
+            snapshot = _spawn_workers(pool)
+            if snapshot["model_version"] == "demo":
+                raise RuntimeError("no loadable model found")
+        except Exception as e:
+            pool.shutdown(wait=False, cancel_futures=True)
+            _recycle_error = str(e)
+            logger.error(f"Worker recycle failed, keeping current workers: {e}")
+            return False
+
+        old, _pool, _worker_model = _pool, pool, snapshot
+        _recycles += 1
+        _recycle_error = None
+
+    threading.Thread(target=old.shutdown, name="cropguard-retire-pool", daemon=True).start()
+    logger.info(f"Inference workers recycled — serving {snapshot['model_version']}")
+    return True
+
+
+def shutdown_executor():
+    global _pool, _worker_model
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+    _worker_model = None
+
+
+# ── Submission ────────────────────────────────────────────────────────
+async def run_in_executor(func: Callable[..., Any], *args) -> Any:
+    """
+    Await ``func(*args)`` on the inference pool.
+    Raises InferenceBusyError when INFERENCE_QUEUE_LIMIT jobs are already pending.
+    """
+    global _inflight
+    if _inflight >= INFERENCE_QUEUE_LIMIT:
+        raise InferenceBusyError(f"{_inflight} predictions already pending")
+
+    if _pool is None:
+        start_executor()
+
+    loop = asyncio.get_running_loop()
+    process = INFERENCE_EXECUTOR == "process"
+    pool = _pool
+    try:
+        future = pool.submit(_call_with_metrics, func, *args) if process else pool.submit(func, *args)
+    except RuntimeError:
+        if pool is _pool:
+            raise
+        future = _pool.submit(_call_with_metrics, func, *args)  # raced recycle_workers retiring ``pool``
+
+    # Released when the job finishes, not when the awaiting request goes away
+    _inflight += 1
+    future.add_done_callback(lambda _: _release_threadsafe(loop))
+
+    try:
+        result = await asyncio.wrap_future(future)
+    except Exception as e:
+        if process and hasattr(e, "metrics_delta"):
+            metrics.merge_delta(e.metrics_delta)
+        raise
+    if process:
+        result, delta = result
+        metrics.merge_delta(delta)
+    return result
+
+
+def _release():
+    global _inflight
+    _inflight -= 1
+
+
+def _release_threadsafe(loop: asyncio.AbstractEventLoop):
+    try:
+        loop.call_soon_threadsafe(_release)
+    except RuntimeError:  # loop already closed at shutdown
+        _release()
+
+
+def queue_depth() -> int:
+    """Number of predictions currently queued or running."""
+    return _inflight
+
+
+def active_submitters() -> int:
+    """
+    Jobs that hold a pool thread right now (thread mode) — the most callers
+    that can be inside the micro-batcher at once.  Lets it dispatch as soon
+    as all of them have submitted instead of waiting out INFERENCE_MAX_WAIT_MS.
+    """
+    return min(_inflight, _workers)
+
+
+# ── Serving model (process mode) ──────────────────────────────────────
+def worker_model_stats() -> dict | None:
+    """Snapshot of the model the process-pool workers serve (None in thread mode)."""
+    if _worker_model is None:
+        return None
+    # Reloads replace the workers, so their own registries never count a swap
+    return {**_worker_model, "swaps": _recycles, "last_reload_error": _recycle_error}
+
+
+async def refresh_worker_model(timeout: float = 1.0) -> dict | None:
+    """
+    Re-read the snapshot from a worker so cache and batching stats are
+    current.  Keeps the previous snapshot if the pool is too busy to answer
+    within ``timeout``.
+    """
+    global _worker_model
+    if _worker_model is None or _pool is None:
+        return worker_model_stats()
+    try:
+        _worker_model = await asyncio.wait_for(asyncio.wrap_future(_pool.submit(_worker_stats)), timeout)
+    except Exception as e:
+        logger.debug(f"Worker stats refresh skipped: {e!r}")
+    return worker_model_stats()
+
+
+def get_executor_stats() -> dict:
+    return {
+        "executor": INFERENCE_EXECUTOR,
+        "workers": _workers or INFERENCE_WORKERS,
+        "queue_limit": INFERENCE_QUEUE_LIMIT,
+        "queue_depth": _inflight,
+    }
@@ -0,0 +1,114 @@
+"""
+Liveness & Readiness
+---------------------
+  - liveness  (/healthz) — the process and its event loop are responsive.
+                           Never depends on MongoDB or the model, so a slow
+                           dependency does not get the pod restarted.
+  - readiness (/readyz)  — the pod should receive traffic: start-up finished
+                           and the model is warm, MongoDB answers a ping within
+                           READINESS_MAX_DB_LATENCY_MS, and the inference queue
+                           is below READINESS_MAX_QUEUE_DEPTH.
+
+Readiness is polled every second by load balancers, so the MongoDB ping is
+cached for READINESS_CACHE_TTL and concurrent probes share one in-flight
+ping.  Model and queue checks read in-memory state and are always fresh.
+"""
+
+import asyncio
+import logging
+import time
+
+from app.config import (
+    READINESS_CACHE_TTL,
+    READINESS_DB_TIMEOUT_MS,
+    READINESS_MAX_DB_LATENCY_MS,
+    READINESS_MAX_QUEUE_DEPTH,
+)
+from app import database
+from app.services.executor import queue_depth, worker_model_stats
+from app.services.ml_service import registry
+from app.services.startup import is_ready
+
+logger = logging.getLogger("cropguard.health")
+
+_started_at = time.time()
+_db_check: dict | None = None
+_db_checked_at = 0.0
+_db_lock = asyncio.Lock()
+
+
+# ── Individual checks ─────────────────────────────────────────────────
+def _check_model() -> dict:
+    snapshot = worker_model_stats()
+    if snapshot is not None:
+        # Process executor: the workers serve, the main process holds no model
+        if snapshot["model_version"] == "demo":
+            return {"ok": is_ready(), "model_version": "demo"}
+        return {"ok": bool(snapshot["warm"]), "model_version": snapshot["model_version"], "warm": snapshot["warm"]}
+
+    handle = registry.current()
+    if handle is None:
+        # Demo mode is a deliberate configuration, not a failure
+        return {"ok": is_ready(), "model_version": "demo"}
+    return {"ok": handle.warm, "model_version": handle.version, "warm": handle.warm}
+
+
+def _check_queue() -> dict:
+    depth = queue_depth()
+    return {"ok": depth < READINESS_MAX_QUEUE_DEPTH, "depth": depth, "max": READINESS_MAX_QUEUE_DEPTH}
+
+
+async def _ping_db() -> dict:
+    if database.client is None:
+        return {"ok": False, "error": "not connected"}
+
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(
+            database.client.admin.command("ping"),
+            timeout=READINESS_DB_TIMEOUT_MS / 1000,
+        )
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": f"ping timed out after {READINESS_DB_TIMEOUT_MS} ms"}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+    latency_ms = (time.perf_counter() - start) * 1000
+    return {
+        "ok": latency_ms <= READINESS_MAX_DB_LATENCY_MS,
+        "latency_ms": round(latency_ms, 1),
+        "max_latency_ms": READINESS_MAX_DB_LATENCY_MS,
+    }
+
+
+async def _check_db() -> dict:
+    """Cached MongoDB ping — at most one ping per READINESS_CACHE_TTL."""
+    global _db_check, _db_checked_at
+    if _db_check is not None and time.monotonic() - _db_checked_at < READINESS_CACHE_TTL:
+        return _db_check
+
+    async with _db_lock:
+        # Another probe may have refreshed it while we waited
+        if _db_check is None or time.monotonic() - _db_checked_at >= READINESS_CACHE_TTL:
+            _db_check = await _ping_db()
+            _db_checked_at = time.monotonic()
+            if not _db_check["ok"]:
+                logger.warning(f"MongoDB readiness check failed: {_db_check}")
+    return _db_check
+
+
+# ── Probes ────────────────────────────────────────────────────────────
+def liveness() -> dict:
+    return {"status": "alive", "uptime_s": round(time.time() - _started_at, 1)}
+
+
+async def readiness() -> tuple[bool, dict]:
+    """Returns (ready, per-check detail)."""
+    checks = {
+        "startup": {"ok": is_ready()},
+        "model": _check_model(),
+        "mongodb": await _check_db(),
+        "inference_queue": _check_queue(),
+    }
+    ready = all(check["ok"] for check in checks.values())
+    return ready, {"status": "ready" if ready else "not_ready", "checks": checks}
@@ -0,0 +1,119 @@
+"""
+History Pagination
+-------------------
+/api/history pages through a user's predictions newest first using a
+keyset on (created_at, _id) instead of skip/limit.  Each page ends with an
+opaque continuation token that encodes the sort key of its last document.
+The next page then starts with an index seek on the compound
+(user_id, created_at, _id) index, so every page costs the same however
+deep it is.
+
+Counting a large history is linear too, so the per-user total is cached
+for HISTORY_TOTAL_TTL seconds.  Inserts bump the cached count (see
+record_inserted), so it only drifts when another replica inserts or
+history is deleted; the TTL bounds that drift.
+"""
+
+import base64
+import binascii
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from app.config import HISTORY_TOTAL_TTL
+
+SORT = [("created_at", -1), ("_id", -1)]
+_TOTALS_MAX_ENTRIES = 10000
+
+
+class InvalidCursorError(ValueError):
+    """Raised for a continuation token this server did not issue."""
+
+
+# ── Continuation tokens ───────────────────────────────────────────────
+def encode_cursor(doc: dict) -> str:
+    """Token pointing just past ``doc`` in (created_at, _id) descending order."""
+    created_at = doc["created_at"]
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)  # Mongo returns naive UTC
+    millis = int(created_at.timestamp() * 1000)
+    raw = f"{millis}:{doc['_id']}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        millis, _, object_id = raw.partition(":")
+        return datetime.fromtimestamp(int(millis) / 1000, tz=timezone.utc), ObjectId(object_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, InvalidId, OverflowError):
+        raise InvalidCursorError("Invalid history cursor")
+
+
+def after_cursor(user_id: str, token: str) -> dict:
+    """Query for the user's predictions strictly after the cursor position."""
+    created_at, object_id = decode_cursor(token)
+    return {
+        "user_id": user_id,
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": object_id}},
+        ],
+    }
+
+
+# ── Cached totals ─────────────────────────────────────────────────────
+class _TotalCache:
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> int | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[user_id]
+                return None
+            return entry[1]
+
+    def put(self, user_id: str, total: int):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic(), total)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add(self, user_id: str, count: int):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                self._entries[user_id] = (entry[0], entry[1] + count)
+
+
+_totals = _TotalCache(HISTORY_TOTAL_TTL, _TOTALS_MAX_ENTRIES) if HISTORY_TOTAL_TTL > 0 else None
+
+
+async def count_history(db, user_id: str) -> int:
+    """Number of predictions in the user's history (cached for HISTORY_TOTAL_TTL)."""
+    if _totals is not None:
+        total = _totals.get(user_id)
+        if total is not None:
+            return total
+    total = await db.predictions.count_documents({"user_id": user_id})
+    if _totals is not None:
+        _totals.put(user_id, total)
+    return total
+
+
+def record_inserted(user_id: str, count: int = 1):
+    """Keep the cached total in step after inserting ``count`` history documents."""
+    if _totals is not None:
+        _totals.add(user_id, count)
@@ -0,0 +1,49 @@
+"""
+HTTP Caching for Static Responses
+----------------------------------
+Responses whose content only changes between deploys (the disease
+catalogue) are serialised once into a CachedPayload with a strong ETag
+derived from the body.  cached_response() serves the stored bytes with
+ETag + Cache-Control and answers a matching If-None-Match with
+304 Not Modified, so clients and CDNs revalidate with a header-sized
+round trip instead of re-downloading the catalogue.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.config import CATALOGUE_MAX_AGE
+from app.services.payloads import dumps
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    body: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, content: Any) -> "CachedPayload":
+        body = dumps(content)
+        return cls(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison: W/"x" matches "x"
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def cached_response(request: Request, payload: CachedPayload, max_age: int = CATALOGUE_MAX_AGE) -> Response:
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(payload.body, media_type="application/json", headers=headers)
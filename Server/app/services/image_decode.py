@@ -0,0 +1,44 @@
+"""
+Image Decoding
+---------------
+Decodes uploaded bytes straight to a bitmap close to the model input size
+instead of materialising the full 12–48 MP camera frame.
+
+  - JPEG: ``Image.draft`` asks libjpeg for DCT-domain downscaling (1/2, 1/4
+    or 1/8), so only the reduced bitmap is ever allocated.
+  - PNG / WebP / others: no reduced decode is available, so the image is
+    decoded once and shrunk with a cheap integer box ``reduce`` before the
+    final resampling filter runs.
+
+In both cases the result is kept at least DECODE_OVERSAMPLE × the target
+size, so the final resize filter still sees enough pixels to anti-alias.
+"""
+
+import io
+
+from PIL import Image
+
+from app.config import DECODE_OVERSAMPLE
+
+
+def decode_image(image_bytes: bytes, target_size: tuple[int, int]) -> Image.Image:
+    """Decode image bytes to an RGB image no smaller than DECODE_OVERSAMPLE × target_size."""
+    image = Image.open(io.BytesIO(image_bytes))
+
+    min_w = target_size[0] * DECODE_OVERSAMPLE
+    min_h = target_size[1] * DECODE_OVERSAMPLE
+
+    if image.format == "JPEG":
+        # Picks the largest DCT scale that keeps both sides ≥ the requested size
+        image.draft("RGB", (min_w, min_h))
+
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    else:
+        image.load()
+
+    factor = min(image.width // min_w, image.height // min_h)
+    if factor >= 2:
+        image = image.reduce(factor)
+
+    return image
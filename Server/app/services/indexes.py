@@ -0,0 +1,116 @@
+"""
+MongoDB Index Management
+-------------------------
+Every index the API relies on is declared here next to the query shape it
+serves.  connect_db() applies them with ensure_indexes(), and
+scripts/check_indexes.py explains each shape against a live MongoDB to
+prove that it is index-backed.
+
+The history index leads with the (user_id, created_at, _id) keyset used
+for paging, then carries the HistoryItem fields.  The summary view
+(?view=summary) is therefore a covered query, answered from the index
+alone without fetching documents and their bulky treatment arrays.  The
+full view uses the same index for the seek and sort, then fetches.
+
+Indexes in RETIRED_INDEXES are superseded by a compound index and are
+dropped if present.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+logger = logging.getLogger("cropguard.indexes")
+
+# Fields of a summary history item (models.HistoryItem); _id is the prediction id
+HISTORY_SUMMARY_FIELDS = (
+    "crop_name",
+    "disease_name",
+    "confidence",
+    "severity",
+    "status",
+    "model_version",
+    "created_at",
+)
+HISTORY_SUMMARY_PROJECTION = {name: 1 for name in HISTORY_SUMMARY_FIELDS}
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    keys: list[tuple[str, int]]
+    name: str
+    unique: bool = False
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """A representative query, used to explain-check that it is index-backed."""
+
+    name: str
+    collection: str
+    filter: dict
+    sort: list[tuple[str, int]] | None = None
+    projection: dict | None = None
+    limit: int = 21
+    covered: bool = False  # answered from the index without fetching documents
+    index: str = ""  # IndexSpec.name expected to win
+
+
+INDEXES = [
+    IndexSpec("users", [("email", ASCENDING)], "email_1", unique=True),
+    IndexSpec(
+        "predictions",
+        [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]
+        + [(name, ASCENDING) for name in HISTORY_SUMMARY_FIELDS if name != "created_at"],
+        "history_keyset_summary",
+    ),
+    IndexSpec("diseases", [("disease_name", ASCENDING)], "disease_name_1", unique=True),
+]
+
+RETIRED_INDEXES = {
+    # Superseded by history_keyset_summary (user_id is its prefix; created_at alone serves no query)
+    "predictions": ["user_id_1", "created_at_1", "user_id_1_created_at_-1__id_-1"],
+}
+
+
+def query_shapes(user_id: str = "000000000000000000000000") -> list[QueryShape]:
+    """The query shapes the routes issue, with placeholder values."""
+    from app.services.history import SORT as history_sort, after_cursor, encode_cursor
+
+    after = after_cursor(user_id, encode_cursor({"created_at": datetime(2025, 1, 1, tzinfo=timezone.utc), "_id": ObjectId()}))
+    return [
+        QueryShape("login_by_email", "users", {"email": "farmer@example.com"}, limit=1, index="email_1"),
+        QueryShape(
+            "history_first_page", "predictions", {"user_id": user_id}, sort=history_sort,
+            index="history_keyset_summary",
+        ),
+        QueryShape(
+            "history_after_cursor", "predictions", after, sort=history_sort,
+            index="history_keyset_summary",
+        ),
+        QueryShape(
+            "history_summary_first_page", "predictions", {"user_id": user_id}, sort=history_sort,
+            projection=HISTORY_SUMMARY_PROJECTION, covered=True, index="history_keyset_summary",
+        ),
+        QueryShape(
+            "history_summary_after_cursor", "predictions", after, sort=history_sort,
+            projection=HISTORY_SUMMARY_PROJECTION, covered=True, index="history_keyset_summary",
+        ),
+    ]
+
+
+async def ensure_indexes(db):
+    """Create the declared indexes and drop retired ones."""
+    for collection, names in RETIRED_INDEXES.items():
+        existing = await db[collection].index_information()
+        for name in names:
+            if name in existing:
+                await db[collection].drop_index(name)
+                logger.info(f"Dropped retired index {collection}.{name}")
+
+    for spec in INDEXES:
+        await db[spec.collection].create_index(spec.keys, name=spec.name, unique=spec.unique)
@@ -0,0 +1,274 @@
+"""
+Prometheus Metrics
+-------------------
+Minimal in-process metrics served at GET /metrics in the Prometheus text
+exposition format (version 0.0.4).
+
+Recording must not slow down inference, so every metric keeps one shard
+(a plain list of numbers) per thread.  ``inc`` / ``observe`` only touch
+the calling thread's shard — no locks, no allocation — and a scrape sums
+the shards.  A lock is taken only the first time a thread records to a
+metric, to register its shard.
+
+Stage histograms are recorded in the process that runs the stage.  With
+INFERENCE_EXECUTOR=process the ml_service stages (decode … result build)
+run in pool workers: each job returns what it recorded (drain_delta) and
+the parent folds it into its own metrics (merge_delta), so /metrics covers
+both modes.
+"""
+
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+# Seconds — from sub-millisecond normalisation up to multi-second cold forwards
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Sharded:
+    """Per-thread list of ``width`` numbers, summed on read."""
+
+    def __init__(self, width: int):
+        self._width = width
+        self._local = threading.local()
+        self._shards: list[list] = []
+        self._register = threading.Lock()
+
+    def _shard(self) -> list:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = [0] * self._width
+            with self._register:
+                self._shards.append(shard)
+        return shard
+
+    def _totals(self) -> list:
+        totals = [0] * self._width
+        for shard in list(self._shards):
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+    def _drain(self) -> list:
+        """Totals since the last drain, zeroing every shard (for shipping to another process)."""
+        totals = [0] * self._width
+        with self._register:
+            for shard in self._shards:
+                for i, value in enumerate(shard):
+                    totals[i] += value
+                    shard[i] = 0
+        return totals
+
+    def _merge(self, totals: list):
+        shard = self._shard()
+        for i, value in enumerate(totals):
+            shard[i] += value
+
+
+# ── Metric types ──────────────────────────────────────────────────────
+class Counter(_Sharded):
+    def __init__(self, labels: dict | None = None):
+        super().__init__(1)
+        self.label_values = labels or {}
+
+    def inc(self, amount: float = 1):
+        self._shard()[0] += amount
+
+    def value(self) -> float:
+        return self._totals()[0]
+
+    def samples(self, name: str):
+        yield name, self.label_values, self.value()
+
+
+class Histogram(_Sharded):
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS, labels: dict | None = None):
+        # Slots: one per bucket, one for +Inf, then the running sum
+        super().__init__(len(buckets) + 2)
+        self.buckets = buckets
+        self.label_values = labels or {}
+
+    def observe(self, value: float):
+        shard = self._shard()
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def samples(self, name: str):
+        totals = self._totals()
+        cumulative = 0
+        for upper, count in zip(self.buckets + ("+Inf",), totals):
+            cumulative += count
+            yield f"{name}_bucket", {**self.label_values, "le": str(upper)}, cumulative
+        yield f"{name}_sum", self.label_values, totals[-1]
+        yield f"{name}_count", self.label_values, cumulative
+
+
+class Family:
+    """A named metric with one child per label value (children are created once, then reused)."""
+
+    def __init__(self, name: str, help_text: str, kind: str, label: str | None = None, **child_kwargs):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.label = label
+        self._child_kwargs = child_kwargs
+        self._children: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+        if label is None:
+            self._children[""] = self._new_child({})
+        REGISTRY.append(self)
+
+    def _new_child(self, labels: dict):
+        cls = Histogram if self.kind == "histogram" else Counter
+        return cls(labels=labels, **self._child_kwargs)
+
+    def labels(self, value: str):
+        child = self._children.get(value)
+        if child is None:
+            with self._lock:
+                child = self._children.get(value)
+                if child is None:
+                    child = self._children[value] = self._new_child({self.label: value})
+        return child
+
+    def inc(self, amount: float = 1):
+        self._children[""].inc(amount)
+
+    def observe(self, value: float):
+        self._children[""].observe(value)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for child in list(self._children.values()):
+            for sample_name, labels, value in child.samples(self.name):
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class GaugeFunction:
+    """Gauge whose value is read from a callback at scrape time."""
+
+    def __init__(self, name: str, help_text: str, fn: Callable[[], float]):
+        self.name = name
+        self.help_text = help_text
+        self.fn = fn
+        REGISTRY.append(self)
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {_format_value(self.fn())}",
+        ]
+
+
+REGISTRY: list[Family | GaugeFunction] = []
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def drain_delta() -> list[tuple[str, str, list]]:
+    """Everything recorded in this process since the last drain, as (family, label value, totals)."""
+    delta = []
+    for metric in REGISTRY:
+        if isinstance(metric, Family):
+            for value, child in list(metric._children.items()):
+                totals = child._drain()
+                if any(totals):
+                    delta.append((metric.name, value, totals))
+    return delta
+
+
+def merge_delta(delta: list[tuple[str, str, list]]):
+    """Add a delta drained in a worker process to this process's metrics."""
+    families = {metric.name: metric for metric in REGISTRY if isinstance(metric, Family)}
+    for name, value, totals in delta:
+        family = families.get(name)
+        if family is None:
+            continue
+        child = family._children[""] if family.label is None else family.labels(value)
+        child._merge(totals)
+
+
+async def timed(histogram: Histogram, awaitable: Awaitable[T]) -> T:
+    """Await ``awaitable`` and record its duration — for route-level I/O stages."""
+    start = perf_counter()
+    try:
+        return await awaitable
+    finally:
+        histogram.observe(perf_counter() - start)
+
+
+# ── CropGuard metrics ─────────────────────────────────────────────────
+STAGE_SECONDS = Family(
+    "cropguard_stage_seconds",
+    "Time spent in each prediction stage",
+    "histogram",
+    label="stage",
+)
+# Pre-created children so the hot path never looks up or allocates a label set
+UPLOAD_READ = STAGE_SECONDS.labels("upload_read")
+DECODE = STAGE_SECONDS.labels("decode")
+RESIZE = STAGE_SECONDS.labels("resize")
+NORMALIZE = STAGE_SECONDS.labels("normalize")
+FORWARD = STAGE_SECONDS.labels("forward")
+RESULT_BUILD = STAGE_SECONDS.labels("result_build")
+MONGO_INSERT = STAGE_SECONDS.labels("mongo_insert")
+
+PREDICTIONS = Family(
+    "cropguard_predictions_total",
+    "Predictions served, by how the result was produced",
+    "counter",
+    label="source",
+)
+PREDICTIONS_MODEL = PREDICTIONS.labels("model")
+PREDICTIONS_DEMO = PREDICTIONS.labels("demo")
+PREDICTIONS_CACHE = PREDICTIONS.labels("cache")
+PREDICTIONS_NEAR_DUPLICATE = PREDICTIONS.labels("near_duplicate")
+
+LOW_CONFIDENCE = Family(
+    "cropguard_low_confidence_total",
+    "Model predictions below CONFIDENCE_THRESHOLD (returned as Uncertain)",
+    "counter",
+)
+
+CLASS_PREDICTIONS = Family(
+    "cropguard_class_predictions_total",
+    "Model predictions per predicted class",
+    "counter",
+    label="class_name",
+)
+
+TOKEN_CACHE = Family(
+    "cropguard_token_cache_total",
+    "Verified-token cache lookups, by result",
+    "counter",
+    label="result",
+)
+TOKEN_CACHE_HIT = TOKEN_CACHE.labels("hit")
+TOKEN_CACHE_MISS = TOKEN_CACHE.labels("miss")
+TOKEN_CACHE_EXPIRED = TOKEN_CACHE.labels("expired")
@@ -13,12 +13,40 @@ import io
 import json
 import random
 import logging
+from dataclasses import dataclass
 from pathlib import Path
+from time import perf_counter
 
 import numpy as np
 from PIL import Image
 
-from app.config import MODEL_PATH, CLASS_MAP_PATH, CONFIDENCE_THRESHOLD
+from app.config import (
+    MODEL_PATH,
+    CLASS_MAP_PATH,
+    CONFIDENCE_THRESHOLD,
+    INFERENCE_BATCHING,
+    BATCH_FORWARD_SIZE,
+    INFERENCE_BACKEND,
+    ONNX_MODEL_PATH,
+    MODEL_VARIANT,
+    QUANTIZED_MODEL_PATH,
+    MODEL_DIR,
+    MODEL_WATCH_INTERVAL,
+    INFERENCE_EXECUTOR,
+)
+from app.services import executor, metrics, payloads
+from app.services.backends import KerasBackend, OnnxBackend, TorchScriptBackend
+from app.services.image_decode import decode_image
+from app.services.model_registry import ModelHandle, ModelRegistry
+from app.services.phash import image_key, near_duplicate_index
+from app.services.prediction_cache import prediction_cache
+from app.services.preprocess import (
+    IMG_SIZE,
+    BatchBuffer,
+    normalize_into,
+    resize_rgb,
+    to_tensor,
+)
 from app.services.disease_data import (
     DISEASE_DATABASE,
     CLASS_INDEX_MAP,
@@ -27,31 +55,56 @@ from app.services.disease_data import (
 
 logger = logging.getLogger("cropguard.ml")
 
-# ── Globals ───────────────────────────────────────────────────────────
-_model = None
-_class_map: dict | None = None
-
-IMG_SIZE = (224, 224)
-
-# ImageNet normalisation (must match training transforms)
-IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
-IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+# ── Model Loading ─────────────────────────────────────────────────────
+def _load_class_map() -> dict | None:
+    class_map_path = Path(CLASS_MAP_PATH)
+    if not class_map_path.exists():
+        return None
+    with open(class_map_path) as f:
+        class_map = json.load(f)
+    logger.info(f"Loaded class map with {len(class_map)} classes")
+    return class_map
 
 
-# ── Model Loading ─────────────────────────────────────────────────────
-def load_model():
+def _load_handle(batching: bool = INFERENCE_BATCHING) -> ModelHandle | None:
     """
-    Attempt to load the ML model at startup.
-    Returns True if model loaded, False if running in demo mode.
+    Load the configured model from disk without touching the serving model.
+    Returns None if no model file / framework is available.
     """
-    global _model, _class_map
-
-    # Try loading class map
-    class_map_path = Path(CLASS_MAP_PATH)
-    if class_map_path.exists():
-        with open(class_map_path) as f:
-            _class_map = json.load(f)
-        logger.info(f"Loaded class map with {len(_class_map)} classes")
+    loaded = _load_backend()
+    if loaded is None:
+        return None
+    backend, path = loaded
+    class_map = _load_class_map()
+    return ModelHandle(
+        backend, class_map, path, batching,
+        classes=_resolve_classes(class_map),
+        submitters=executor.active_submitters if INFERENCE_EXECUTOR == "thread" else None,
+    )
+
+
+def _load_backend() -> tuple[object, Path] | None:
+    """Find and load the model file → (backend, path), or None for demo mode."""
+    # ── ONNX Runtime (opt-in: INT8 variant or fp32 export) ───────
+    onnx_candidates = []
+    if MODEL_VARIANT == "int8":
+        onnx_candidates.append((Path(QUANTIZED_MODEL_PATH), "scripts/quantize_model.py"))
+    if INFERENCE_BACKEND == "onnx":
+        onnx_candidates.append((Path(ONNX_MODEL_PATH), "scripts/export_onnx.py"))
+
+    for onnx_path, script in onnx_candidates:
+        if not onnx_path.exists():
+            logger.warning(f"ONNX model not found at {onnx_path} — run {script}")
+            continue
+        try:
+            backend = OnnxBackend(str(onnx_path))
+            logger.info(f"✅ ONNX Runtime model loaded from {onnx_path}")
+            return backend, onnx_path
+        except ImportError:
+            logger.warning("onnxruntime not installed — falling back to TorchScript.")
+            break
+        except Exception as e:
+            logger.error(f"Failed to load ONNX model {onnx_path}: {e}")
 
     # ── Find model file (.pt or .h5) ─────────────────────────────
     model_path = Path(MODEL_PATH)
@@ -72,17 +125,14 @@ def load_model():
 
     if not model_path.exists():
         logger.warning(f"Model file not found at {model_path}. Running in DEMO mode.")
-        return False
+        return None
 
     # ── Load PyTorch model ───────────────────────────────────────
     try:
-        import torch
-
         if model_path.suffix in (".pt", ".pth"):
-            _model = torch.jit.load(str(model_path), map_location="cpu")
-            _model.eval()
+            backend = TorchScriptBackend(str(model_path))
             logger.info(f"✅ PyTorch model loaded from {model_path}")
-            return True
+            return backend, model_path
     except ImportError:
         logger.warning("PyTorch not installed.")
     except Exception as e:
@@ -90,22 +140,131 @@ def load_model():
 
     # ── Fallback: TensorFlow ─────────────────────────────────────
     try:
-        import tensorflow as tf
-
-        _model = tf.keras.models.load_model(str(model_path))
+        backend = KerasBackend(str(model_path))
         logger.info(f"✅ TensorFlow model loaded from {model_path}")
-        return True
+        return backend, model_path
     except ImportError:
         logger.warning("TensorFlow not installed either.")
     except Exception as e:
         logger.error(f"Failed to load TF model: {e}")
 
     logger.warning("No ML framework available. Running in DEMO mode.")
-    return False
+    return None
+
+
+def _on_model_swap(handle: ModelHandle):
+    # Near-duplicate hits store raw predictions, which are only valid for one model
+    if near_duplicate_index is not None:
+        near_duplicate_index.clear()
+
+
+def _model_files_fingerprint() -> tuple:
+    """Size/mtime of every file a reload would read — changes trigger hot reload."""
+    paths = {Path(MODEL_PATH), Path(ONNX_MODEL_PATH), Path(QUANTIZED_MODEL_PATH), Path(CLASS_MAP_PATH)}
+    if MODEL_DIR.exists():
+        paths.update(p for p in MODEL_DIR.iterdir() if p.suffix in (".pt", ".pth", ".h5", ".onnx", ".json"))
+    fingerprint = []
+    for path in sorted(paths):
+        if path.exists():
+            stat = path.stat()
+            fingerprint.append((str(path), stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+# ── Globals ───────────────────────────────────────────────────────────
+_batching = INFERENCE_BATCHING  # process-pool workers load with batching=False
+registry = ModelRegistry(loader=lambda: _load_handle(_batching), on_swap=_on_model_swap)
+
+
+def load_model(batching: bool = INFERENCE_BATCHING, watch: bool = True):
+    """
+    Attempt to load the ML model at startup.
+    Returns True if model loaded, False if running in demo mode.
+    """
+    global _batching
+    _batching = batching
+
+    # Watch even in demo mode so a model copied into MODEL_DIR later is picked up
+    if watch:
+        registry.start_watcher(_model_files_fingerprint, MODEL_WATCH_INTERVAL)
+
+    handle = _load_handle(batching)
+    if handle is None:
+        return False
+
+    handle.start()
+    registry.swap(handle)
+    return True
+
+
+def warm_up_model() -> bool:
+    """
+    Pay first-request costs up front: PIL decoder/resampler initialisation
+    and synthetic forward passes at every batch size the model will see.
+    Returns False in demo mode.
+    """
+    synthetic = io.BytesIO()
+    Image.new("RGB", (IMG_SIZE[0] * 2, IMG_SIZE[1] * 2), (60, 140, 60)).save(synthetic, "JPEG")
+    rgb = resize_rgb(decode_image(synthetic.getvalue(), IMG_SIZE), IMG_SIZE)
+    if near_duplicate_index is not None:
+        image_key(rgb)
+
+    handle = registry.current()
+    if handle is None:
+        return False
+    handle.warm_up()
+    return True
+
+
+def watch_worker_model():
+    """Process mode: the main process holds no model, so file changes recycle the worker pool."""
+    registry.start_watcher(_model_files_fingerprint, MODEL_WATCH_INTERVAL, on_change=executor.recycle_workers)
+
+
+def reload_model() -> bool:
+    """Load, warm and hot-swap the model currently on disk (blocking)."""
+    if executor.worker_model_stats() is not None:
+        return executor.recycle_workers()
+    return registry.reload()
 
 
 def is_model_loaded() -> bool:
-    return _model is not None
+    """Whether a real model serves requests (in this process, or in the process-pool workers)."""
+    snapshot = executor.worker_model_stats()
+    if snapshot is not None:
+        return snapshot["model_version"] != "demo"
+    return registry.current() is not None
+
+
+def shutdown():
+    """Stop background inference workers."""
+    registry.close()
+
+
+def get_inference_stats() -> dict:
+    """Serving model, achieved micro-batch sizes and cache hit rates."""
+    handle = registry.current()
+    batcher = handle.batcher if handle else None
+    return {
+        **registry.stats(),
+        "unresolved_classes": [c.class_name for c in handle.classes if c.disease_info is None] if handle else [],
+        "batching": batcher is not None,
+        **(batcher.stats() if batcher else {}),
+        "cache": prediction_cache.stats() if prediction_cache else None,
+        "near_duplicates": near_duplicate_index.stats() if near_duplicate_index else None,
+    }
+
+
+def get_serving_stats() -> dict:
+    """get_inference_stats() of whichever process serves predictions."""
+    snapshot = executor.worker_model_stats()
+    return snapshot if snapshot is not None else get_inference_stats()
+
+
+async def refresh_serving_stats() -> dict:
+    """get_serving_stats(), re-read from a worker first in process mode."""
+    snapshot = await executor.refresh_worker_model()
+    return snapshot if snapshot is not None else get_inference_stats()
 
 
 # ── Image Preprocessing ──────────────────────────────────────────────
@@ -117,18 +276,9 @@ def preprocess_image(image: Image.Image) -> np.ndarray:
       - Scale to [0, 1]
       - Normalise with ImageNet mean/std
       - Shape: (1, 3, 224, 224) for PyTorch
+    See app/services/preprocess.py for the fused, copy-free implementation.
     """
-    image = image.convert("RGB")
-    image = image.resize(IMG_SIZE, Image.Resampling.LANCZOS)
-    arr = np.array(image, dtype=np.float32) / 255.0  # [0, 1]
-
-    # ImageNet normalisation
-    arr = (arr - IMAGENET_MEAN) / IMAGENET_STD
-
-    # HWC → CHW (PyTorch format)
-    arr = arr.transpose(2, 0, 1)
-
-    return np.expand_dims(arr, axis=0)  # (1, 3, 224, 224)
+    return to_tensor(resize_rgb(image, IMG_SIZE))
 
 
 # ── Class Key Matching ───────────────────────────────────────────────
@@ -186,10 +336,20 @@ CLASS_NAME_TO_DB_KEY = {
 }
 
 
+# Built once — DISEASE_DATABASE is static
+_LOWER_KEY_MAP = {k.lower().replace(" ", "_"): k for k in DISEASE_DATABASE}
+_CROP_DISEASE_KEY_MAP = {
+    (parts[0].lower(), parts[1].lower().replace("_", "")): k
+    for k in DISEASE_DATABASE
+    if len(parts := k.split("___")) == 2
+}
+
+
 def _match_class_to_disease(class_name: str) -> str:
     """
     Match a dataset class name (e.g. 'Brownspot', 'American Bollworm on Cotton')
     to a DISEASE_DATABASE key (e.g. 'Rice___Brown_Spot', 'Cotton___American_Bollworm').
+    Unmatched names are returned unchanged.
     """
     # 1. Exact match in explicit mapping
     if class_name in CLASS_NAME_TO_DB_KEY:
@@ -200,143 +360,275 @@ def _match_class_to_disease(class_name: str) -> str:
         return class_name
 
     # 3. Lowercase comparison
-    lower_map = {k.lower().replace(" ", "_"): k for k in DISEASE_DATABASE}
     normalised = class_name.lower().replace(" ", "_")
-
-    if normalised in lower_map:
-        return lower_map[normalised]
+    if normalised in _LOWER_KEY_MAP:
+        return _LOWER_KEY_MAP[normalised]
 
     # 4. Fuzzy: crop___disease matching
     parts = class_name.split("___")
     if len(parts) == 2:
         crop, disease = parts
-        for db_key in DISEASE_DATABASE:
-            db_parts = db_key.split("___")
-            if len(db_parts) == 2:
-                if (crop.lower() == db_parts[0].lower() and
-                        disease.lower().replace("_", "") == db_parts[1].lower().replace("_", "")):
-                    return db_key
-
-    logger.warning(f"No disease data match for class '{class_name}'")
+        db_key = _CROP_DISEASE_KEY_MAP.get((crop.lower(), disease.lower().replace("_", "")))
+        if db_key:
+            return db_key
+
     return class_name
 
 
+# ── Class resolution table ────────────────────────────────────────────
+@dataclass(frozen=True)
+class ResolvedClass:
+    """What one model output index means, resolved once when the model loads."""
+    class_name: str
+    class_key: str
+    disease_info: dict | None  # None → generic result built from crop/disease below
+    crop: str
+    disease: str
+    fields: dict | None  # pre-built static result fields (pre-serialised in payloads)
+
+
+def _resolve_class(class_name: str) -> ResolvedClass:
+    class_key = _match_class_to_disease(class_name)
+    parts = class_name.split("___")
+    crop = parts[0].replace("_", " ") if parts else "Unknown"
+    disease = parts[1].replace("_", " ") if len(parts) > 1 else class_name.replace("_", " ")
+    disease_info = get_disease_info(class_key)
+    fields = _DISEASE_FIELDS[class_key] if disease_info else None
+    return ResolvedClass(class_name, class_key, disease_info, crop, disease, fields)
+
+
+def _resolve_classes(class_map: dict | None) -> list[ResolvedClass]:
+    """
+    Output index → ResolvedClass for every class the model can predict, so a
+    prediction is a single list lookup.  Classes without disease data are
+    reported here once instead of on every request.
+    """
+    if class_map:
+        size = max(int(idx) for idx in class_map) + 1
+        names = [class_map.get(str(idx), f"Unknown_{idx}") for idx in range(size)]
+    else:
+        names = [CLASS_INDEX_MAP[idx] for idx in range(len(CLASS_INDEX_MAP))]
+
+    classes = [_resolve_class(name) for name in names]
+    unresolved = [c.class_name for c in classes if c.disease_info is None]
+    if unresolved:
+        logger.warning(
+            f"{len(unresolved)} of {len(classes)} model classes have no disease data "
+            f"and will get generic results: {unresolved}"
+        )
+    return classes
+
+
 # ── Prediction ────────────────────────────────────────────────────────
 def predict(image_bytes: bytes) -> dict:
     """
     Run disease prediction on image bytes.
     Returns a dict with crop_name, disease_name, confidence, and treatment info.
     """
-    image = Image.open(io.BytesIO(image_bytes))
+    with registry.use() as handle:
+        cache_key, cached = _lookup_cache(handle, image_bytes)
+        if cached is not None:
+            return cached
 
-    if _model is not None:
-        result = _run_real_inference(image)
-    else:
-        result = _run_demo_inference()
+        start = perf_counter()
+        image = decode_image(image_bytes, IMG_SIZE)
+        metrics.DECODE.observe(perf_counter() - start)
 
-    return result
+        if handle is None:
+            return _run_demo_inference()
 
+        try:
+            class_idx, confidence = _classify(handle, image)
+        except Exception as e:
+            logger.error(f"Inference failed: {e}")
+            return _run_demo_inference()
 
-def _run_real_inference(image: Image.Image) -> dict:
-    """Run actual model inference."""
-    tensor = preprocess_image(image)
+        result = _result_from_prediction(handle, class_idx, confidence)
+        if cache_key is not None:
+            prediction_cache.put(cache_key, result)
+        return result
 
-    try:
-        import torch
 
-        with torch.no_grad():
-            input_tensor = torch.from_numpy(tensor)
-            outputs = _model(input_tensor)
-            probs = torch.nn.functional.softmax(outputs, dim=1)[0]
-            class_idx = int(torch.argmax(probs))
-            confidence = float(probs[class_idx])
+def predict_many(images: list[bytes]) -> list[dict | None]:
+    """
+    Batch counterpart of predict() for multi-image uploads.
+    Images that miss both caches go through one forward pass per
+    BATCH_FORWARD_SIZE images.  Entries that cannot be decoded are None.
+    """
+    with registry.use() as handle:
+        return _predict_many(handle, images)
+
+
+def _predict_many(handle: ModelHandle | None, images: list[bytes]) -> list[dict | None]:
+    results: list[dict | None] = [None] * len(images)
+    pending = []  # (index, cache_key, image_hash, rgb)
+
+    for i, image_bytes in enumerate(images):
+        cache_key, cached = _lookup_cache(handle, image_bytes)
+        if cached is not None:
+            results[i] = cached
+            continue
 
-    except ImportError:
-        # TensorFlow fallback
         try:
-            probs = _model.predict(tensor, verbose=0)[0]
-            class_idx = int(np.argmax(probs))
-            confidence = float(probs[class_idx])
+            start = perf_counter()
+            image = decode_image(image_bytes, IMG_SIZE)
+            resized = perf_counter()
+            rgb = resize_rgb(image, IMG_SIZE)
+            metrics.DECODE.observe(resized - start)
+            metrics.RESIZE.observe(perf_counter() - resized)
         except Exception as e:
-            logger.error(f"Inference failed: {e}")
-            return _run_demo_inference()
-    except Exception as e:
-        logger.error(f"Inference failed: {e}")
-        return _run_demo_inference()
+            logger.warning(f"Batch image {i} could not be decoded: {e}")
+            continue
 
-    # Map index → class name → disease database key
-    if _class_map:
-        class_name = _class_map.get(str(class_idx), f"Unknown_{class_idx}")
-    else:
-        class_name = CLASS_INDEX_MAP.get(class_idx, list(DISEASE_DATABASE.keys())[0])
+        if handle is None:
+            results[i] = _run_demo_inference()
+            continue
 
-    class_key = _match_class_to_disease(class_name)
+        image_hash, prediction = _lookup_near_duplicate(rgb)
+        if prediction is not None:
+            results[i] = _result_from_prediction(handle, *prediction)
+            continue
+
+        pending.append((i, cache_key, image_hash, rgb))
+
+    for start in range(0, len(pending), BATCH_FORWARD_SIZE):
+        chunk = pending[start:start + BATCH_FORWARD_SIZE]
+        buffer = BatchBuffer(len(chunk), IMG_SIZE)
+        t0 = perf_counter()
+        for slot, (_, _, _, rgb) in enumerate(chunk):
+            normalize_into(rgb, buffer.slot(slot))
+        metrics.NORMALIZE.observe((perf_counter() - t0) / len(chunk))
+
+        try:
+            probs = handle.forward(buffer.view(len(chunk)))
+        except Exception as e:
+            logger.error(f"Batch inference failed: {e}")
+            for i, _, _, _ in chunk:
+                results[i] = _run_demo_inference()
+            continue
+
+        for row, (i, cache_key, image_hash, _) in zip(probs, chunk):
+            class_idx = int(np.argmax(row))
+            confidence = float(row[class_idx])
+            if image_hash is not None:
+                near_duplicate_index.add(image_hash, (class_idx, confidence))
+            metrics.PREDICTIONS_MODEL.inc()
+            results[i] = _result_from_prediction(handle, class_idx, confidence)
+            if cache_key is not None:
+                prediction_cache.put(cache_key, results[i])
+
+    return results
+
+
+def _classify(handle: ModelHandle, image: Image.Image) -> tuple[int, float]:
+    """Run actual model inference → (class index, confidence)."""
+    start = perf_counter()
+    rgb = resize_rgb(image, IMG_SIZE)
+    metrics.RESIZE.observe(perf_counter() - start)
+
+    # Near-identical image classified recently → reuse its prediction
+    image_hash, prediction = _lookup_near_duplicate(rgb)
+    if prediction is None:
+        prediction = _classify_rgb(handle, rgb)
+        if image_hash is not None:
+            near_duplicate_index.add(image_hash, prediction)
+    return prediction
+
+
+def _lookup_cache(handle: ModelHandle | None, image_bytes: bytes) -> tuple[str | None, dict | None]:
+    """Exact-upload cache → (key to store the result under, cached result or None)."""
+    if handle is None or prediction_cache is None:
+        return None, None
+    cache_key = prediction_cache.make_key(image_bytes, handle.version, handle.classes_digest)
+    cached = prediction_cache.get(cache_key)
+    if cached is not None:
+        metrics.PREDICTIONS_CACHE.inc()
+    return cache_key, cached
+
+
+def _lookup_near_duplicate(rgb: np.ndarray) -> tuple[tuple | None, tuple[int, float] | None]:
+    """Near-duplicate index → (key to store the prediction under, reusable prediction or None)."""
+    if near_duplicate_index is None:
+        return None, None
+    image_hash = image_key(rgb)
+    if image_hash is None:
+        return None, None  # too flat to match reliably
+    prediction = near_duplicate_index.lookup(image_hash)
+    if prediction is not None:
+        metrics.PREDICTIONS_NEAR_DUPLICATE.inc()
+    return image_hash, prediction
+
+
+def _classify_rgb(handle: ModelHandle, rgb: np.ndarray) -> tuple[int, float]:
+    probs = handle.infer(rgb)
+    metrics.PREDICTIONS_MODEL.inc()
+    class_idx = int(np.argmax(probs))
+    return class_idx, float(probs[class_idx])
+
+
+def _result_from_prediction(handle: ModelHandle, class_idx: int, confidence: float) -> dict:
+    """Map a model prediction to the response dict, tagged with the model version."""
+    start = perf_counter()
+    result = {**_map_prediction(handle.classes, class_idx, confidence), "model_version": handle.version}
+    metrics.RESULT_BUILD.observe(perf_counter() - start)
+    return result
+
+
+def _map_prediction(classes: list[ResolvedClass], class_idx: int, confidence: float) -> dict:
+    # Index → class resolved at model load
+    if 0 <= class_idx < len(classes):
+        resolved = classes[class_idx]
+    else:
+        resolved = _resolve_class(f"Unknown_{class_idx}")
+    class_name, class_key = resolved.class_name, resolved.class_key
     confidence_pct = int(confidence * 100)
 
     logger.info(f"Prediction: idx={class_idx}, class='{class_name}', key='{class_key}', conf={confidence_pct}%")
+    metrics.CLASS_PREDICTIONS.labels(class_name).inc()
 
     # Low confidence fallback
     if confidence < CONFIDENCE_THRESHOLD:
-        return {
-            "crop_name": "Unknown",
-            "disease_name": "Uncertain",
-            "confidence": confidence_pct,
-            "severity": "Unknown",
-            "spread_risk": "Unknown",
-            "description": "The model could not identify the disease with sufficient confidence. "
-            "Please upload a clearer, closer image of the affected leaf.",
-            "symptoms": [],
-            "organic_treatment": ["Consult a local agricultural expert for accurate diagnosis."],
-            "chemical_treatment": ["Visit your nearest Krishi Vigyan Kendra (KVK) for guidance."],
-            "dosage": "Not applicable",
-            "prevention": ["Take clear, well-lit photos of individual leaves for better results."],
-            "status": "Uncertain",
-        }
-
-    # Build result from disease data
-    disease_info = get_disease_info(class_key)
+        metrics.LOW_CONFIDENCE.inc()
+        return {**_UNCERTAIN_FIELDS, "confidence": confidence_pct, "class_key": None}
+
+    # Static fields rendered once per class (see _resolve_class)
+    if resolved.fields is not None:
+        return {**resolved.fields, "confidence": confidence_pct, "class_key": class_key}
 
     # Generic fallback for unmatched classes
-    if not disease_info:
-        parts = class_name.split("___")
-        crop = parts[0].replace("_", " ") if parts else "Unknown"
-        disease = parts[1].replace("_", " ") if len(parts) > 1 else class_name.replace("_", " ")
-
-        return {
-            "crop_name": crop,
-            "disease_name": disease,
-            "confidence": confidence_pct,
-            "severity": "Medium",
-            "spread_risk": "Medium",
-            "description": f"Detected {disease} on {crop} with {confidence_pct}% confidence.",
-            "symptoms": [],
-            "organic_treatment": ["Consult a local agricultural expert for specific treatment."],
-            "chemical_treatment": ["Visit your nearest Krishi Vigyan Kendra (KVK) for guidance."],
-            "dosage": "Consult an expert",
-            "prevention": ["Practice crop rotation", "Use disease-resistant varieties"],
-            "status": "Healthy" if "healthy" in disease.lower() else "Diseased",
-        }
-
-    return _build_result(disease_info, confidence_pct)
+    crop, disease = resolved.crop, resolved.disease
+    return {
+        "crop_name": crop,
+        "disease_name": disease,
+        "confidence": confidence_pct,
+        "severity": "Medium",
+        "spread_risk": "Medium",
+        "description": f"Detected {disease} on {crop} with {confidence_pct}% confidence.",
+        "symptoms": [],
+        "organic_treatment": ["Consult a local agricultural expert for specific treatment."],
+        "chemical_treatment": ["Visit your nearest Krishi Vigyan Kendra (KVK) for guidance."],
+        "dosage": "Consult an expert",
+        "prevention": ["Practice crop rotation", "Use disease-resistant varieties"],
+        "status": "Healthy" if "healthy" in disease.lower() else "Diseased",
+        "class_key": class_key,
+    }
 
 
 def _run_demo_inference() -> dict:
     """Demo mode: return realistic random result."""
     logger.info("🎭 DEMO mode — returning random disease result")
-    keys = list(DISEASE_DATABASE.keys())
-    class_key = random.choice(keys)
-    disease_info = DISEASE_DATABASE[class_key]
+    metrics.PREDICTIONS_DEMO.inc()
+    class_key = random.choice(_DEMO_KEYS)
     confidence = random.randint(78, 97)
-    return _build_result(disease_info, confidence)
+    return {**_DISEASE_FIELDS[class_key], "confidence": confidence, "class_key": class_key, "model_version": "demo"}
 
 
-def _build_result(disease_info: dict, confidence: int) -> dict:
-    """Build a standardised prediction result dict."""
+def _static_fields(disease_info: dict) -> dict:
+    """The confidence-independent part of a result for one disease record."""
     is_healthy = disease_info.get("disease_name") == "Healthy"
     return {
         "crop_name": disease_info.get("crop", "Unknown"),
         "disease_name": disease_info.get("disease_name", "Unknown"),
-        "confidence": confidence,
         "severity": disease_info.get("severity", "Unknown"),
         "spread_risk": disease_info.get("spread_risk", "Unknown"),
         "description": disease_info.get("description", ""),
@@ -347,3 +639,26 @@ def _build_result(disease_info: dict, confidence: int) -> dict:
         "prevention": disease_info.get("prevention", []),
         "status": "Healthy" if is_healthy else "Diseased",
     }
+
+
+_UNCERTAIN_FIELDS = {
+    "crop_name": "Unknown",
+    "disease_name": "Uncertain",
+    "severity": "Unknown",
+    "spread_risk": "Unknown",
+    "description": "The model could not identify the disease with sufficient confidence. "
+    "Please upload a clearer, closer image of the affected leaf.",
+    "symptoms": [],
+    "organic_treatment": ["Consult a local agricultural expert for accurate diagnosis."],
+    "chemical_treatment": ["Visit your nearest Krishi Vigyan Kendra (KVK) for guidance."],
+    "dosage": "Not applicable",
+    "prevention": ["Take clear, well-lit photos of individual leaves for better results."],
+    "status": "Uncertain",
+}
+payloads.register_uncertain(_UNCERTAIN_FIELDS)
+
+# Every disease record's static fields, built and pre-serialised once
+_DISEASE_FIELDS = {key: _static_fields(info) for key, info in DISEASE_DATABASE.items()}
+for _key, _fields in _DISEASE_FIELDS.items():
+    payloads.register(_key, _fields)
+_DEMO_KEYS = list(DISEASE_DATABASE)
@@ -0,0 +1,269 @@
+"""
+Model Registry
+---------------
+Holds the serving model and swaps in retrained models without a restart.
+
+A new model is loaded and warmed in the background while the current one
+keeps serving.  It is then swapped in atomically.  Requests already running
+on the old model finish on it, and the old model's micro-batcher is only
+stopped once they have drained.
+
+Reloads are triggered by POST /api/admin/models/reload, or by the MODEL_DIR
+watcher when MODEL_WATCH_INTERVAL > 0.  The watcher waits until the model
+files have stopped changing for one poll, so half-copied files are never
+loaded.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+
+from app.config import (
+    INFERENCE_MAX_BATCH_SIZE,
+    INFERENCE_MAX_WAIT_MS,
+    BATCH_FORWARD_SIZE,
+    WARMUP_ITERATIONS,
+)
+from app.services import metrics
+from app.services.batcher import MicroBatcher
+from app.services.preprocess import IMG_SIZE, BatchBuffer, normalize_into
+
+logger = logging.getLogger("cropguard.registry")
+
+
+def _timed_normalize(rgb: np.ndarray, out: np.ndarray):
+    start = time.perf_counter()
+    normalize_into(rgb, out)
+    metrics.NORMALIZE.observe(time.perf_counter() - start)
+
+
+class ModelHandle:
+    """One loaded model: backend, class map, version and its own micro-batcher."""
+
+    def __init__(
+        self,
+        backend,
+        class_map: dict | None,
+        source: Path,
+        batching: bool,
+        classes: list | None = None,
+        submitters: Callable[[], int] | None = None,
+    ):
+        stat = source.stat()
+        self.backend = backend
+        self.class_map = class_map
+        self.classes = classes or []  # output index → resolved class record (see ml_service)
+        # Changes when the class map or the disease data it resolves to changes
+        self.classes_digest = hashlib.blake2b(repr(self.classes).encode(), digest_size=8).hexdigest()
+        self.source = source
+        self.version = f"{source.name}@{stat.st_size:x}-{stat.st_mtime_ns:x}"
+        self.loaded_at = time.time()
+        self.warm = False
+
+        self.batcher = (
+            MicroBatcher(
+                self.forward, INFERENCE_MAX_BATCH_SIZE, INFERENCE_MAX_WAIT_MS,
+                fill_slot=_timed_normalize, submitters=submitters,
+            )
+            if batching
+            else None
+        )
+        self._local = threading.local()  # per-thread single-slot input buffer (unbatched path)
+        self._inflight = 0
+        self._idle = threading.Condition()
+
+    # ── Inference ─────────────────────────────────────────────────────
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        """(N, 3, 224, 224) batch → (N, num_classes) probabilities."""
+        start = time.perf_counter()
+        probs = self.backend.run(batch)
+        metrics.FORWARD.observe(time.perf_counter() - start)
+        return probs
+
+    def infer(self, rgb: np.ndarray) -> np.ndarray:
+        """Probabilities for a single uint8 HWC image, micro-batched when enabled."""
+        if self.batcher is not None:
+            return self.batcher.submit(rgb).result()
+
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = BatchBuffer(1, IMG_SIZE)
+        _timed_normalize(rgb, buffer.slot(0))
+        return self.forward(buffer.view(1))[0]
+
+    # ── Lifecycle ─────────────────────────────────────────────────────
+    def start(self):
+        if self.batcher is not None:
+            self.batcher.start()
+
+    def warm_up(self, iterations: int = WARMUP_ITERATIONS) -> float:
+        """
+        Run synthetic batches at every batch size this model will see, so
+        TorchScript profiling/specialisation and allocator growth happen
+        before serving.  Returns the elapsed seconds.
+        """
+        start = time.perf_counter()
+        batch_sizes = {1, BATCH_FORWARD_SIZE}
+        if self.batcher is not None:
+            batch_sizes.add(INFERENCE_MAX_BATCH_SIZE)
+
+        rng = np.random.default_rng(0)
+        for batch_size in sorted(batch_sizes):
+            batch = rng.standard_normal((batch_size, 3, IMG_SIZE[1], IMG_SIZE[0]), dtype=np.float32)
+            for _ in range(max(iterations, 1)):
+                self.backend.run(batch)  # bypasses forward() so warm-up stays out of /metrics
+
+        elapsed = time.perf_counter() - start
+        self.warm = True
+        logger.info(
+            f"Warmed {self.version} in {elapsed * 1000:.0f} ms "
+            f"(batch sizes {sorted(batch_sizes)}, {max(iterations, 1)} passes each)"
+        )
+        return elapsed
+
+    def _acquire(self):
+        with self._idle:
+            self._inflight += 1
+
+    def _release(self):
+        with self._idle:
+            self._inflight -= 1
+            if self._inflight == 0:
+                self._idle.notify_all()
+
+    def retire(self, timeout: float = 60.0):
+        """Wait for in-flight requests to drain, then stop the batcher."""
+        with self._idle:
+            if not self._idle.wait_for(lambda: self._inflight == 0, timeout):
+                logger.warning(f"Model {self.version} retired with {self._inflight} requests in flight")
+        if self.batcher is not None:
+            self.batcher.stop()
+        logger.info(f"Retired model {self.version}")
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        loader: Callable[[], ModelHandle | None],
+        on_swap: Callable[[ModelHandle], None] | None = None,
+    ):
+        self._loader = loader
+        self._on_swap = on_swap
+        self._current: ModelHandle | None = None
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._watcher: threading.Thread | None = None
+        self._stop_watching = threading.Event()
+        self.swaps = 0
+        self.last_reload_error: str | None = None
+
+    # ── Access ────────────────────────────────────────────────────────
+    def current(self) -> ModelHandle | None:
+        return self._current
+
+    @contextmanager
+    def use(self) -> Iterator[ModelHandle | None]:
+        """Pin the current model for the duration of one request."""
+        with self._lock:
+            handle = self._current
+            if handle is not None:
+                handle._acquire()
+        try:
+            yield handle
+        finally:
+            if handle is not None:
+                handle._release()
+
+    # ── Swapping ──────────────────────────────────────────────────────
+    def swap(self, handle: ModelHandle):
+        """Atomically make ``handle`` current; the old model drains in the background."""
+        with self._lock:
+            old, self._current = self._current, handle
+            self.swaps += 1
+        if self._on_swap:
+            self._on_swap(handle)
+        logger.info(f"Serving model {handle.version}")
+        if old is not None:
+            threading.Thread(target=old.retire, name="cropguard-retire", daemon=True).start()
+
+    def reload(self) -> bool:
+        """Load, warm and swap in the model currently on disk. Keeps the old one on failure."""
+        with self._reload_lock:
+            try:
+                handle = self._loader()
+                if handle is None:
+                    raise RuntimeError("no loadable model found")
+                handle.start()
+                handle.warm_up()
+            except Exception as e:
+                self.last_reload_error = str(e)
+                logger.error(f"Model reload failed, keeping current model: {e}")
+                return False
+
+            self.last_reload_error = None
+            self.swap(handle)
+            return True
+
+    def close(self):
+        self.stop_watcher()
+        with self._lock:
+            handle, self._current = self._current, None
+        if handle is not None and handle.batcher is not None:
+            handle.batcher.stop()
+
+    # ── Watching MODEL_DIR ────────────────────────────────────────────
+    def start_watcher(
+        self,
+        fingerprint: Callable[[], tuple],
+        interval: float,
+        on_change: Callable[[], bool] | None = None,
+    ):
+        """Poll ``fingerprint`` and call ``on_change`` (default: reload) once files settle."""
+        if interval <= 0 or (self._watcher and self._watcher.is_alive()):
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(fingerprint, interval, on_change or self.reload),
+            name="cropguard-model-watch", daemon=True,
+        )
+        self._watcher.start()
+        logger.info(f"Watching model files every {interval:.0f}s for hot reload")
+
+    def stop_watcher(self):
+        self._stop_watching.set()
+        if self._watcher:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def _watch(self, fingerprint: Callable[[], tuple], interval: float, on_change: Callable[[], bool]):
+        loaded = fingerprint()
+        previous = loaded
+        while not self._stop_watching.wait(interval):
+            try:
+                current = fingerprint()
+            except OSError:
+                continue
+            # Only reload once files have stopped changing (copy finished)
+            if current != loaded and current == previous:
+                logger.info("Model files changed — reloading")
+                on_change()
+                loaded = current
+            previous = current
+
+    def stats(self) -> dict:
+        handle = self._current
+        return {
+            "model_version": handle.version if handle else "demo",
+            "backend": handle.backend.name if handle else None,
+            "loaded_at": handle.loaded_at if handle else None,
+            "optimized": getattr(handle.backend, "optimized", None) if handle else None,
+            "warm": handle.warm if handle else None,
+            "swaps": self.swaps,
+            "last_reload_error": self.last_reload_error,
+        }
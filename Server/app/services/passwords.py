@@ -0,0 +1,196 @@
+"""
+Password Hashing
+-----------------
+Passwords are hashed with a work-factor KDF from hashlib, selected with
+PASSWORD_KDF:
+  - "scrypt" — memory-hard.  Cost is SCRYPT_N / SCRYPT_R / SCRYPT_P.  Default.
+  - "pbkdf2" — PBKDF2-HMAC-SHA256 with PBKDF2_ITERATIONS rounds.
+
+Stored formats (parameters travel with the hash, so cost can be raised later):
+
+    scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>
+    pbkdf2_sha256$<iterations>$<salt b64>$<hash b64>
+    <salt hex>$<sha256 hex>                      legacy, verify only
+
+A correct login against a legacy hash or an outdated cost returns
+needs_rehash=True, and the login route re-hashes the password it just
+verified.  Accounts therefore migrate transparently.  A login for an
+unknown email is checked against dummy_hash(), so it costs the same as a
+wrong password.
+
+Hashing costs tens of milliseconds of CPU, so the async helpers run it on a
+small dedicated thread pool (PASSWORD_HASH_WORKERS).  hashlib releases the
+GIL inside both KDFs.  At most PASSWORD_HASH_QUEUE_LIMIT jobs may be queued
+or running, counted until the job finishes even if its request was
+cancelled.  Beyond that PasswordHasherBusyError is raised, so a login storm
+(or clients that keep disconnecting) cannot queue up unbounded
+memory-hard work.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.config import (
+    PASSWORD_KDF,
+    SCRYPT_N,
+    SCRYPT_R,
+    SCRYPT_P,
+    PBKDF2_ITERATIONS,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_QUEUE_LIMIT,
+)
+
+logger = logging.getLogger("cropguard.passwords")
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+_pool: ThreadPoolExecutor | None = None
+_inflight = 0
+_dummy_hash: str | None = None
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when PASSWORD_HASH_QUEUE_LIMIT hashing jobs are already pending."""
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode().rstrip("=")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # maxmem: OpenSSL's 32 MiB default is too small for n=2**15, r=8
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p, dklen=KEY_BYTES, maxmem=256 * n * r * p + (1 << 20),
+    )
+
+
+def _pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, dklen=KEY_BYTES)
+
+
+# ── Synchronous KDF ───────────────────────────────────────────────────
+def hash_password(password: str) -> str:
+    """Hash ``password`` with the configured KDF and cost."""
+    salt = secrets.token_bytes(SALT_BYTES)
+    if PASSWORD_KDF == "pbkdf2":
+        key = _pbkdf2(password, salt, PBKDF2_ITERATIONS)
+        return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64(salt)}${_b64(key)}"
+    key = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(key)}"
+
+
+def verify_password(plain: str, hashed: str) -> bool:
+    return check_password(plain, hashed)[0]
+
+
+def check_password(plain: str, hashed: str) -> tuple[bool, bool]:
+    """
+    Verify ``plain`` against a stored hash in any supported format.
+    Returns (matches, needs_rehash); needs_rehash is only meaningful on a match.
+    """
+    try:
+        parts = hashed.split("$")
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            key = _scrypt(plain, _unb64(parts[4]), n, r, p)
+            matches = hmac.compare_digest(key, _unb64(parts[5]))
+            outdated = PASSWORD_KDF != "scrypt" or (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+            return matches, outdated
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            iterations = int(parts[1])
+            key = _pbkdf2(plain, _unb64(parts[2]), iterations)
+            matches = hmac.compare_digest(key, _unb64(parts[3]))
+            outdated = PASSWORD_KDF != "pbkdf2" or iterations != PBKDF2_ITERATIONS
+            return matches, outdated
+        if len(parts) == 2:
+            salt, pw_hash = parts
+            legacy = hashlib.sha256(f"{salt}{plain}".encode()).hexdigest()
+            return hmac.compare_digest(legacy, pw_hash), True
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Unreadable password hash: {e}")
+    return False, False
+
+
+def dummy_hash() -> str:
+    """
+    A hash of a random password at the current KDF and cost.  Logins for an
+    unknown email verify against it, so they take as long as a wrong
+    password and response time does not reveal which emails are registered.
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password(secrets.token_urlsafe(16))
+    return _dummy_hash
+
+
+def _check_password_or_dummy(plain: str, hashed: str | None) -> tuple[bool, bool]:
+    if hashed is None:
+        check_password(plain, dummy_hash())
+        return False, False
+    return check_password(plain, hashed)
+
+
+# ── Off-loop execution ────────────────────────────────────────────────
+async def _offload(func: Callable[..., Any], *args) -> Any:
+    global _pool, _inflight
+    if _inflight >= PASSWORD_HASH_QUEUE_LIMIT:
+        raise PasswordHasherBusyError(f"{_inflight} password hashes already pending")
+
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="cropguard-kdf")
+
+    loop = asyncio.get_running_loop()
+    future = _pool.submit(func, *args)
+
+    # Released when the job finishes, not when the awaiting request goes away
+    _inflight += 1
+    future.add_done_callback(lambda _: _release_threadsafe(loop))
+    return await asyncio.wrap_future(future)
+
+
+def _release():
+    global _inflight
+    _inflight -= 1
+
+
+def _release_threadsafe(loop: asyncio.AbstractEventLoop):
+    try:
+        loop.call_soon_threadsafe(_release)
+    except RuntimeError:  # loop already closed at shutdown
+        _release()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _offload(hash_password, password)
+
+
+async def check_password_async(plain: str, hashed: str | None) -> tuple[bool, bool]:
+    """check_password() off the loop; ``hashed=None`` (no such user) runs it against dummy_hash()."""
+    return await _offload(_check_password_or_dummy, plain, hashed)
+
+
+def shutdown_password_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+def get_password_stats() -> dict:
+    return {
+        "kdf": PASSWORD_KDF,
+        "workers": PASSWORD_HASH_WORKERS,
+        "queue_limit": PASSWORD_HASH_QUEUE_LIMIT,
+        "queue_depth": _inflight,
+    }
@@ -0,0 +1,93 @@
+"""
+Pre-serialised Prediction Payloads
+-----------------------------------
+Most of a /api/predict response is static per class: crop, disease,
+description, symptoms, treatments, dosage and prevention — kilobytes of
+text that used to be rebuilt into a dict and JSON-encoded on every request.
+
+Each disease-database class's static fields, and the shared low-confidence
+result, are serialised to JSON once at import.  The route then splices in
+only the per-request values (confidence, class key, model version,
+prediction id, timestamp) and returns the bytes directly.  Generic results
+for classes without disease data embed the confidence in their description,
+so they have no static fragment and are encoded whole.
+
+Uses orjson when installed, otherwise the standard-library encoder.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value)
+except ImportError:  # orjson is optional
+    orjson = None
+
+    def dumps(value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+STATIC_FIELDS = (
+    "crop_name",
+    "disease_name",
+    "severity",
+    "spread_risk",
+    "description",
+    "symptoms",
+    "organic_treatment",
+    "chemical_treatment",
+    "dosage",
+    "prevention",
+    "status",
+)
+
+# class_key → serialised static fields, without the surrounding braces
+_fragments: dict[str, bytes] = {}
+_uncertain_fragment = b""
+
+
+def _fragment(fields: dict) -> bytes:
+    return dumps({name: fields[name] for name in STATIC_FIELDS})[1:-1]
+
+
+def register(class_key: str, fields: dict):
+    """Pre-serialise the static fields of one class's result."""
+    if class_key not in _fragments:
+        _fragments[class_key] = _fragment(fields)
+
+
+def register_uncertain(fields: dict):
+    """Pre-serialise the shared low-confidence result."""
+    global _uncertain_fragment
+    _uncertain_fragment = _fragment(fields)
+
+
+def render_prediction(result: dict, **extra) -> bytes:
+    """
+    JSON body for a prediction result plus ``extra`` fields.  Static fields
+    come from the pre-serialised fragment; anything else is encoded here.
+    Falls back to encoding the whole dict for results with no fragment.
+    """
+    if result.get("status") == "Uncertain":
+        fragment = _uncertain_fragment
+    else:
+        fragment = _fragments.get(result.get("class_key"))
+    if not fragment:
+        return dumps({**result, **extra})
+
+    dynamic = {k: v for k, v in result.items() if k not in STATIC_FIELDS}
+    dynamic.update(extra)
+    if not dynamic:
+        return b"{" + fragment + b"}"
+    return b"{" + fragment + b"," + dumps(dynamic)[1:]
+
+
+class PredictionJSONResponse(Response):
+    """Response whose body was already rendered by render_prediction()."""
+
+    media_type = "application/json"
@@ -0,0 +1,173 @@
+"""
+Perceptual-Hash Near-Duplicate Index
+-------------------------------------
+WhatsApp-forwarded photos reach /api/predict recompressed and resized, so
+the exact content hash in prediction_cache misses them.  Here every image
+gets a difference hash (dHash) computed from the 224×224 RGB bitmap that
+preprocessing already produced, and recent predictions are indexed by that
+hash.  An upload within NEAR_DUP_THRESHOLD bits (Hamming distance) of a
+recently classified image reuses its prediction and skips the forward pass.
+
+dHash only sees grayscale structure.  Two leaves that differ only in
+colour (rust, yellowing) would hash alike, so every key also carries a
+coarse colour signature (per-channel means in COLOUR_BUCKET-wide buckets)
+that must match exactly.  Flat or low-texture images have no structure
+for the hash to capture, and their hashes collapse towards all-zeros.
+image_key() returns None for those, and they are never matched.
+
+Lookup uses multi-index hashing: the hash is split into threshold + 1
+chunks, and by the pigeonhole principle any hash within the threshold
+matches at least one chunk exactly, so only those candidates are compared.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from app.config import NEAR_DUP_THRESHOLD, NEAR_DUP_CACHE_SIZE, NEAR_DUP_TTL
+
+logger = logging.getLogger("cropguard.phash")
+
+HASH_SIZE = 16  # 16×16 gradient bits → 256-bit hash
+HASH_BITS = HASH_SIZE * HASH_SIZE
+COLOUR_BUCKET = 16  # per-channel mean quantisation (gray levels per bucket)
+MIN_TEXTURE = 2.0  # mean |horizontal gradient| on the thumbnail, in gray levels
+MIN_SET_BITS = HASH_BITS // 8  # fewer set (or unset) bits than this → degenerate hash
+
+
+def _gray_thumbnail(rgb: np.ndarray) -> np.ndarray:
+    gray = Image.fromarray(rgb).convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BOX)
+    return np.asarray(gray, dtype=np.int16)
+
+
+def colour_signature(rgb: np.ndarray) -> int:
+    """Per-channel mean of a uint8 HWC RGB image, bucketed and packed into one int."""
+    means = rgb.reshape(-1, 3).mean(axis=0) // COLOUR_BUCKET
+    r, g, b = (int(m) for m in means)
+    return (r << 16) | (g << 8) | b
+
+
+def image_key(rgb: np.ndarray) -> tuple[int, int] | None:
+    """
+    (colour signature, dHash) of an image for near-duplicate matching, or
+    None when it has too little texture for its hash to mean anything.
+    The dHash is the sign of the horizontal gradients on a 17×16 thumbnail.
+    """
+    pixels = _gray_thumbnail(rgb)
+    gradients = pixels[:, 1:] - pixels[:, :-1]
+    if float(np.abs(gradients).mean()) < MIN_TEXTURE:
+        return None
+    bits = (gradients > 0).ravel()
+    set_bits = int(bits.sum())
+    if min(set_bits, HASH_BITS - set_bits) < MIN_SET_BITS:
+        return None
+    return colour_signature(rgb), int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+class NearDuplicateIndex:
+    """
+    Bounded, TTL'd map from image_key() → prediction.  A lookup matches a
+    stored key with the same colour signature whose hash is within the
+    Hamming threshold.
+    """
+
+    def __init__(self, threshold: int, max_entries: int, ttl: float):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        n_chunks = min(threshold + 1, HASH_BITS)
+        self._chunk_bits = HASH_BITS // n_chunks
+        self._n_chunks = n_chunks
+        self._chunk_mask = (1 << self._chunk_bits) - 1
+
+        self._entries: OrderedDict[tuple[int, int], tuple[float, object]] = OrderedDict()
+        self._tables: list[dict[tuple[int, int], set[tuple[int, int]]]] = [{} for _ in range(n_chunks)]
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        self.hits = 0
+
+    def _chunks(self, key: tuple[int, int]):
+        # Chunks are bucketed per colour signature, so other colours are never candidates
+        colour, h = key
+        for i in range(self._n_chunks):
+            yield i, (colour, (h >> (i * self._chunk_bits)) & self._chunk_mask)
+
+    def _remove(self, key: tuple[int, int]):
+        del self._entries[key]
+        for i, chunk in self._chunks(key):
+            bucket = self._tables[i].get(chunk)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._tables[i][chunk]
+
+    def lookup(self, key: tuple[int, int]):
+        """Return the value stored for the nearest key within the threshold, or None."""
+        now = time.time()
+        h = key[1]
+        with self._lock:
+            self.lookups += 1
+            candidates = set()
+            for i, chunk in self._chunks(key):
+                candidates.update(self._tables[i].get(chunk, ()))
+
+            # Expired candidates are dropped and the scan moves on to the rest
+            best, best_dist, expired = None, self.threshold + 1, []
+            for candidate in candidates:
+                if now - self._entries[candidate][0] > self.ttl:
+                    expired.append(candidate)
+                    continue
+                dist = (candidate[1] ^ h).bit_count()
+                if dist < best_dist:
+                    best, best_dist = candidate, dist
+            for candidate in expired:
+                self._remove(candidate)
+
+            if best is None:
+                return None
+
+            value = self._entries[best][1]
+            self._entries.move_to_end(best)
+            self.hits += 1
+            return value
+
+    def add(self, key: tuple[int, int], value):
+        now = time.time()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (now, value)
+            for i, chunk in self._chunks(key):
+                self._tables[i].setdefault(chunk, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for table in self._tables:
+                table.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "threshold_bits": self.threshold,
+            "hash_bits": HASH_BITS,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+        }
+
+
+# ── Module-level index ────────────────────────────────────────────────
+near_duplicate_index = (
+    NearDuplicateIndex(NEAR_DUP_THRESHOLD, NEAR_DUP_CACHE_SIZE, NEAR_DUP_TTL)
+    if NEAR_DUP_CACHE_SIZE > 0 and NEAR_DUP_THRESHOLD >= 0
+    else None
+)
@@ -0,0 +1,160 @@
+"""
+Prediction Cache
+-----------------
+Farmers often re-upload the exact same photo (retries on flaky networks,
+one image shared across family accounts).  Results are cached by a fast
+content hash of the uploaded bytes, salted with everything else that
+shapes the result: the model version, a digest of its resolved class map,
+RESIZE_MODE and CONFIDENCE_THRESHOLD.  A repeat upload skips decode and
+inference, and the disk tier never serves results from another setup.
+
+Tiers:
+  - memory — bounded LRU with TTL (PREDICTION_CACHE_SIZE / PREDICTION_CACHE_TTL)
+  - disk   — optional SQLite file (PREDICTION_CACHE_DB) that survives restarts
+             and is shared by process-pool workers
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import (
+    CONFIDENCE_THRESHOLD,
+    PREDICTION_CACHE_SIZE,
+    PREDICTION_CACHE_TTL,
+    PREDICTION_CACHE_DB,
+)
+from app.services.preprocess import DEFAULT_RESIZE_MODE
+
+logger = logging.getLogger("cropguard.cache")
+
+
+class PredictionCache:
+    def __init__(self, max_entries: int, ttl: float, db_path: str = ""):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_path = db_path
+        self._db: sqlite3.Connection | None = None
+        self._db_pid = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ── Keys ──────────────────────────────────────────────────────────
+    @staticmethod
+    def make_key(image_bytes: bytes, model_version: str, classes_digest: str) -> str:
+        digest = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+        return f"{model_version}:{classes_digest}:{DEFAULT_RESIZE_MODE}:{CONFIDENCE_THRESHOLD}:{digest}"
+
+    # ── Disk tier ─────────────────────────────────────────────────────
+    def _conn(self) -> sqlite3.Connection | None:
+        """Lazily (re)open the SQLite tier — connections must not cross a fork."""
+        if not self._db_path:
+            return None
+        if self._db is not None and self._db_pid == os.getpid():
+            return self._db
+
+        try:
+            db = sqlite3.connect(self._db_path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions "
+                "(key TEXT PRIMARY KEY, result TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            db.execute("DELETE FROM predictions WHERE created < ?", (time.time() - self.ttl,))
+        except sqlite3.Error as e:
+            logger.error(f"Could not open prediction cache DB {self._db_path}: {e}")
+            self._db_path = ""
+            return None
+
+        self._db, self._db_pid = db, os.getpid()
+        logger.info(f"Prediction cache disk tier at {self._db_path}")
+        return db
+
+    def _disk_get(self, db: sqlite3.Connection, key: str, now: float) -> dict | None:
+        try:
+            row = db.execute(
+                "SELECT result, created FROM predictions WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Prediction cache read failed: {e}")
+            return None
+        if row is None or now - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def _disk_put(self, db: sqlite3.Connection, key: str, result: dict, now: float):
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO predictions (key, result, created) VALUES (?, ?, ?)",
+                (key, json.dumps(result), now),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Prediction cache write failed: {e}")
+
+    # ── Lookup / store ────────────────────────────────────────────────
+    def get(self, key: str) -> dict | None:
+        """Return a copy of the cached result, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(entry[1])
+                del self._entries[key]
+
+            db = self._conn()
+            if db is not None:
+                result = self._disk_get(db, key, now)
+                if result is not None:
+                    self._store_memory(key, result, now)
+                    self.disk_hits += 1
+                    return dict(result)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: dict):
+        now = time.time()
+        result = dict(result)
+        with self._lock:
+            self._store_memory(key, result, now)
+            db = self._conn()
+            if db is not None:
+                self._disk_put(db, key, result, now)
+
+    def _store_memory(self, key: str, result: dict, now: float):
+        self._entries[key] = (now, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "disk_tier": bool(self._db_path),
+        }
+
+
+# ── Module-level cache ────────────────────────────────────────────────
+prediction_cache = (
+    PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL, PREDICTION_CACHE_DB)
+    if PREDICTION_CACHE_SIZE > 0
+    else None
+)
@@ -0,0 +1,122 @@
+"""
+Image Preprocessing
+--------------------
+Turns a decoded PIL image into the normalised CHW float32 tensor expected
+by MobileNetV2, without the chain of full-size temporaries the naive
+``(arr / 255 - mean) / std`` → transpose → expand_dims version creates.
+
+Scaling and ImageNet normalisation are fused into one per-channel affine
+
+    out[c] = pixel[c] * SCALE[c] + OFFSET[c]
+    SCALE  = 1 / (255 · std),  OFFSET = -mean / std
+
+which is evaluated straight from the uint8 RGB pixels into a preallocated,
+contiguous (N, 3, H, W) batch buffer, so ``torch.from_numpy`` can wrap the
+result with no further copy.
+
+The resize filter is selected with RESIZE_MODE (see RESIZE_MODES below);
+benchmarks/eval_resize.py measures each mode's latency and top-1 agreement
+with the LANCZOS baseline.
+"""
+
+import logging
+
+import numpy as np
+from PIL import Image
+
+from app.config import RESIZE_MODE
+
+logger = logging.getLogger("cropguard.preprocess")
+
+IMG_SIZE = (224, 224)
+
+# ImageNet normalisation (must match training transforms)
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+SCALE = (1.0 / (255.0 * IMAGENET_STD)).astype(np.float32)
+OFFSET = (-IMAGENET_MEAN / IMAGENET_STD).astype(np.float32)
+
+
+class BatchBuffer:
+    """Reusable contiguous (capacity, 3, H, W) float32 input buffer — one slot per batch element."""
+
+    def __init__(self, capacity: int, size: tuple[int, int] = IMG_SIZE):
+        self.capacity = capacity
+        self.array = np.empty((capacity, 3, size[1], size[0]), dtype=np.float32)
+
+    def slot(self, index: int) -> np.ndarray:
+        return self.array[index]
+
+    def view(self, count: int) -> np.ndarray:
+        """First ``count`` slots — still C-contiguous, safe for torch.from_numpy."""
+        return self.array[:count]
+
+
+# ── Resize backends ───────────────────────────────────────────────────
+def _resize_lanczos(image: Image.Image, size: tuple[int, int]) -> np.ndarray:
+    return np.asarray(image.resize(size, Image.Resampling.LANCZOS))
+
+
+def _resize_bilinear(image: Image.Image, size: tuple[int, int]) -> np.ndarray:
+    return np.asarray(image.resize(size, Image.Resampling.BILINEAR))
+
+
+def _resize_reduce_bilinear(image: Image.Image, size: tuple[int, int]) -> np.ndarray:
+    """Integer box ``reduce`` down to ~2× the target, then a short BILINEAR pass."""
+    factor = min(image.width // (size[0] * 2), image.height // (size[1] * 2))
+    if factor >= 2:
+        image = image.reduce(factor)
+    return np.asarray(image.resize(size, Image.Resampling.BILINEAR))
+
+
+def _resize_torch(image: Image.Image, size: tuple[int, int]) -> np.ndarray:
+    """Antialiased bilinear ``torch.nn.functional.interpolate`` on the uint8 pixels."""
+    import torch
+
+    tensor = torch.from_numpy(np.array(image)).permute(2, 0, 1).unsqueeze(0).float()
+    resized = torch.nn.functional.interpolate(
+        tensor, size=(size[1], size[0]), mode="bilinear", antialias=True, align_corners=False
+    )
+    return resized[0].round_().clamp_(0, 255).to(torch.uint8).permute(1, 2, 0).contiguous().numpy()
+
+
+RESIZE_MODES = {
+    "lanczos": _resize_lanczos,
+    "bilinear": _resize_bilinear,
+    "reduce_bilinear": _resize_reduce_bilinear,
+    "torch": _resize_torch,
+}
+
+
+if RESIZE_MODE in RESIZE_MODES:
+    DEFAULT_RESIZE_MODE = RESIZE_MODE
+else:
+    logger.warning(f"Unknown RESIZE_MODE '{RESIZE_MODE}', using 'lanczos'. Options: {sorted(RESIZE_MODES)}")
+    DEFAULT_RESIZE_MODE = "lanczos"
+
+
+def resize_rgb(
+    image: Image.Image,
+    size: tuple[int, int] = IMG_SIZE,
+    mode: str = DEFAULT_RESIZE_MODE,
+) -> np.ndarray:
+    """Resize to the model input size with the given backend and return uint8 HWC RGB pixels."""
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return RESIZE_MODES[mode](image, size)
+
+
+def normalize_into(rgb: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Write the normalised CHW tensor for uint8 HWC ``rgb`` into ``out`` (3, H, W)."""
+    for c in range(3):
+        np.multiply(rgb[:, :, c], SCALE[c], out=out[c])
+        out[c] += OFFSET[c]
+    return out
+
+
+def to_tensor(rgb: np.ndarray) -> np.ndarray:
+    """Normalised (1, 3, H, W) tensor for a single uint8 HWC image."""
+    out = np.empty((1, 3, rgb.shape[0], rgb.shape[1]), dtype=np.float32)
+    normalize_into(rgb, out[0])
+    return out
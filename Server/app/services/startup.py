@@ -0,0 +1,59 @@
+"""
+Startup Tracking
+-----------------
+Times each phase of application start-up (MongoDB connect, model load,
+warm-up, worker pool) and holds the readiness flag.  The app only reports
+ready once the model has been warmed, so the first real /api/predict no
+longer pays for lazy framework imports, TorchScript profiling passes and
+allocator growth.
+
+The breakdown is logged once start-up completes and served at
+GET /api/status/startup.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("cropguard.startup")
+
+_started_at = time.perf_counter()
+_phases: dict[str, float] = {}
+_ready = False
+_ready_after: float | None = None
+
+
+@contextmanager
+def phase(name: str):
+    """Time one start-up phase."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[name] = time.perf_counter() - start
+
+
+def mark_ready():
+    global _ready, _ready_after
+    _ready = True
+    _ready_after = time.perf_counter() - _started_at
+
+    breakdown = ", ".join(f"{name}={seconds * 1000:.0f} ms" for name, seconds in _phases.items())
+    logger.info(f"Ready after {_ready_after:.2f}s ({breakdown})")
+
+
+def mark_not_ready():
+    global _ready
+    _ready = False
+
+
+def is_ready() -> bool:
+    return _ready
+
+
+def get_startup_report() -> dict:
+    return {
+        "ready": _ready,
+        "ready_after_ms": round(_ready_after * 1000, 1) if _ready_after is not None else None,
+        "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in _phases.items()},
+    }
@@ -0,0 +1,84 @@
+"""
+Verified-Token Cache
+---------------------
+Mobile clients reuse one 24-hour token for thousands of requests, and each
+request used to pay for a full jose.jwt.decode: HMAC check, JSON parsing
+and claim validation.  Decoded claims are cached here by a BLAKE2b digest
+of the token in a bounded LRU (TOKEN_CACHE_SIZE).
+
+Only tokens that verified successfully and carry an ``exp`` claim are
+stored, and every hit re-checks ``exp``.  An expired entry is evicted and
+the caller falls back to the full decode, which rejects it as before.  The
+cache only skips signature verification; revocation is decided by the
+principal lookup after it.  With the user cache enabled a deleted or
+changed user is noticed within USER_CACHE_TTL.  With AUTH_TRUST_JWT_CLAIMS
+there is no lookup, and a token stays valid until its ``exp``.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import TOKEN_CACHE_SIZE
+from app.services import metrics
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class TokenCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> dict | None:
+        """Return a copy of the token's verified claims, or None."""
+        key = _digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                metrics.TOKEN_CACHE_MISS.inc()
+                return None
+            if time.time() >= entry[0]:
+                del self._entries[key]
+                metrics.TOKEN_CACHE_EXPIRED.inc()
+                return None
+            self._entries.move_to_end(key)
+        metrics.TOKEN_CACHE_HIT.inc()
+        return dict(entry[1])
+
+    def put(self, token: str, claims: dict):
+        expires = claims.get("exp")
+        if not isinstance(expires, (int, float)):
+            return  # never cache a token that cannot expire
+        key = _digest(token)
+        with self._lock:
+            self._entries[key] = (float(expires), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        hits = metrics.TOKEN_CACHE_HIT.value()
+        lookups = hits + metrics.TOKEN_CACHE_MISS.value() + metrics.TOKEN_CACHE_EXPIRED.value()
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": int(hits),
+            "misses": int(lookups - hits),
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# ── Module-level cache ────────────────────────────────────────────────
+token_cache = TokenCache(TOKEN_CACHE_SIZE) if TOKEN_CACHE_SIZE > 0 else None
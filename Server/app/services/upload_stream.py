@@ -0,0 +1,147 @@
+"""
+Streaming Multipart Uploads
+----------------------------
+Parses a multipart/form-data request body incrementally and yields each
+file part as soon as its last byte arrives, so a batch of dozens of images
+is never held in memory (or spooled to disk) all at once.  Only the part
+currently being received is buffered, capped at MAX_FILE_SIZE.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator
+
+from fastapi import HTTPException, Request, status
+
+from app.config import ALLOWED_EXTENSIONS, MAX_FILE_SIZE
+
+try:
+    from python_multipart import MultipartParser
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import MultipartParser, parse_options_header
+
+
+def image_type_error(filename: str | None, content_type: str | None) -> str | None:
+    """
+    Why an upload is not an accepted image, or None.  The one rule every
+    prediction endpoint applies: an image/* content type, and an allowed
+    extension when the filename has one.
+    """
+    if not (content_type or "").startswith("image/"):
+        return "File must be an image (JPEG, PNG, or WEBP)"
+    ext = Path(filename or "").suffix.lower()
+    if ext and ext not in ALLOWED_EXTENSIONS:
+        return f"Unsupported file type '{ext}'. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
+    return None
+
+
+@dataclass
+class UploadedImage:
+    filename: str
+    data: bytes | None
+    error: str | None = None
+
+
+class _PartCollector:
+    """python-multipart callbacks that turn parts into UploadedImage records."""
+
+    def __init__(self):
+        self.completed: list[UploadedImage] = []
+        self._header_name = b""
+        self._header_value = b""
+        self._reset_part()
+
+    def _reset_part(self):
+        self._disposition = b""
+        self._content_type = ""
+        self._buffer = bytearray()
+        self._too_large = False
+
+    # ── Callbacks ─────────────────────────────────────────────────────
+    def on_part_begin(self):
+        self._reset_part()
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        name = self._header_name.lower()
+        if name == b"content-disposition":
+            self._disposition = self._header_value
+        elif name == b"content-type":
+            self._content_type = self._header_value.decode("latin-1").strip()
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if self._too_large:
+            return
+        if len(self._buffer) + (end - start) > MAX_FILE_SIZE:
+            self._too_large = True
+            self._buffer = bytearray()
+            return
+        self._buffer += data[start:end]
+
+    def on_part_end(self):
+        _, options = parse_options_header(self._disposition)
+        if b"filename" not in options:
+            return  # plain form field — ignored
+        filename = options[b"filename"].decode("utf-8", "replace")
+        self.completed.append(self._validate(filename))
+        self._reset_part()
+
+    # ── Validation ────────────────────────────────────────────────────
+    def _validate(self, filename: str) -> UploadedImage:
+        error = image_type_error(filename, self._content_type)
+        if error:
+            return UploadedImage(filename, None, error)
+        if self._too_large:
+            return UploadedImage(filename, None, "File too large")
+        if not self._buffer:
+            return UploadedImage(filename, None, "Uploaded file is empty")
+        return UploadedImage(filename, bytes(self._buffer))
+
+
+async def iter_uploaded_images(request: Request) -> AsyncIterator[UploadedImage]:
+    """Yield each file part of a multipart request as soon as it has been received."""
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a multipart/form-data upload",
+        )
+
+    collector = _PartCollector()
+    parser = MultipartParser(
+        boundary,
+        {
+            "on_part_begin": collector.on_part_begin,
+            "on_part_data": collector.on_part_data,
+            "on_part_end": collector.on_part_end,
+            "on_header_field": collector.on_header_field,
+            "on_header_value": collector.on_header_value,
+            "on_header_end": collector.on_header_end,
+        },
+    )
+
+    async for chunk in request.stream():
+        try:
+            parser.write(chunk)
+        except MultipartParseError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Malformed multipart upload",
+            )
+        while collector.completed:
+            yield collector.completed.pop(0)
+
+    parser.finalize()
+    while collector.completed:
+        yield collector.completed.pop(0)
@@ -0,0 +1,74 @@
+"""
+User Principal Cache
+---------------------
+Every authenticated request used to re-read the user document from
+MongoDB after decoding the JWT.  Principals (the user document minus the
+password hash) are cached here by user id in a bounded LRU with a short
+TTL (USER_CACHE_SIZE / USER_CACHE_TTL), so repeat requests skip that round
+trip.  No route changes a user document after registration except the
+login rehash, which only touches the password hash and so never affects a
+cached principal, so there is no invalidation hook: the TTL is the only
+bound.  Edits made directly in MongoDB (e.g. promoting a user to admin,
+deleting an account) take effect within USER_CACHE_TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import AUTH_TRUST_JWT_CLAIMS, USER_CACHE_SIZE, USER_CACHE_TTL
+from app.services.token_cache import token_cache
+
+
+class UserCache:
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> dict | None:
+        """Return a copy of the cached principal, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                if now - entry[0] <= self.ttl:
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return dict(entry[1])
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, user_id: str, principal: dict):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic(), dict(principal))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# ── Module-level cache ────────────────────────────────────────────────
+user_cache = UserCache(USER_CACHE_SIZE, USER_CACHE_TTL) if USER_CACHE_SIZE > 0 else None
+
+
+def get_auth_stats() -> dict:
+    return {
+        "trust_jwt_claims": AUTH_TRUST_JWT_CLAIMS,
+        "user_cache": user_cache.stats() if user_cache is not None else None,
+        "token_cache": token_cache.stats() if token_cache is not None else None,
+    }
@@ -0,0 +1,139 @@
+"""
+Benchmark: /api/predict end to end
+-----------------------------------
+Drives the real FastAPI app in-process through httpx's ASGI transport, so
+the numbers include multipart parsing, upload validation, the inference
+executor, response serialisation and (for authenticated requests) the
+user lookup plus history insert.  MongoDB is replaced with mongomock-motor,
+so no database server is needed and Mongo time stays near zero.
+
+    pip install mongomock-motor
+
+Run from Server/:
+
+    python -m benchmarks.bench_api [--iterations 50] [--concurrency 1 8] [--output api.json]
+
+As in bench_inference, prediction caches are off unless configured.
+Uploads larger than MAX_FILE_SIZE (e.g. a 12 MP PNG) are skipped.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Measure the pipeline, not cache hits (export the variables to override)
+os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+os.environ.setdefault("NEAR_DUP_CACHE_SIZE", "0")
+
+import httpx  # noqa: E402
+
+from benchmarks.harness import FORMATS, SIZES, format_result, image_cases, summarize, write_report  # noqa: E402
+from app import database  # noqa: E402
+from app.auth import create_access_token, hash_password  # noqa: E402
+from app.config import DATABASE_NAME, MAX_FILE_SIZE  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import ml_service  # noqa: E402
+from app.services.executor import shutdown_executor, start_executor  # noqa: E402
+
+try:
+    from mongomock_motor import AsyncMongoMockClient
+except ImportError:
+    AsyncMongoMockClient = None
+
+
+async def _create_user() -> str:
+    result = await database.db.users.insert_one({
+        "name": "Bench Farmer",
+        "email": "bench@cropguard.test",
+        "password_hash": hash_password("bench-password"),
+        "role": "farmer",
+        "created_at": datetime.now(timezone.utc),
+    })
+    return create_access_token(str(result.inserted_id), "bench@cropguard.test", "Bench Farmer")
+
+
+async def _measure_route(
+    client: httpx.AsyncClient, params: dict, data: bytes, fmt: str,
+    headers: dict, iterations: int, concurrency: int,
+) -> dict:
+    async def one() -> float:
+        start = time.perf_counter()
+        response = await client.post(
+            "/api/predict", files={"file": (f"leaf.{fmt.lower()}", data, f"image/{fmt.lower()}")}, headers=headers,
+        )
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    for _ in range(3):
+        await one()  # warm-up
+
+    latencies: list[float] = []
+
+    async def worker(n: int):
+        for _ in range(n):
+            latencies.append(await one())
+
+    per_worker = max(iterations // concurrency, 1)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+    result = summarize("route:/api/predict", params, latencies, time.perf_counter() - start)
+    print(format_result(result), flush=True)
+    return result
+
+
+async def run(iterations: int, sizes: list[str], formats: list[str], concurrency: list[int]) -> list[dict]:
+    token = await _create_user()
+    results = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for params, data in image_cases(sizes, formats):
+            if len(data) > MAX_FILE_SIZE:
+                print(f"skipping {params}: larger than MAX_FILE_SIZE")
+                continue
+            for auth in (False, True):
+                headers = {"Authorization": f"Bearer {token}"} if auth else {}
+                for clients in concurrency:
+                    case = {**params, "auth": auth, "concurrency": clients}
+                    results.append(await _measure_route(client, case, data, params["format"], headers, iterations, clients))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark POST /api/predict through the ASGI app")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8])
+    parser.add_argument("--output", type=Path, help="Write results as JSON (see benchmarks/compare.py)")
+    args = parser.parse_args()
+
+    if AsyncMongoMockClient is None:
+        raise SystemExit("mongomock-motor is required: pip install mongomock-motor")
+
+    logging.getLogger("cropguard").setLevel(logging.ERROR)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    # Stand-in for the lifespan: mock MongoDB, real model + executor
+    database.client = AsyncMongoMockClient()
+    database.db = database.client[DATABASE_NAME]
+    ml_service.load_model()
+    ml_service.warm_up_model()
+    start_executor()
+    model_version = ml_service.registry.stats()["model_version"]
+    print(f"Model: {model_version}\n")
+
+    try:
+        results = asyncio.run(run(args.iterations, args.sizes, args.formats, args.concurrency))
+    finally:
+        shutdown_executor()
+        ml_service.shutdown()
+    write_report(args.output, results, {"suite": "api", "model_version": model_version})
+
+
+if __name__ == "__main__":
+    main()
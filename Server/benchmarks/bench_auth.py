@@ -0,0 +1,108 @@
+"""
+Benchmark: per-request authentication cost
+--------------------------------------------
+Times what an authenticated request spends before the route runs, with the
+auth caches off ("before") and on ("after"):
+
+  - decode_token     JWT → claims (full jose decode vs verified-token cache)
+  - load_principal   token → user dict, including the users lookup against
+                     an in-memory MongoDB (mongomock-motor)
+
+The same token is reused for every call, as the mobile clients do.  Before
+timing it checks that cached tokens still expire: a token whose ``exp``
+has passed must be rejected even though it is in the cache.
+
+Run from Server/:
+
+    python -m benchmarks.bench_auth [--iterations 5000] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from fastapi import HTTPException
+from jose import jwt
+from mongomock_motor import AsyncMongoMockClient
+
+from benchmarks.harness import measure, write_report
+from app import auth, database
+from app.config import JWT_ALGORITHM, JWT_SECRET, TOKEN_CACHE_SIZE, USER_CACHE_SIZE, USER_CACHE_TTL
+from app.services.token_cache import TokenCache
+from app.services.user_cache import UserCache
+
+
+def _check_expiry():
+    """A cached token must stop verifying once its exp claim passes."""
+    cache = TokenCache(8)
+    token = jwt.encode({"sub": "x", "exp": int(time.time()) + 1}, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    saved, auth.token_cache = auth.token_cache, cache
+    try:
+        auth.decode_token(token)
+        assert cache.get(token) is not None, "token was not cached"
+        time.sleep(2.1)  # jose compares whole seconds
+        try:
+            auth.decode_token(token)
+        except HTTPException as exc:
+            assert exc.status_code == 401
+        else:
+            raise AssertionError("expired token was accepted from the cache")
+    finally:
+        auth.token_cache = saved
+    print("Expired cached tokens are rejected: ok\n")
+
+
+def run(iterations: int) -> list[dict]:
+    loop = asyncio.new_event_loop()
+    database.client = AsyncMongoMockClient()
+    database.db = database.client["cropguard_bench"]
+    user_id = str(loop.run_until_complete(database.db.users.insert_one({
+        "name": "Bench User",
+        "email": "bench@example.com",
+        "password_hash": auth.hash_password("bench-password"),
+        "role": "farmer",
+    })).inserted_id)
+    token = auth.create_access_token(user_id, "bench@example.com", "Bench User")
+
+    configs = {
+        "before": (None, None),
+        "after": (
+            TokenCache(TOKEN_CACHE_SIZE or 10000),
+            UserCache(USER_CACHE_SIZE or 10000, USER_CACHE_TTL),
+        ),
+    }
+    results = []
+    try:
+        for label, (token_cache, user_cache) in configs.items():
+            auth.token_cache, auth.user_cache = token_cache, user_cache
+            results.append(measure("decode_token", {"caches": label}, lambda: auth.decode_token(token), iterations))
+            results.append(measure(
+                "load_principal", {"caches": label},
+                lambda: loop.run_until_complete(auth._load_principal(token)), iterations,
+            ))
+    finally:
+        loop.close()
+
+    before, after = results[1]["p50_ms"], results[3]["p50_ms"]
+    print(f"\nload_principal p50: {before * 1000:.1f} µs → {after * 1000:.1f} µs ({before / after:.1f}× faster)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-request authentication cost")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--output", type=Path, help="Write results as JSON (see benchmarks/compare.py)")
+    args = parser.parse_args()
+
+    saved = auth.token_cache, auth.user_cache
+    try:
+        _check_expiry()
+        results = run(args.iterations)
+    finally:
+        auth.token_cache, auth.user_cache = saved
+    write_report(args.output, results, {"suite": "auth"})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: TorchScript vs. ONNX Runtime on CPU
+-----------------------------------------------
+Each backend is measured in a fresh interpreter so import cost and
+resident memory are not shared between them.  Reports load time (including
+the framework import), peak RSS, single-image latency and batched
+throughput.
+
+Run from Server/ after scripts/export_onnx.py:
+
+    python -m benchmarks.bench_backends [--iterations 50] [--batch-size 8]
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import statistics
+import time
+
+import numpy as np
+
+from app.config import MODEL_PATH, ONNX_MODEL_PATH
+
+
+def _measure(backend_name: str, path: str, iterations: int, batch_size: int, out):
+    start = time.perf_counter()
+    if backend_name == "onnx":
+        from app.services.backends import OnnxBackend as Backend
+    else:
+        from app.services.backends import TorchScriptBackend as Backend
+    backend = Backend(path)
+    load_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    single = rng.standard_normal((1, 3, 224, 224), dtype=np.float32)
+    batch = rng.standard_normal((batch_size, 3, 224, 224), dtype=np.float32)
+    backend.run(single)
+    backend.run(batch)  # warm-up
+
+    latencies = []
+    for _ in range(iterations):
+        t = time.perf_counter()
+        backend.run(single)
+        latencies.append(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    for _ in range(iterations):
+        backend.run(batch)
+    throughput = iterations * batch_size / (time.perf_counter() - t)
+
+    latencies.sort()
+    out.put({
+        "backend": backend_name,
+        "load_s": load_s,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "throughput_ips": throughput,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare inference backends on CPU")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--onnx-model", default=ONNX_MODEL_PATH)
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    print(f"{'backend':<13}{'load s':>8}{'p50 ms':>9}{'p95 ms':>9}{'img/s @' + str(args.batch_size):>12}{'RSS MB':>9}")
+    for name, path in (("torchscript", args.model), ("onnx", args.onnx_model)):
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_measure, args=(name, path, args.iterations, args.batch_size, queue))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            print(f"{name:<13}failed (exit code {proc.exitcode})")
+            continue
+        r = queue.get()
+        print(
+            f"{r['backend']:<13}{r['load_s']:>8.2f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+            f"{r['throughput_ips']:>12.1f}{r['peak_rss_mb']:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
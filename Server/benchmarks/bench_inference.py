@@ -0,0 +1,101 @@
+"""
+Benchmark: inference path
+--------------------------
+Times the building blocks of a prediction in-process:
+
+  - preprocess_image         decoded PIL image → (1, 3, 224, 224) tensor
+  - predict                  raw upload bytes → result dict (decode … result)
+  - _match_class_to_disease  class-map name → DISEASE_DATABASE key
+  - render_prediction        model output → response JSON body
+                             (_map_prediction + payloads.render_prediction)
+
+Image-dependent cases run for every size × format in benchmarks/harness.py.
+Prediction caches are disabled unless PREDICTION_CACHE_SIZE /
+NEAR_DUP_CACHE_SIZE are set explicitly, so repeated inputs measure the full
+pipeline.  Without a model file predict() is measured in demo mode (the
+report's meta.model_version says which).
+
+Run from Server/:
+
+    python -m benchmarks.bench_inference [--iterations 50] [--output results.json]
+"""
+
+import argparse
+import logging
+import os
+from pathlib import Path
+
+# Measure the pipeline, not cache hits (export the variables to override)
+os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+os.environ.setdefault("NEAR_DUP_CACHE_SIZE", "0")
+
+from benchmarks.harness import FORMATS, SIZES, image_cases, measure, write_report  # noqa: E402
+from app.services import ml_service  # noqa: E402
+from app.services.disease_data import DISEASE_DATABASE  # noqa: E402
+from app.services.image_decode import decode_image  # noqa: E402
+from app.services.payloads import render_prediction  # noqa: E402
+from app.services.preprocess import IMG_SIZE  # noqa: E402
+
+# Class-map names covering each branch of _match_class_to_disease
+MATCH_NAMES = {
+    "explicit": "Brownspot",
+    "direct": next(iter(DISEASE_DATABASE)),
+    "lowercase": "rice___brown_spot",
+    "fuzzy": "Rice___BrownSpot",
+    "unmatched": "Completely Unknown Class",
+}
+
+
+def run(iterations: int, sizes: list[str], formats: list[str]) -> list[dict]:
+    results = []
+
+    for params, data in image_cases(sizes, formats):
+        image = decode_image(data, IMG_SIZE)
+        results.append(measure("preprocess_image", params, lambda: ml_service.preprocess_image(image), iterations))
+        results.append(measure("predict", params, lambda: ml_service.predict(data), iterations))
+
+    for branch, name in MATCH_NAMES.items():
+        results.append(measure(
+            "_match_class_to_disease", {"branch": branch},
+            lambda: ml_service._match_class_to_disease(name), iterations * 100,
+        ))
+
+    # Same path as /api/predict: map the model output, then splice the fragment
+    classes = [ml_service._resolve_class(next(iter(DISEASE_DATABASE)))]
+    results.append(measure(
+        "render_prediction", {},
+        lambda: render_prediction(
+            ml_service._map_prediction(classes, 0, 0.9),
+            model_version="bench", prediction_id="bench", created_at="2026-01-01T00:00:00+00:00",
+        ),
+        iterations * 100,
+    ))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the inference building blocks")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--output", type=Path, help="Write results as JSON (see benchmarks/compare.py)")
+    args = parser.parse_args()
+
+    # Per-prediction log lines would swamp the output and the timings
+    logging.getLogger("cropguard").setLevel(logging.ERROR)
+
+    # Unbatched: sequential calls would only wait out the batching window
+    ml_service.load_model(batching=False)
+    ml_service.warm_up_model()
+    model_version = ml_service.registry.stats()["model_version"]
+    print(f"Model: {model_version}\n")
+
+    try:
+        results = run(args.iterations, args.sizes, args.formats)
+    finally:
+        ml_service.shutdown()
+    write_report(args.output, results, {"suite": "inference", "model_version": model_version})
+
+
+if __name__ == "__main__":
+    main()
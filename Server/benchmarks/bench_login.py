@@ -0,0 +1,133 @@
+"""
+Benchmark: login storm
+-----------------------
+Fires --concurrency simultaneous /api/login loops at the in-process app
+(httpx ASGI transport, mongomock-motor) for --duration seconds.  Meanwhile
+a probe requests GET /api/crops every 10 ms and a ticker measures event-loop
+lag.  Two modes:
+
+  - inline    — the KDF runs directly on the event loop (the old behaviour)
+  - executor  — the KDF runs on the bounded password pool (current)
+
+With inline hashing every login stalls the loop for the full KDF cost, and
+the probe's latency climbs with it.  On the pool the probe should stay near
+its idle latency.  KDF and cost come from the usual PASSWORD_* settings.
+
+Run from Server/:
+
+    python -m benchmarks.bench_login [--concurrency 32] [--duration 5] [--output login.json]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+from mongomock_motor import AsyncMongoMockClient
+
+from benchmarks.harness import format_result, summarize, write_report
+from app import database
+from app.config import DATABASE_NAME, PASSWORD_KDF
+from app.main import app
+from app.services import passwords
+
+EMAIL = "storm@example.com"
+PASSWORD = "storm-password"
+
+
+async def _inline(func, *args):
+    return func(*args)
+
+
+async def _storm(client: httpx.AsyncClient, mode: str, concurrency: int, duration: float) -> list[dict]:
+    logins: list[float] = []
+    probes: list[float] = []
+    lags: list[float] = []
+    statuses: dict[int, int] = {}
+    deadline = time.perf_counter() + duration
+
+    async def login_loop():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.post("/api/login", json={"email": EMAIL, "password": PASSWORD})
+            logins.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    async def probe_loop():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            (await client.get("/api/crops")).raise_for_status()
+            probes.append(time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+
+    async def ticker():
+        interval = 0.005
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(max(0.0, time.perf_counter() - start - interval))
+
+    start = time.perf_counter()
+    # Probe and ticker first, so they are already waiting when the storm starts
+    await asyncio.gather(probe_loop(), ticker(), *(login_loop() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    params = {"mode": mode, "kdf": PASSWORD_KDF, "concurrency": concurrency}
+    results = [
+        summarize(name, p, samples, wall)
+        for name, p, samples in (
+            ("login", {**params, "statuses": statuses}, logins),
+            ("probe_crops", params, probes),
+            ("loop_lag", params, lags),
+        )
+        if samples
+    ]
+    for result in results:
+        print(format_result(result), flush=True)
+    return results
+
+
+async def run(concurrency: int, duration: float) -> list[dict]:
+    database.client = AsyncMongoMockClient()
+    database.db = database.client[DATABASE_NAME]
+    await database.db.users.insert_one({
+        "name": "Storm Farmer",
+        "email": EMAIL,
+        "password_hash": passwords.hash_password(PASSWORD),
+        "role": "farmer",
+        "created_at": datetime.now(timezone.utc),
+    })
+
+    results = []
+    offload = passwords._offload
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        (await client.get("/api/crops")).raise_for_status()  # warm-up
+        try:
+            passwords._offload = _inline
+            results += await _storm(client, "inline", concurrency, duration)
+        finally:
+            passwords._offload = offload
+        results += await _storm(client, "executor", concurrency, duration)
+
+    passwords.shutdown_password_pool()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event-loop responsiveness during a login storm")
+    parser.add_argument("--concurrency", type=int, default=32, help="Simultaneous login loops")
+    parser.add_argument("--duration", type=float, default=5, help="Seconds per mode")
+    parser.add_argument("--output", type=Path, help="Write results as JSON (see benchmarks/compare.py)")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    results = asyncio.run(run(args.concurrency, args.duration))
+    write_report(args.output, results, {"suite": "login", "kdf": PASSWORD_KDF})
+
+
+if __name__ == "__main__":
+    main()
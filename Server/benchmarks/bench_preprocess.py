@@ -0,0 +1,68 @@
+"""
+Micro-benchmark: legacy preprocess_image vs. fused preprocessing
+-----------------------------------------------------------------
+Run from Server/:
+
+    python -m benchmarks.bench_preprocess [--iterations 500]
+
+Compares the original float pipeline (divide, subtract, divide, transpose,
+expand_dims) against the fused per-channel affine writing into a reused
+BatchBuffer slot.  Both start from the same already-resized 224×224 uint8
+image so only the normalisation cost is measured.
+"""
+
+import argparse
+import time
+
+import numpy as np
+from PIL import Image
+
+from app.services.preprocess import (
+    IMG_SIZE,
+    IMAGENET_MEAN,
+    IMAGENET_STD,
+    BatchBuffer,
+    normalize_into,
+)
+
+
+def legacy_normalize(image: Image.Image) -> np.ndarray:
+    """The pre-fusion implementation, kept verbatim for comparison."""
+    arr = np.array(image, dtype=np.float32) / 255.0
+    arr = (arr - IMAGENET_MEAN) / IMAGENET_STD
+    arr = arr.transpose(2, 0, 1)
+    return np.expand_dims(arr, axis=0)
+
+
+def _time(fn, iterations: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    rgb = rng.integers(0, 256, size=(IMG_SIZE[1], IMG_SIZE[0], 3), dtype=np.uint8)
+    image = Image.fromarray(rgb)
+    buffer = BatchBuffer(1)
+
+    expected = legacy_normalize(image)
+    actual = normalize_into(rgb, buffer.slot(0))[None]
+    max_err = float(np.abs(expected - actual).max())
+
+    legacy_us = _time(lambda: np.ascontiguousarray(legacy_normalize(image)), args.iterations)
+    fused_us = _time(lambda: normalize_into(rgb, buffer.slot(0)), args.iterations)
+
+    print(f"legacy  : {legacy_us:8.1f} µs/image")
+    print(f"fused   : {fused_us:8.1f} µs/image  ({legacy_us / fused_us:.1f}× faster)")
+    print(f"max |Δ| : {max_err:.2e}")
+
+
+if __name__ == "__main__":
+    main()
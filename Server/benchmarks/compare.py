@@ -0,0 +1,64 @@
+"""
+Compare two benchmark reports
+------------------------------
+Matches results by name + params between a baseline and a candidate JSON
+report (from bench_inference / bench_api --output) and prints the change in
+p50, p95 and throughput.  Exits with status 1 if any case's p95 latency
+regressed by more than --threshold percent, so it can gate CI.
+
+Run from Server/:
+
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 10]
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+
+def _key(result: dict) -> str:
+    params = " ".join(f"{k}={v}" for k, v in result["params"].items() if k != "kb")
+    return f"{result['name']} {params}".strip()
+
+
+def _pct(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff two benchmark JSON reports")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="p95 regression (%%) that fails the run")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    old = {_key(r): r for r in baseline["results"]}
+
+    print(f"baseline : {baseline['meta'].get('commit')}  {baseline['meta'].get('timestamp')}")
+    print(f"candidate: {candidate['meta'].get('commit')}  {candidate['meta'].get('timestamp')}\n")
+    print(f"{'case':<64} {'p50 Δ':>8} {'p95 Δ':>8} {'thru Δ':>8}")
+
+    regressions = []
+    for result in candidate["results"]:
+        key = _key(result)
+        before = old.get(key)
+        if before is None:
+            print(f"{key:<64} {'new':>8}")
+            continue
+        p50 = _pct(before["p50_ms"], result["p50_ms"])
+        p95 = _pct(before["p95_ms"], result["p95_ms"])
+        throughput = _pct(before["throughput_per_s"], result["throughput_per_s"])
+        flag = "  ← regression" if p95 > args.threshold else ""
+        print(f"{key:<64} {p50:>+7.1f}% {p95:>+7.1f}% {throughput:>+7.1f}%{flag}")
+        if flag:
+            regressions.append(key)
+
+    if regressions:
+        raise SystemExit(f"\n{len(regressions)} case(s) regressed more than {args.threshold:.0f}% at p95")
+    print("\nNo p95 regressions above threshold")
+
+
+if __name__ == "__main__":
+    main()
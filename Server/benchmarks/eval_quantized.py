@@ -0,0 +1,85 @@
+"""
+Accuracy / latency report: INT8 vs. fp32
+-----------------------------------------
+Runs a labelled set (ImageFolder layout, e.g. the notebook's Validation
+split) through the fp32 model and the INT8 model produced by
+scripts/quantize_model.py, and prints per-class top-1 accuracy for each
+(named from class_map.json), their agreement and mean forward latency.
+
+    python -m benchmarks.eval_quantized --data-dir /path/to/dataset/Validation [--limit 50]
+
+The fp32 reference is the TorchScript model at MODEL_PATH unless
+--fp32-onnx is given.
+"""
+
+import argparse
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from app.config import CLASS_MAP_PATH, MODEL_PATH, QUANTIZED_MODEL_PATH
+from app.services.backends import OnnxBackend, TorchScriptBackend
+from app.services.image_decode import decode_image
+from app.services.preprocess import IMG_SIZE, resize_rgb, to_tensor
+from scripts.dataset import class_to_index, iter_labelled_images
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare INT8 and fp32 models per class")
+    parser.add_argument("--data-dir", type=Path, required=True)
+    parser.add_argument("--limit", type=int, default=0, help="Max images per class (0 = all)")
+    parser.add_argument("--int8", default=QUANTIZED_MODEL_PATH)
+    parser.add_argument("--fp32-onnx", default=None, help="Use an fp32 ONNX export as the reference")
+    args = parser.parse_args()
+
+    with open(CLASS_MAP_PATH) as f:
+        class_map = json.load(f)
+
+    fp32 = OnnxBackend(args.fp32_onnx) if args.fp32_onnx else TorchScriptBackend(MODEL_PATH)
+    int8 = OnnxBackend(args.int8)
+
+    correct = {"fp32": defaultdict(int), "int8": defaultdict(int)}
+    agree = defaultdict(int)
+    seen = defaultdict(int)
+    latency = {"fp32": [], "int8": []}
+
+    for path, label in iter_labelled_images(args.data_dir, class_to_index(class_map), args.limit):
+        tensor = to_tensor(resize_rgb(decode_image(path.read_bytes(), IMG_SIZE)))
+        preds = {}
+        for name, backend in (("fp32", fp32), ("int8", int8)):
+            start = time.perf_counter()
+            preds[name] = int(np.argmax(backend.run(tensor)[0]))
+            latency[name].append(time.perf_counter() - start)
+            correct[name][label] += preds[name] == label
+        agree[label] += preds["fp32"] == preds["int8"]
+        seen[label] += 1
+
+    total = sum(seen.values())
+    if not total:
+        raise SystemExit(f"No labelled images found under {args.data_dir}")
+
+    print(f"\n{'class':<34}{'n':>5}{'fp32 %':>9}{'int8 %':>9}{'agree %':>9}")
+    for label in sorted(seen):
+        n = seen[label]
+        print(
+            f"{class_map[str(label)][:33]:<34}{n:>5}"
+            f"{correct['fp32'][label] / n * 100:>9.1f}{correct['int8'][label] / n * 100:>9.1f}"
+            f"{agree[label] / n * 100:>9.1f}"
+        )
+    print(
+        f"{'ALL':<34}{total:>5}"
+        f"{sum(correct['fp32'].values()) / total * 100:>9.1f}"
+        f"{sum(correct['int8'].values()) / total * 100:>9.1f}"
+        f"{sum(agree.values()) / total * 100:>9.1f}"
+    )
+    print(
+        f"\nMean forward latency: fp32 {np.mean(latency['fp32']) * 1000:.2f} ms, "
+        f"int8 {np.mean(latency['int8']) * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
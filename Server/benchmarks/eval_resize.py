@@ -0,0 +1,76 @@
+"""
+Offline evaluation of resize backends
+--------------------------------------
+Runs a labelled image set through every RESIZE_MODES backend and reports,
+per mode, the mean resize latency, top-1 agreement with the LANCZOS
+baseline and top-1 accuracy against the folder labels.
+
+The image set uses the same layout as the training notebook
+(notebooks/train_model.ipynb) — one sub-folder per class name from
+class_map.json, e.g. the Validation split:
+
+    python -m benchmarks.eval_resize --data-dir /path/to/dataset/Validation [--limit 20]
+
+Requires the trained model (MODEL_PATH / CLASS_MAP_PATH).
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.services import ml_service
+from app.services.image_decode import decode_image
+from app.services.preprocess import IMG_SIZE, RESIZE_MODES, resize_rgb, to_tensor
+from scripts.dataset import class_to_index, iter_labelled_images
+
+BASELINE = "lanczos"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare resize backends against LANCZOS")
+    parser.add_argument("--data-dir", type=Path, required=True, help="ImageFolder-style labelled set")
+    parser.add_argument("--limit", type=int, default=0, help="Max images per class (0 = all)")
+    args = parser.parse_args()
+
+    if not ml_service.load_model(batching=False):
+        raise SystemExit("No model found — set MODEL_PATH to the trained TorchScript model.")
+
+    handle = ml_service.registry.current()
+    class_to_idx = class_to_index(handle.class_map or {})
+    modes = list(RESIZE_MODES)
+
+    latency = {m: [] for m in modes}
+    agree = {m: 0 for m in modes}
+    correct = {m: 0 for m in modes}
+    total = 0
+
+    for path, label in iter_labelled_images(args.data_dir, class_to_idx, args.limit):
+        image = decode_image(path.read_bytes(), IMG_SIZE)
+        preds = {}
+        for mode in modes:
+            start = time.perf_counter()
+            rgb = resize_rgb(image, IMG_SIZE, mode)
+            latency[mode].append(time.perf_counter() - start)
+            preds[mode] = int(np.argmax(handle.forward(to_tensor(rgb))[0]))
+
+        total += 1
+        for mode in modes:
+            agree[mode] += preds[mode] == preds[BASELINE]
+            correct[mode] += preds[mode] == label
+
+    if not total:
+        raise SystemExit(f"No labelled images found under {args.data_dir}")
+
+    print(f"\n{total} images\n")
+    print(f"{'mode':<18}{'resize ms':>10}{'agree %':>10}{'top-1 %':>10}")
+    for mode in modes:
+        print(
+            f"{mode:<18}{np.mean(latency[mode]) * 1000:>10.2f}"
+            f"{agree[mode] / total * 100:>10.1f}{correct[mode] / total * 100:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
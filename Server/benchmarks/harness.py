@@ -0,0 +1,161 @@
+"""
+Benchmark Harness
+------------------
+Shared pieces of the benchmark suite: a timing loop reporting throughput
+and p50/p95/p99 latency, peak RSS, reproducible synthetic leaf photos in
+several sizes and formats, and the JSON report format that
+benchmarks/compare.py diffs between commits.
+"""
+
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+SIZES = {
+    "small": (320, 240),      # thumbnails, WhatsApp previews
+    "medium": (1280, 960),    # typical compressed phone upload
+    "large": (4032, 3024),    # 12 MP camera original
+}
+FORMATS = ("JPEG", "PNG", "WEBP")
+
+
+# ── Measurement ───────────────────────────────────────────────────────
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (Linux reports KiB, macOS bytes)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(name: str, params: dict, latencies: list[float], wall_s: float) -> dict:
+    """Turn raw per-call latencies (seconds) into one result record."""
+    ms = np.asarray(latencies) * 1000
+    return {
+        "name": name,
+        "params": params,
+        "iterations": len(latencies),
+        "throughput_per_s": round(len(latencies) / wall_s, 2),
+        "mean_ms": round(float(ms.mean()), 6),
+        "p50_ms": round(float(np.percentile(ms, 50)), 6),
+        "p95_ms": round(float(np.percentile(ms, 95)), 6),
+        "p99_ms": round(float(np.percentile(ms, 99)), 6),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def measure(name: str, params: dict, fn: Callable[[], object], iterations: int, warmup: int = 3) -> dict:
+    """Time ``fn`` sequentially ``iterations`` times after ``warmup`` untimed calls."""
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t)
+    result = summarize(name, params, latencies, time.perf_counter() - start)
+    print(format_result(result), flush=True)
+    return result
+
+
+def _format_ms(ms: float) -> str:
+    return f"{ms * 1000:8.2f} µs" if ms < 0.1 else f"{ms:8.2f} ms"
+
+
+def format_result(result: dict) -> str:
+    params = " ".join(f"{k}={v}" for k, v in result["params"].items())
+    return (
+        f"{result['name']:<24} {params:<34} "
+        f"{result['throughput_per_s']:>11.1f}/s  "
+        f"p50 {_format_ms(result['p50_ms'])}  p95 {_format_ms(result['p95_ms'])}  "
+        f"p99 {_format_ms(result['p99_ms'])}  rss {result['peak_rss_mb']:>7.1f} MB"
+    )
+
+
+# ── Synthetic inputs ──────────────────────────────────────────────────
+def synthetic_leaf(size: tuple[int, int], seed: int = 0) -> Image.Image:
+    """
+    Deterministic leaf-like photo: green gradient, vein texture, brown
+    lesions and mild sensor noise, so encoders see realistic entropy.
+    """
+    width, height = size
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    x /= width
+    y /= height
+
+    green = 110 + 60 * np.sin(3 * x + 2 * y) + 20 * np.sin(40 * (x - 0.5 * y))
+    rgb = np.stack([0.45 * green, green, 0.3 * green], axis=-1)
+    for _ in range(12):
+        cx, cy, r = rng.random(), rng.random(), rng.uniform(0.01, 0.05)
+        spot = ((x - cx) ** 2 + (y - cy) ** 2) < r * r
+        rgb[spot] = (120, 80, 30)
+    rgb += rng.normal(0, 6, rgb.shape)
+    return Image.fromarray(np.clip(rgb, 0, 255).astype(np.uint8))
+
+
+def encode(image: Image.Image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    options = {"quality": 85} if fmt in ("JPEG", "WEBP") else {}
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def image_cases(sizes: list[str], formats: list[str]):
+    """Yield (params, encoded bytes) for every size × format combination."""
+    for size_name in sizes:
+        image = synthetic_leaf(SIZES[size_name])
+        for fmt in formats:
+            data = encode(image, fmt)
+            yield {"size": f"{image.width}x{image.height}", "format": fmt, "kb": len(data) // 1024}, data
+
+
+# ── Reports ───────────────────────────────────────────────────────────
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(extra: dict | None = None) -> dict:
+    from app import config
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "INFERENCE_BACKEND": config.INFERENCE_BACKEND,
+            "MODEL_VARIANT": config.MODEL_VARIANT,
+            "RESIZE_MODE": config.RESIZE_MODE,
+            "INFERENCE_BATCHING": config.INFERENCE_BATCHING,
+            "INFERENCE_EXECUTOR": config.INFERENCE_EXECUTOR,
+            "PREDICTION_CACHE_SIZE": config.PREDICTION_CACHE_SIZE,
+            "NEAR_DUP_CACHE_SIZE": config.NEAR_DUP_CACHE_SIZE,
+        },
+        **(extra or {}),
+    }
+
+
+def write_report(path: Path | None, results: list[dict], extra_meta: dict | None = None):
+    if path is None:
+        return
+    report = {"meta": metadata(extra_meta), "results": results}
+    path.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {len(results)} results to {path}")
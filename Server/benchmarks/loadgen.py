@@ -0,0 +1,307 @@
+"""
+Load generator — harvest-season traffic mix
+--------------------------------------------
+Drives a running CropGuard API over HTTP with an open-loop workload:
+requests arrive as independent Poisson processes at a target rate whether
+or not earlier ones have finished, so queueing delay shows up in latency
+instead of silently throttling the client (closed-loop coordinated
+omission).
+
+Traffic mix (weights via --mix):
+  - predict   — POST /api/predict, photos of mixed sizes, half authenticated;
+                arrivals multiplied by --burst-multiplier during periodic bursts
+  - history   — GET /api/history as a registered user, following next_cursor
+                for a random 1–3 pages
+  - diseases  — GET /api/diseases, /api/diseases/{key} and /api/crops browsing
+
+Each rate in --rates is held for --duration seconds.  Every step reports
+achieved throughput, p50/p95/p99 latency, error rate and 503s (load shed).
+The saturation throughput is the best step that meets --slo-p99-ms and
+--max-error-rate.
+
+Run the server first (in-memory MongoDB, see benchmarks/serve_local.py):
+
+    python -m benchmarks.serve_local --port 8000
+    python -m benchmarks.loadgen --url http://127.0.0.1:8000 --rates 5 10 20 40 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from benchmarks.harness import SIZES, encode, synthetic_leaf
+
+DEFAULT_MIX = "predict=5,history=2,diseases=3"
+UPLOAD_SIZES = {"small": 0.5, "medium": 0.4, "large": 0.1}  # share of predict uploads
+
+
+class Workload:
+    """Pre-built inputs and the request functions for each traffic class."""
+
+    def __init__(self, client: httpx.AsyncClient, images_per_size: int, users: int):
+        self.client = client
+        self.images_per_size = images_per_size
+        self.n_users = users
+        self.tokens: list[str] = []
+        self.disease_keys: list[str] = []
+        self.images: dict[str, list[bytes]] = {}
+
+    async def setup(self):
+        for size_name in UPLOAD_SIZES:
+            self.images[size_name] = [
+                encode(synthetic_leaf(SIZES[size_name], seed=seed), "JPEG")
+                for seed in range(self.images_per_size)
+            ]
+
+        for _ in range(self.n_users):
+            response = await self.client.post("/api/register", json={
+                "name": "Load Test",
+                "email": f"load-{uuid.uuid4().hex[:12]}@example.com",
+                "password": "load-test-password",
+            })
+            response.raise_for_status()
+            self.tokens.append(response.json()["token"])
+
+        response = await self.client.get("/api/diseases")
+        response.raise_for_status()
+        self.disease_keys = [d["class_key"] for d in response.json()["diseases"]]
+
+    def _auth(self) -> dict:
+        return {"Authorization": f"Bearer {random.choice(self.tokens)}"}
+
+    async def predict(self) -> httpx.Response:
+        size_name = random.choices(list(UPLOAD_SIZES), weights=list(UPLOAD_SIZES.values()))[0]
+        data = random.choice(self.images[size_name])
+        headers = self._auth() if random.random() < 0.5 else {}
+        return await self.client.post(
+            "/api/predict", files={"file": ("leaf.jpg", data, "image/jpeg")}, headers=headers,
+        )
+
+    async def history(self) -> httpx.Response:
+        headers = self._auth()
+        response = await self.client.get("/api/history?limit=20", headers=headers)
+        for _ in range(random.randint(0, 2)):
+            next_cursor = response.is_success and response.json().get("next_cursor")
+            if not next_cursor:
+                break
+            response = await self.client.get(f"/api/history?limit=20&cursor={next_cursor}", headers=headers)
+        return response
+
+    async def diseases(self) -> httpx.Response:
+        roll = random.random()
+        if roll < 0.4:
+            return await self.client.get("/api/diseases")
+        if roll < 0.9:
+            return await self.client.get(f"/api/diseases/{random.choice(self.disease_keys)}")
+        return await self.client.get("/api/crops")
+
+
+class StepStats:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.status: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: dict[str, int] = defaultdict(int)
+        self.dropped = 0
+
+    def record(self, kind: str, latency: float, status: int | None):
+        self.latencies[kind].append(latency)
+        if status is None:
+            self.errors[kind] += 1
+        else:
+            self.status[kind][status] += 1
+            if status >= 400:
+                self.errors[kind] += 1
+
+    def summary(self, rate: float, duration: float, slo_p99_ms: float, max_error_rate: float) -> dict:
+        per_kind = {}
+        all_latencies = []
+        total = errors = shed = 0
+        for kind, latencies in self.latencies.items():
+            ms = np.asarray(latencies) * 1000
+            all_latencies.extend(latencies)
+            total += len(latencies)
+            errors += self.errors[kind]
+            shed += self.status[kind].get(503, 0)
+            per_kind[kind] = {
+                "requests": len(latencies),
+                "p50_ms": round(float(np.percentile(ms, 50)), 2),
+                "p95_ms": round(float(np.percentile(ms, 95)), 2),
+                "p99_ms": round(float(np.percentile(ms, 99)), 2),
+                "error_rate": round(self.errors[kind] / len(latencies), 4),
+                "status": dict(self.status[kind]),
+            }
+
+        ms = np.asarray(all_latencies or [0.0]) * 1000
+        error_rate = errors / total if total else 0.0
+        p99 = float(np.percentile(ms, 99))
+        return {
+            "target_rate": rate,
+            "throughput_per_s": round((total - errors) / duration, 2),
+            "requests": total,
+            "p50_ms": round(float(np.percentile(ms, 50)), 2),
+            "p95_ms": round(float(np.percentile(ms, 95)), 2),
+            "p99_ms": round(p99, 2),
+            "error_rate": round(error_rate, 4),
+            "shed_503": shed,
+            "client_dropped": self.dropped,
+            "meets_slo": p99 <= slo_p99_ms and error_rate <= max_error_rate,
+            "by_kind": per_kind,
+        }
+
+
+async def run_step(workload: Workload, rate: float, mix: dict[str, float], args) -> StepStats:
+    """Open-loop Poisson arrivals at ``rate`` req/s for ``args.duration`` seconds."""
+    stats = StepStats()
+    kinds = list(mix)
+    weights = np.array([mix[k] for k in kinds]) / sum(mix.values())
+    rates = dict(zip(kinds, weights * rate))
+    inflight: set[asyncio.Task] = set()
+    handlers = {"predict": workload.predict, "history": workload.history, "diseases": workload.diseases}
+
+    async def fire(kind: str):
+        start = time.perf_counter()
+        try:
+            response = await handlers[kind]()
+            stats.record(kind, time.perf_counter() - start, response.status_code)
+        except httpx.HTTPError:
+            stats.record(kind, time.perf_counter() - start, None)
+
+    def in_burst(elapsed: float) -> bool:
+        return args.burst_every > 0 and (elapsed % args.burst_every) < args.burst_duration
+
+    # Thinning: draw arrivals at the peak rate, keep each with probability rate(t) / peak
+    peak = sum(rates.values()) + rates.get("predict", 0) * (max(args.burst_multiplier, 1) - 1)
+    start = time.perf_counter()
+    next_arrival = start
+    while True:
+        next_arrival += random.expovariate(peak)
+        elapsed = next_arrival - start
+        if elapsed >= args.duration:
+            break
+        await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+
+        current = dict(rates)
+        if in_burst(elapsed) and "predict" in current:
+            current["predict"] *= args.burst_multiplier
+        roll = random.uniform(0, peak)
+        for kind, kind_rate in current.items():
+            if roll < kind_rate:
+                break
+            roll -= kind_rate
+        else:
+            continue  # thinned out
+
+        if len(inflight) >= args.max_inflight:
+            stats.dropped += 1
+            continue
+        task = asyncio.create_task(fire(kind))
+        inflight.add(task)
+        task.add_done_callback(inflight.discard)
+
+    if inflight:
+        await asyncio.wait(inflight)
+    return stats
+
+
+def _parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in ("predict", "history", "diseases"):
+            raise argparse.ArgumentTypeError(f"unknown traffic class '{kind}'")
+        mix[kind] = float(weight)
+    return {k: w for k, w in mix.items() if w > 0}
+
+
+def _print_step(result: dict):
+    print(
+        f"rate {result['target_rate']:>6.1f}/s → {result['throughput_per_s']:>6.1f}/s ok  "
+        f"p50 {result['p50_ms']:>7.1f}  p95 {result['p95_ms']:>7.1f}  p99 {result['p99_ms']:>7.1f} ms  "
+        f"errors {result['error_rate'] * 100:5.1f}%  503 {result['shed_503']:>4}  "
+        f"{'✓' if result['meets_slo'] else '✗'}",
+        flush=True,
+    )
+    for kind, k in result["by_kind"].items():
+        print(f"    {kind:<9} n={k['requests']:<6} p50 {k['p50_ms']:>7.1f}  p99 {k['p99_ms']:>7.1f} ms  "
+              f"errors {k['error_rate'] * 100:5.1f}%")
+
+
+async def main_async(args):
+    mix = _parse_mix(args.mix)
+    limits = httpx.Limits(max_connections=args.max_inflight, max_keepalive_connections=args.max_inflight)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        workload = Workload(client, args.images_per_size, args.users)
+        print(f"Setting up against {args.url} ({args.users} users, {args.images_per_size} images per size)…")
+        await workload.setup()
+
+        steps = []
+        for rate in args.rates:
+            stats = await run_step(workload, rate, mix, args)
+            result = stats.summary(rate, args.duration, args.slo_p99_ms, args.max_error_rate)
+            _print_step(result)
+            steps.append(result)
+
+    passing = [s for s in steps if s["meets_slo"]]
+    saturation = max((s["throughput_per_s"] for s in passing), default=None)
+    print(
+        f"\nSaturation throughput (p99 ≤ {args.slo_p99_ms:.0f} ms, errors ≤ {args.max_error_rate * 100:.1f}%): "
+        f"{saturation if saturation is not None else 'no step met the SLO'}"
+        + (" req/s" if saturation is not None else "")
+    )
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "url": args.url,
+                "mix": mix,
+                "duration_s": args.duration,
+                "burst": {
+                    "every_s": args.burst_every,
+                    "duration_s": args.burst_duration,
+                    "multiplier": args.burst_multiplier,
+                },
+                "slo_p99_ms": args.slo_p99_ms,
+                "max_error_rate": args.max_error_rate,
+            },
+            "saturation_throughput_per_s": saturation,
+            "steps": steps,
+        }
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Wrote report to {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load generator for the CropGuard API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rates", nargs="+", type=float, default=[5, 10, 20, 40], help="Base arrival rates (req/s) to step through; bursts add on top")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per rate step")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Traffic weights (default {DEFAULT_MIX})")
+    parser.add_argument("--burst-every", type=float, default=20, help="Seconds between predict bursts (0 = none)")
+    parser.add_argument("--burst-duration", type=float, default=4)
+    parser.add_argument("--burst-multiplier", type=float, default=3, help="Predict arrival multiplier during bursts")
+    parser.add_argument("--users", type=int, default=20, help="Accounts registered for authenticated traffic")
+    parser.add_argument("--images-per-size", type=int, default=8, help="Distinct photos per size (repeats hit caches)")
+    parser.add_argument("--max-inflight", type=int, default=256, help="Client-side cap; arrivals beyond it are dropped")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--slo-p99-ms", type=float, default=1000)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the step results as JSON")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
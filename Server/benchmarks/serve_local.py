@@ -0,0 +1,56 @@
+"""
+Local server with an in-memory MongoDB
+---------------------------------------
+Starts the real app under uvicorn with MongoDB replaced by mongomock-motor,
+so benchmarks/loadgen.py can run on a laptop without a database server.
+Everything else (model, executor, caches, middleware) is the production
+code path and honours the usual environment variables.
+
+    pip install mongomock-motor
+
+Run from Server/:
+
+    python -m benchmarks.serve_local [--port 8000]
+
+To load-test against a real MongoDB, run ``uvicorn app.main:app`` instead.
+"""
+
+import argparse
+
+import uvicorn
+
+from app import database
+from app.config import DATABASE_NAME
+from app.services.indexes import ensure_indexes
+
+try:
+    from mongomock_motor import AsyncMongoMockClient
+except ImportError:
+    AsyncMongoMockClient = None
+
+
+async def _connect_mock_db():
+    database.client = AsyncMongoMockClient()
+    database.db = database.client[DATABASE_NAME]
+    await ensure_indexes(database.db)
+    print(f"✅ Using in-memory MongoDB stand-in: {DATABASE_NAME}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API against an in-memory MongoDB")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    if AsyncMongoMockClient is None:
+        raise SystemExit("mongomock-motor is required: pip install mongomock-motor")
+
+    # main.py binds connect_db at import time, so patch before importing it
+    database.connect_db = _connect_mock_db
+    from app.main import app
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
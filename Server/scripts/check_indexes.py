@@ -0,0 +1,108 @@
+"""
+Explain-plan check for the declared MongoDB indexes
+----------------------------------------------------
+Applies app/services/indexes.py to a database and explains every query
+shape in query_shapes().  A shape fails when its winning plan:
+
+  - scans the collection (COLLSCAN),
+  - sorts in memory (a blocking SORT stage) although it asks for a sort,
+  - fetches documents although it is declared covered (FETCH), or
+  - does not use the index it is declared against.
+
+Needs a running MongoDB (MONGODB_URI).  By default it works on a scratch
+database that is dropped afterwards; pass --database to check a real one,
+e.g. after deploying new index declarations.
+
+Run from Server/:
+
+    python -m scripts.check_indexes [--database cropguard] [--keep]
+
+Exits 1 if any shape is not index-backed, so it can gate CI.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config import DATABASE_NAME, MONGODB_URI
+from app.services.indexes import QueryShape, ensure_indexes, query_shapes
+
+
+def _plan_nodes(node):
+    """Every stage dict in an explain plan tree (classic and SBE layouts)."""
+    if isinstance(node, dict):
+        if "stage" in node:
+            yield node
+        for key, value in node.items():
+            if key != "slotBasedPlan":
+                yield from _plan_nodes(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _plan_nodes(value)
+
+
+def _problems(shape: QueryShape, explain: dict) -> tuple[list[str], list[str], set[str]]:
+    winning = explain["queryPlanner"]["winningPlan"]
+    nodes = list(_plan_nodes(winning))
+    stages = [n["stage"] for n in nodes]
+    indexes = {n["indexName"] for n in nodes if "indexName" in n}
+
+    problems = []
+    if "COLLSCAN" in stages:
+        problems.append("collection scan")
+    if shape.sort and "SORT" in stages:
+        problems.append("in-memory sort")
+    if shape.covered and "FETCH" in stages:
+        problems.append("not covered (FETCH)")
+    if shape.index and shape.index not in indexes:
+        problems.append(f"expected index {shape.index}, used {sorted(indexes) or 'none'}")
+    return problems, stages, indexes
+
+
+async def check(db) -> bool:
+    await ensure_indexes(db)
+
+    ok = True
+    for shape in query_shapes():
+        cursor = db[shape.collection].find(shape.filter, shape.projection).limit(shape.limit)
+        if shape.sort:
+            cursor = cursor.sort(shape.sort)
+        explain = await cursor.explain()
+
+        problems, stages, indexes = _problems(shape, explain)
+        ok = ok and not problems
+        mark = "✓" if not problems else "✗"
+        print(f"{mark} {shape.name:<30} {' → '.join(reversed(stages))}  [{', '.join(sorted(indexes))}]")
+        for problem in problems:
+            print(f"    {problem}")
+    return ok
+
+
+async def main_async(args) -> bool:
+    client = AsyncIOMotorClient(args.uri)
+    name = args.database or f"{DATABASE_NAME}_indexcheck"
+    try:
+        print(f"Checking query shapes on {name}\n")
+        return await check(client[name])
+    finally:
+        if not args.database and not args.keep:
+            await client.drop_database(name)
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that every declared query shape is index-backed")
+    parser.add_argument("--uri", default=MONGODB_URI)
+    parser.add_argument("--database", help="Database to check (default: a scratch database, dropped afterwards)")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database")
+    args = parser.parse_args()
+
+    ok = asyncio.run(main_async(args))
+    print("\nAll query shapes are index-backed." if ok else "\nSome query shapes are not index-backed.")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Labelled image sets in the training notebook's layout
+-------------------------------------------------------
+notebooks/train_model.ipynb trains from an ImageFolder tree — one
+sub-folder per class name, e.g. ``dataset/Train/Brownspot/*.jpg`` — with a
+matching ``Validation`` split.  Offline tools (calibration, evaluation)
+read the same tree and map folder names to model indices via class_map.json.
+"""
+
+from pathlib import Path
+from typing import Iterator
+
+from app.config import ALLOWED_EXTENSIONS
+
+
+def iter_labelled_images(
+    data_dir: Path,
+    class_to_idx: dict[str, int],
+    limit: int = 0,
+) -> Iterator[tuple[Path, int]]:
+    """Yield (image path, class index), at most ``limit`` per class (0 = all)."""
+    for class_dir in sorted(p for p in data_dir.iterdir() if p.is_dir()):
+        if class_dir.name not in class_to_idx:
+            print(f"  skipping unknown class folder '{class_dir.name}'")
+            continue
+        files = [f for f in sorted(class_dir.iterdir()) if f.suffix.lower() in ALLOWED_EXTENSIONS]
+        for f in files[:limit] if limit else files:
+            yield f, class_to_idx[class_dir.name]
+
+
+def class_to_index(class_map: dict[str, str]) -> dict[str, int]:
+    """Invert class_map.json (index → class name)."""
+    return {name: int(idx) for idx, name in class_map.items()}
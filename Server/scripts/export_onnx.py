@@ -0,0 +1,91 @@
+"""
+Export the TorchScript model to ONNX
+-------------------------------------
+Converts model/crop_disease_model.pt (exported by notebooks/train_model.ipynb)
+into an ONNX graph with a dynamic batch dimension for the onnxruntime
+backend (INFERENCE_BACKEND=onnx), then checks parity against TorchScript.
+
+Run from Server/:
+
+    python -m scripts.export_onnx [--output model/crop_disease_model.onnx] [--images DIR]
+
+Parity is checked on the images in --images (any JPEG/PNG/WEBP files,
+searched recursively) or, if none are given, on random inputs.  The export
+fails if top-1 predictions disagree or logits differ by more than --atol.
+
+Requires torch, onnx and onnxruntime.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from app.config import ALLOWED_EXTENSIONS, MODEL_PATH, ONNX_MODEL_PATH
+from app.services.backends import OnnxBackend, TorchScriptBackend
+from app.services.image_decode import decode_image
+from app.services.preprocess import IMG_SIZE, resize_rgb, to_tensor
+
+OPSET = 17
+
+
+def export(model_path: Path, output: Path):
+    import torch
+
+    model = torch.jit.load(str(model_path), map_location="cpu").eval()
+    dummy = torch.zeros(1, 3, IMG_SIZE[1], IMG_SIZE[0])
+    kwargs = dict(
+        input_names=["input"],
+        output_names=["logits"],
+        dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}},
+        opset_version=OPSET,
+    )
+    try:
+        # TorchScript modules need the classic (non-dynamo) exporter
+        torch.onnx.export(model, dummy, str(output), dynamo=False, **kwargs)
+    except TypeError:  # torch < 2.5 has no ``dynamo`` argument
+        torch.onnx.export(model, dummy, str(output), **kwargs)
+    print(f"✅ Exported {output} ({output.stat().st_size / 1024 / 1024:.1f} MB)")
+
+
+def _sample_batch(images_dir: Path | None, count: int) -> np.ndarray:
+    if images_dir:
+        files = [p for p in sorted(images_dir.rglob("*")) if p.suffix.lower() in ALLOWED_EXTENSIONS]
+        tensors = [
+            to_tensor(resize_rgb(decode_image(p.read_bytes(), IMG_SIZE)))
+            for p in files[:count]
+        ]
+        if tensors:
+            return np.concatenate(tensors)
+        print(f"No images under {images_dir}, using random inputs")
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((count, 3, IMG_SIZE[1], IMG_SIZE[0]), dtype=np.float32)
+
+
+def check_parity(model_path: Path, onnx_path: Path, batch: np.ndarray, atol: float) -> bool:
+    torch_probs = TorchScriptBackend(str(model_path)).run(batch)
+    onnx_probs = OnnxBackend(str(onnx_path)).run(batch)
+
+    max_diff = float(np.abs(torch_probs - onnx_probs).max())
+    agree = float((torch_probs.argmax(1) == onnx_probs.argmax(1)).mean())
+    print(f"Parity on {len(batch)} inputs: top-1 agreement {agree * 100:.1f}%, max |Δp| {max_diff:.2e}")
+    return agree == 1.0 and max_diff <= atol
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export TorchScript → ONNX and verify parity")
+    parser.add_argument("--model", type=Path, default=Path(MODEL_PATH))
+    parser.add_argument("--output", type=Path, default=Path(ONNX_MODEL_PATH))
+    parser.add_argument("--images", type=Path, default=None, help="Folder of sample images for parity")
+    parser.add_argument("--samples", type=int, default=32)
+    parser.add_argument("--atol", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    export(args.model, args.output)
+    batch = _sample_batch(args.images, args.samples)
+    if not check_parity(args.model, args.output, batch, args.atol):
+        raise SystemExit("❌ ONNX output does not match TorchScript")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+INT8 quantisation for CPU serving
+----------------------------------
+Produces model/crop_disease_model.int8.onnx from the fp32 ONNX export
+(scripts/export_onnx.py) using ONNX Runtime post-training quantisation:
+
+  - static  (default) — QDQ format, per-channel int8 weights, uint8
+              activations calibrated on images drawn from the training
+              split used by notebooks/train_model.ipynb
+  - dynamic — int8 weights only, activations quantised at run time; used
+              automatically when no calibration images are available
+
+Run from Server/:
+
+    python -m scripts.quantize_model --calib-dir /path/to/dataset/Train [--per-class 8]
+    python -m scripts.quantize_model --mode dynamic
+
+Serve the result with MODEL_VARIANT=int8 and compare it against fp32 with
+benchmarks/eval_quantized.py.  Requires onnx and onnxruntime.
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+
+from app.config import CLASS_MAP_PATH, ONNX_MODEL_PATH, QUANTIZED_MODEL_PATH
+from app.services.image_decode import decode_image
+from app.services.preprocess import IMG_SIZE, resize_rgb, to_tensor
+from scripts.dataset import class_to_index, iter_labelled_images
+
+
+def _calibration_files(calib_dir: Path, per_class: int, seed: int) -> list[Path]:
+    with open(CLASS_MAP_PATH) as f:
+        class_to_idx = class_to_index(json.load(f))
+
+    by_class: dict[int, list[Path]] = {}
+    for path, label in iter_labelled_images(calib_dir, class_to_idx):
+        by_class.setdefault(label, []).append(path)
+
+    rng = random.Random(seed)
+    files = []
+    for paths in by_class.values():
+        files.extend(rng.sample(paths, min(per_class, len(paths))))
+    return files
+
+
+def quantize_static(input_path: Path, output_path: Path, files: list[Path]):
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantFormat,
+        QuantType,
+        quantize_static as ort_quantize_static,
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    class ImageReader(CalibrationDataReader):
+        def __init__(self, input_name: str):
+            self._input_name = input_name
+            self._files = iter(files)
+
+        def get_next(self):
+            path = next(self._files, None)
+            if path is None:
+                return None
+            rgb = resize_rgb(decode_image(path.read_bytes(), IMG_SIZE))
+            return {self._input_name: to_tensor(rgb)}
+
+    import onnx
+
+    input_name = onnx.load(str(input_path)).graph.input[0].name
+    prepared = output_path.with_suffix(".prep.onnx")
+    quant_pre_process(str(input_path), str(prepared))
+    try:
+        ort_quantize_static(
+            str(prepared),
+            str(output_path),
+            ImageReader(input_name),
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+        )
+    finally:
+        prepared.unlink(missing_ok=True)
+
+
+def quantize_dynamic(input_path: Path, output_path: Path):
+    from onnxruntime.quantization import QuantType, quantize_dynamic as ort_quantize_dynamic
+
+    ort_quantize_dynamic(str(input_path), str(output_path), weight_type=QuantType.QInt8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantise the ONNX model to INT8")
+    parser.add_argument("--input", type=Path, default=Path(ONNX_MODEL_PATH))
+    parser.add_argument("--output", type=Path, default=Path(QUANTIZED_MODEL_PATH))
+    parser.add_argument("--mode", choices=("static", "dynamic"), default="static")
+    parser.add_argument("--calib-dir", type=Path, default=None, help="Training split (ImageFolder layout)")
+    parser.add_argument("--per-class", type=int, default=8, help="Calibration images per class")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        raise SystemExit(f"{args.input} not found — run `python -m scripts.export_onnx` first")
+
+    mode = args.mode
+    files = []
+    if mode == "static":
+        files = _calibration_files(args.calib_dir, args.per_class, args.seed) if args.calib_dir else []
+        if not files:
+            print("⚠️  No calibration images — falling back to dynamic quantisation")
+            mode = "dynamic"
+
+    if mode == "static":
+        print(f"Static quantisation, calibrating on {len(files)} images...")
+        quantize_static(args.input, args.output, files)
+    else:
+        print("Dynamic quantisation...")
+        quantize_dynamic(args.input, args.output)
+
+    fp32_mb = args.input.stat().st_size / 1024 / 1024
+    int8_mb = args.output.stat().st_size / 1024 / 1024
+    print(f"✅ Saved {args.output} ({int8_mb:.1f} MB, fp32 was {fp32_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Shared fixtures: an in-memory MongoDB and an app client that uses it."""
+
+import pytest
+
+
+@pytest.fixture
+def mongo_db(monkeypatch):
+    """mongomock-backed database installed as app.database.db."""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    from app import database
+
+    client = mongomock_motor.AsyncMongoMockClient()
+    monkeypatch.setattr(database, "client", client)
+    monkeypatch.setattr(database, "db", client["cropguard_test"])
+    return database.db
+
+
+@pytest.fixture
+def client(mongo_db, monkeypatch):
+    """TestClient running the full lifespan against ``mongo_db``."""
+    from fastapi.testclient import TestClient
+
+    from app import main
+
+    async def noop():
+        pass
+
+    monkeypatch.setattr(main, "connect_db", noop)
+    monkeypatch.setattr(main, "close_db", noop)
+    with TestClient(main.app) as test_client:
+        yield test_client
@@ -0,0 +1,48 @@
+"""TorchScript and ONNX backends agree on the same exported model."""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from app.services.backends import OnnxBackend, TorchScriptBackend  # noqa: E402
+from app.services.preprocess import IMG_SIZE  # noqa: E402
+from scripts.export_onnx import export  # noqa: E402
+
+NUM_CLASSES = 5
+
+
+@pytest.fixture(scope="module")
+def model_files(tmp_path_factory):
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(
+        torch.nn.Conv2d(3, 8, kernel_size=7, stride=4),
+        torch.nn.BatchNorm2d(8),
+        torch.nn.ReLU(),
+        torch.nn.AdaptiveAvgPool2d(1),
+        torch.nn.Flatten(),
+        torch.nn.Linear(8, NUM_CLASSES),
+    ).eval()
+    directory = tmp_path_factory.mktemp("model")
+    pt_path = directory / "model.pt"
+    onnx_path = directory / "model.onnx"
+    torch.jit.script(model).save(str(pt_path))
+    export(pt_path, onnx_path)
+    return pt_path, onnx_path
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 8])
+def test_onnx_matches_torchscript(model_files, batch_size):
+    pt_path, onnx_path = model_files
+    rng = np.random.default_rng(batch_size)
+    batch = rng.standard_normal((batch_size, 3, IMG_SIZE[1], IMG_SIZE[0]), dtype=np.float32)
+
+    torch_probs = TorchScriptBackend(str(pt_path)).run(batch)
+    onnx_probs = OnnxBackend(str(onnx_path)).run(batch)
+
+    assert torch_probs.shape == onnx_probs.shape == (batch_size, NUM_CLASSES)
+    np.testing.assert_allclose(onnx_probs.sum(axis=1), 1.0, rtol=1e-5)
+    np.testing.assert_allclose(onnx_probs, torch_probs, atol=1e-5)
+    assert (onnx_probs.argmax(axis=1) == torch_probs.argmax(axis=1)).all()
@@ -0,0 +1,82 @@
+"""MicroBatcher: per-caller results, error fan-out and shutdown."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.services.batcher import MicroBatcher
+from app.services.preprocess import IMG_SIZE
+
+SHAPE = (3, IMG_SIZE[1], IMG_SIZE[0])
+
+
+def _item(value: float) -> np.ndarray:
+    return np.full(SHAPE, value, dtype=np.float32)
+
+
+def _row_means(batch: np.ndarray) -> np.ndarray:
+    # One "probability row" per image that identifies which image it came from
+    return batch.reshape(len(batch), -1).mean(axis=1, keepdims=True).copy()
+
+
+@pytest.fixture
+def batcher():
+    b = MicroBatcher(_row_means, max_batch_size=4, max_wait_ms=20)
+    b.start()
+    yield b
+    b.stop()
+
+
+def test_each_caller_gets_its_own_row(batcher):
+    with ThreadPoolExecutor(16) as pool:
+        rows = list(pool.map(lambda v: batcher.submit(_item(v)).result(timeout=5), range(32)))
+    assert [float(r[0]) for r in rows] == list(range(32))
+    stats = batcher.stats()
+    assert stats["items"] == 32
+    assert stats["mean_batch_size"] > 1  # concurrent callers were coalesced
+
+
+def test_forward_error_reaches_every_caller_in_the_batch():
+    def boom(batch):
+        raise ValueError("forward failed")
+
+    b = MicroBatcher(boom, max_batch_size=4, max_wait_ms=50)
+    b.start()
+    try:
+        futures = [b.submit(_item(i)) for i in range(3)]
+        for future in futures:
+            with pytest.raises(ValueError, match="forward failed"):
+                future.result(timeout=5)
+
+        # The loop survives a failed batch
+        b._run_batch = _row_means
+        assert float(b.submit(_item(7)).result(timeout=5)[0]) == 7
+    finally:
+        b.stop()
+
+
+def test_stop_resolves_pending_and_rejects_late_submitters():
+    release = threading.Event()
+
+    def slow(batch):
+        release.wait(5)
+        return _row_means(batch)
+
+    b = MicroBatcher(slow, max_batch_size=1, max_wait_ms=0)
+    b.start()
+    running = b.submit(_item(1))
+    queued = [b.submit(_item(i)) for i in range(2, 5)]
+
+    # The loop is stuck in forward, so stop() times out with items still queued
+    b.stop(timeout=0.1)
+    for future in queued:
+        with pytest.raises(RuntimeError, match="stopped"):
+            future.result(timeout=1)
+    with pytest.raises(RuntimeError, match="not running"):
+        b.submit(_item(9))
+
+    # The batch already in forward still completes
+    release.set()
+    assert float(running.result(timeout=5)[0]) == 1
@@ -0,0 +1,51 @@
+"""Process executor: metrics shipped back from workers are counted once."""
+
+import asyncio
+import multiprocessing
+
+import pytest
+
+from app.services import executor, metrics, ml_service
+
+pytestmark = pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers only inherit the parent's metrics when forked",
+)
+
+
+def _record_one_insert() -> str:
+    metrics.MONGO_INSERT.observe(0.01)
+    return "done"
+
+
+def _count(histogram) -> float:
+    return sum(histogram._totals()[:-1])
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    # Forked workers inherit these patches, so they start without loading a model
+    monkeypatch.setattr(ml_service, "load_model", lambda **kwargs: True)
+    monkeypatch.setattr(ml_service, "warm_up_model", lambda: True)
+    monkeypatch.setattr(ml_service, "get_inference_stats", lambda: {"model_version": "test"})
+    monkeypatch.setattr(executor, "INFERENCE_EXECUTOR", "process")
+    monkeypatch.setattr(executor, "INFERENCE_WORKERS", 1)
+    monkeypatch.setattr(executor, "_recycles", 0)
+    executor.start_executor()
+    executor.warm_up_executor()
+    yield
+    executor.shutdown_executor()
+
+
+def test_recycled_workers_do_not_resend_parent_metrics(process_pool):
+    for _ in range(100):
+        metrics.MONGO_INSERT.observe(0.01)
+    for _ in range(50):
+        metrics.PREDICTIONS_MODEL.inc()
+    inserts, predictions = _count(metrics.MONGO_INSERT), metrics.PREDICTIONS_MODEL.value()
+
+    assert executor.recycle_workers()
+    assert asyncio.run(executor.run_in_executor(_record_one_insert)) == "done"
+
+    assert _count(metrics.MONGO_INSERT) == inserts + 1
+    assert metrics.PREDICTIONS_MODEL.value() == predictions
@@ -0,0 +1,171 @@
+"""History keyset pagination: continuation tokens, cursor queries and cached totals."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+
+from app.auth import create_access_token
+from app.services import history
+from app.services.history import (
+    SORT,
+    InvalidCursorError,
+    _TotalCache,
+    after_cursor,
+    count_history,
+    decode_cursor,
+    encode_cursor,
+    record_inserted,
+)
+
+USER_ID = "64b000000000000000000001"
+BASE = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def _seed(db, count: int = 25, user_id: str = USER_ID) -> list[dict]:
+    # Pairs share a timestamp so the _id tie-break is exercised
+    docs = [
+        {"_id": ObjectId(), "user_id": user_id, "created_at": BASE + timedelta(seconds=i // 2), "crop_name": f"c{i}"}
+        for i in range(count)
+    ]
+    asyncio.run(db.predictions.insert_many(docs))
+    return docs
+
+
+def _newest_first(docs: list[dict]) -> list[ObjectId]:
+    return [d["_id"] for d in sorted(docs, key=lambda d: (d["created_at"], d["_id"]), reverse=True)]
+
+
+# ── Continuation tokens ───────────────────────────────────────────────
+def test_cursor_round_trip():
+    doc = {"created_at": datetime(2025, 6, 1, 12, 30, 15, 123000, tzinfo=timezone.utc), "_id": ObjectId()}
+    assert decode_cursor(encode_cursor(doc)) == (doc["created_at"], doc["_id"])
+
+
+def test_cursor_treats_naive_datetimes_as_utc():
+    # MongoDB hands back naive UTC datetimes
+    object_id = ObjectId()
+    aware = {"created_at": datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc), "_id": object_id}
+    naive = {"created_at": datetime(2025, 6, 1, 12, 0), "_id": object_id}
+    assert encode_cursor(naive) == encode_cursor(aware)
+
+
+def test_cursor_truncates_to_milliseconds():
+    doc = {"created_at": datetime(2025, 6, 1, 12, 0, 0, 123456, tzinfo=timezone.utc), "_id": ObjectId()}
+    created_at, _ = decode_cursor(encode_cursor(doc))
+    assert created_at.microsecond == 123000
+
+
+@pytest.mark.parametrize("token", ["", "not-a-cursor", "MTIzOm5vdC1hbi1vaWQ", "YWJjOjY0YjAwMDAwMDAwMDAwMDAwMDAwMDAwMQ", "!!!"])
+def test_foreign_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token)
+
+
+# ── Cursor queries ────────────────────────────────────────────────────
+async def _walk(db, user_id: str, limit: int) -> list[list[ObjectId]]:
+    pages, token = [], None
+    while True:
+        query = after_cursor(user_id, token) if token else {"user_id": user_id}
+        docs = await db.predictions.find(query).sort(SORT).limit(limit + 1).to_list(length=limit + 1)
+        pages.append([d["_id"] for d in docs[:limit]])
+        if len(docs) <= limit:
+            return pages
+        token = encode_cursor(docs[limit - 1])
+
+
+def test_after_cursor_walks_every_document_once(mongo_db):
+    docs = _seed(mongo_db)
+    _seed(mongo_db, 5, user_id="64b000000000000000000002")  # another user's history stays out
+
+    pages = asyncio.run(_walk(mongo_db, USER_ID, limit=4))
+    assert [len(p) for p in pages] == [4, 4, 4, 4, 4, 4, 1]
+    assert [i for page in pages for i in page] == _newest_first(docs)
+
+
+def test_after_cursor_splits_timestamp_ties_by_id(mongo_db):
+    docs = _seed(mongo_db, 2)  # same created_at
+    newer, older = _newest_first(docs)
+    query = after_cursor(USER_ID, encode_cursor({"created_at": BASE, "_id": newer}))
+    found = asyncio.run(mongo_db.predictions.find(query).sort(SORT).to_list(length=10))
+    assert [d["_id"] for d in found] == [older]
+
+
+def test_history_route_follows_next_cursor(client, mongo_db):
+    user_id = str(asyncio.run(mongo_db.users.insert_one(
+        {"name": "Ravi", "email": "ravi@example.com", "password_hash": "x$y", "role": "farmer"}
+    )).inserted_id)
+    docs = _seed(mongo_db, 7, user_id=user_id)
+    headers = {"Authorization": f"Bearer {create_access_token(user_id, 'ravi@example.com', 'Ravi')}"}
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/history", params=params, headers=headers).json()
+        assert body["total"] == 7
+        seen += [ObjectId(p["prediction_id"]) for p in body["predictions"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == _newest_first(docs)
+
+    bad = client.get("/api/history", params={"cursor": "garbage"}, headers=headers)
+    assert bad.status_code == 400
+
+
+# ── Cached totals ─────────────────────────────────────────────────────
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_total_cache_expires_after_ttl(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(history.time, "monotonic", clock)
+    cache = _TotalCache(ttl=60, max_entries=10)
+    cache.put("u", 5)
+    clock.now += 59
+    assert cache.get("u") == 5
+    clock.now += 2
+    assert cache.get("u") is None
+
+
+def test_total_cache_add_only_adjusts_cached_users():
+    cache = _TotalCache(ttl=60, max_entries=10)
+    cache.put("u", 5)
+    cache.add("u", 3)
+    cache.add("other", 3)  # nothing cached → next count_history counts for real
+    assert cache.get("u") == 8
+    assert cache.get("other") is None
+
+
+def test_total_cache_evicts_least_recently_written():
+    cache = _TotalCache(ttl=60, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+    assert cache.get("a") is None
+    assert (cache.get("b"), cache.get("c")) == (2, 3)
+
+
+def test_count_history_is_cached_and_kept_in_step(mongo_db, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(history.time, "monotonic", clock)
+    monkeypatch.setattr(history, "_totals", _TotalCache(ttl=60, max_entries=10))
+    _seed(mongo_db, 4)
+    assert asyncio.run(count_history(mongo_db, USER_ID)) == 4
+
+    # Another replica inserts: the cached total drifts until the TTL passes
+    _seed(mongo_db, 2)
+    assert asyncio.run(count_history(mongo_db, USER_ID)) == 4
+
+    # An insert recorded here keeps the cached total in step
+    record_inserted(USER_ID, 1)
+    assert asyncio.run(count_history(mongo_db, USER_ID)) == 5
+
+    clock.now += 61
+    assert asyncio.run(count_history(mongo_db, USER_ID)) == 6
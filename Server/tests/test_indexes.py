@@ -0,0 +1,59 @@
+"""Every declared query shape is index-backed — explained on a real MongoDB."""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.config import MONGODB_URI
+from app.services.indexes import query_shapes
+from scripts.check_indexes import _problems, check
+
+HISTORY_INDEX = "history_keyset_summary"
+
+
+async def _explain_all(db) -> dict[str, dict]:
+    await check(db)  # creates the declared indexes, then prints the same report as the script
+    explains = {}
+    for shape in query_shapes():
+        cursor = db[shape.collection].find(shape.filter, shape.projection).limit(shape.limit)
+        if shape.sort:
+            cursor = cursor.sort(shape.sort)
+        explains[shape.name] = await cursor.explain()
+    return explains
+
+
+@pytest.fixture(scope="module")
+def explains():
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    async def run():
+        client = AsyncIOMotorClient(MONGODB_URI, serverSelectionTimeoutMS=500)
+        try:
+            await client.admin.command("ping")
+        except Exception as e:
+            client.close()
+            pytest.skip(f"no MongoDB at {MONGODB_URI}: {type(e).__name__}")
+
+        name = f"cropguard_test_{uuid.uuid4().hex[:8]}"
+        try:
+            return await _explain_all(client[name])
+        finally:
+            await client.drop_database(name)
+            client.close()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("shape", query_shapes(), ids=lambda shape: shape.name)
+def test_shape_is_index_backed(explains, shape):
+    problems, _, _ = _problems(shape, explains[shape.name])
+    assert not problems
+
+
+@pytest.mark.parametrize("shape", [s for s in query_shapes() if s.index == HISTORY_INDEX], ids=lambda s: s.name)
+def test_history_pages_seek_the_keyset_index_without_sorting(explains, shape):
+    _, stages, indexes = _problems(shape, explains[shape.name])
+    assert "IXSCAN" in stages
+    assert HISTORY_INDEX in indexes
+    assert "SORT" not in stages
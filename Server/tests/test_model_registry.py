@@ -0,0 +1,91 @@
+"""ModelRegistry: swapping models while requests are in flight."""
+
+import threading
+import time
+
+import numpy as np
+
+from app.services.model_registry import ModelHandle, ModelRegistry
+from app.services.preprocess import IMG_SIZE
+
+LEAF = np.zeros((IMG_SIZE[1], IMG_SIZE[0], 3), dtype=np.uint8)
+
+
+class _ConstantBackend:
+    name = "fake"
+
+    def __init__(self, label: int, classes: int = 3):
+        self.label = label
+        self.classes = classes
+
+    def run(self, batch: np.ndarray) -> np.ndarray:
+        probs = np.zeros((len(batch), self.classes), dtype=np.float32)
+        probs[:, self.label] = 1.0
+        return probs
+
+
+def _handle(tmp_path, label: int) -> ModelHandle:
+    source = tmp_path / f"model-{label}.pt"
+    source.write_bytes(b"x" * (label + 1))
+    handle = ModelHandle(_ConstantBackend(label), None, source, batching=True)
+    handle.start()
+    return handle
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_swap_drains_pinned_requests_before_retiring(tmp_path):
+    old, new = _handle(tmp_path, 0), _handle(tmp_path, 1)
+    registry = ModelRegistry(loader=lambda: None)
+    registry.swap(old)
+
+    pinned = threading.Event()
+    finish = threading.Event()
+    seen = []
+
+    def request():
+        with registry.use() as handle:
+            pinned.set()
+            finish.wait(5)
+            seen.append(int(handle.infer(LEAF).argmax()))
+
+    worker = threading.Thread(target=request)
+    worker.start()
+    assert pinned.wait(5)
+
+    registry.swap(new)
+    assert registry.current() is new
+    with registry.use() as handle:
+        assert int(handle.infer(LEAF).argmax()) == 1
+
+    # The old model keeps its batcher until the pinned request has finished on it
+    time.sleep(0.1)
+    assert old.batcher._thread is not None
+
+    finish.set()
+    worker.join(5)
+    assert seen == [0]
+    assert _wait_for(lambda: old.batcher._thread is None)
+    assert new.batcher._thread is not None
+    registry.close()
+
+
+def test_failed_reload_keeps_serving_model(tmp_path):
+    current = _handle(tmp_path, 0)
+
+    def broken_loader():
+        raise RuntimeError("corrupt model file")
+
+    registry = ModelRegistry(loader=broken_loader)
+    registry.swap(current)
+    assert registry.reload() is False
+    assert registry.current() is current
+    assert "corrupt" in registry.stats()["last_reload_error"]
+    registry.close()
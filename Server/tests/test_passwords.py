@@ -0,0 +1,116 @@
+"""check_password: verification and the needs_rehash migration signal."""
+
+import asyncio
+import hashlib
+import threading
+
+import pytest
+
+from app.services import passwords
+from app.services.passwords import check_password, hash_password
+
+
+@pytest.fixture(autouse=True)
+def cheap_kdf(monkeypatch):
+    # Real costs take tens of ms per hash; the formats and logic are the same
+    monkeypatch.setattr(passwords, "PASSWORD_KDF", "scrypt")
+    monkeypatch.setattr(passwords, "SCRYPT_N", 2 ** 10)
+    monkeypatch.setattr(passwords, "PBKDF2_ITERATIONS", 1000)
+    monkeypatch.setattr(passwords, "_dummy_hash", None)
+
+
+def test_current_hash_verifies_without_rehash():
+    hashed = hash_password("s3cret-pass")
+    assert hashed.startswith("scrypt$1024$")
+    assert check_password("s3cret-pass", hashed) == (True, False)
+    assert check_password("wrong-pass", hashed)[0] is False
+
+
+def test_raised_scrypt_cost_needs_rehash(monkeypatch):
+    hashed = hash_password("s3cret-pass")
+    monkeypatch.setattr(passwords, "SCRYPT_N", 2 ** 11)
+    assert check_password("s3cret-pass", hashed) == (True, True)
+
+
+def test_other_kdf_needs_rehash(monkeypatch):
+    monkeypatch.setattr(passwords, "PASSWORD_KDF", "pbkdf2")
+    hashed = hash_password("s3cret-pass")
+    assert hashed.startswith("pbkdf2_sha256$1000$")
+    assert check_password("s3cret-pass", hashed) == (True, False)
+
+    monkeypatch.setattr(passwords, "PASSWORD_KDF", "scrypt")
+    assert check_password("s3cret-pass", hashed) == (True, True)
+
+
+def test_legacy_sha256_hash_verifies_and_needs_rehash():
+    salt = "ab" * 16
+    legacy = f"{salt}${hashlib.sha256(f'{salt}s3cret-pass'.encode()).hexdigest()}"
+    assert check_password("s3cret-pass", legacy) == (True, True)
+    assert check_password("wrong-pass", legacy)[0] is False
+
+
+def test_login_upgrades_legacy_hash(client, mongo_db):
+    salt = "cd" * 16
+    legacy = f"{salt}${hashlib.sha256(f'{salt}s3cret-pass'.encode()).hexdigest()}"
+    client.portal.call(mongo_db.users.insert_one, {
+        "name": "Asha", "email": "asha@example.com", "password_hash": legacy, "role": "farmer",
+    })
+
+    response = client.post("/api/login", json={"email": "asha@example.com", "password": "s3cret-pass"})
+    assert response.status_code == 200
+
+    stored = client.portal.call(mongo_db.users.find_one, {"email": "asha@example.com"})
+    assert stored["password_hash"].startswith("scrypt$")
+    assert check_password("s3cret-pass", stored["password_hash"]) == (True, False)
+
+    # The upgraded hash still logs in, and is left alone this time
+    assert client.post("/api/login", json={"email": "asha@example.com", "password": "s3cret-pass"}).status_code == 200
+    again = client.portal.call(mongo_db.users.find_one, {"email": "asha@example.com"})
+    assert again["password_hash"] == stored["password_hash"]
+
+
+@pytest.mark.parametrize("garbage", ["", "nonsense", "scrypt$x$8$1$aa$bb", "pbkdf2_sha256$1$$"])
+def test_unreadable_hash_never_matches(garbage):
+    assert check_password("anything", garbage)[0] is False
+
+
+def test_unknown_email_still_runs_a_hash_check(client, monkeypatch):
+    checked = []
+    real_check = passwords.check_password
+
+    def spy(plain, hashed):
+        checked.append(hashed)
+        return real_check(plain, hashed)
+
+    monkeypatch.setattr(passwords, "check_password", spy)
+    response = client.post("/api/login", json={"email": "nobody@example.com", "password": "s3cret-pass"})
+    assert response.status_code == 401
+    assert checked == [passwords.dummy_hash()]
+    assert checked[0].startswith("scrypt$1024$")
+
+
+def test_cancelled_jobs_count_against_the_queue_until_they_finish(monkeypatch):
+    monkeypatch.setattr(passwords, "PASSWORD_HASH_QUEUE_LIMIT", 2)
+    release = threading.Event()
+
+    async def scenario():
+        # Two requests start a slow hash, then their clients disconnect
+        tasks = [asyncio.ensure_future(passwords._offload(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # The hashes are still running, so the queue is still full
+        with pytest.raises(passwords.PasswordHasherBusyError):
+            await passwords._offload(release.wait, 5)
+
+        release.set()
+        for _ in range(100):
+            if passwords.get_password_stats()["queue_depth"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert await passwords._offload(lambda: "ok") == "ok"
+
+    asyncio.run(scenario())
+    passwords.shutdown_password_pool()
@@ -0,0 +1,80 @@
+"""Near-duplicate keys: colour signature and low-texture rejection."""
+
+import io
+
+import numpy as np
+from PIL import Image
+
+from app.services.phash import NearDuplicateIndex, image_key
+
+
+def _textured(seed: int = 0, size: int = 224) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, 256, (14, 14, 3), dtype=np.uint8)
+    return np.asarray(Image.fromarray(coarse).resize((size, size), Image.Resampling.BILINEAR))
+
+
+def _jpeg_roundtrip(rgb: np.ndarray, quality: int = 70) -> np.ndarray:
+    buf = io.BytesIO()
+    Image.fromarray(rgb).save(buf, format="JPEG", quality=quality)
+    return np.asarray(Image.open(io.BytesIO(buf.getvalue())).convert("RGB"))
+
+
+def test_flat_images_have_no_key():
+    for colour in [(0, 0, 0), (255, 255, 255), (40, 160, 40), (200, 180, 30)]:
+        assert image_key(np.full((224, 224, 3), colour, dtype=np.uint8)) is None
+
+
+def test_low_texture_gradient_has_no_key():
+    ramp = np.linspace(90, 110, 224, dtype=np.uint8)
+    rgb = np.stack([np.tile(ramp, (224, 1))] * 3, axis=-1)
+    assert image_key(rgb) is None
+
+
+def test_recompressed_image_matches():
+    index = NearDuplicateIndex(threshold=12, max_entries=16, ttl=3600)
+    rgb = _textured()
+    index.add(image_key(rgb), "original")
+    assert index.lookup(image_key(_jpeg_roundtrip(rgb))) == "original"
+
+
+def test_resized_image_matches():
+    index = NearDuplicateIndex(threshold=12, max_entries=16, ttl=3600)
+    rgb = _textured()
+    index.add(image_key(rgb), "original")
+    smaller = np.asarray(Image.fromarray(rgb).resize((160, 160), Image.Resampling.LANCZOS))
+    assert index.lookup(image_key(smaller)) == "original"
+
+
+def test_same_structure_different_colour_does_not_match():
+    index = NearDuplicateIndex(threshold=12, max_entries=16, ttl=3600)
+    texture = _textured()[..., :1].astype(np.float32) / 255
+    green = (texture * [60, 200, 60]).astype(np.uint8)
+    yellow = (texture * [200, 190, 40]).astype(np.uint8)
+    index.add(image_key(green), "healthy")
+
+    key = image_key(yellow)
+    assert key is not None and key[0] != image_key(green)[0]
+    assert index.lookup(key) is None
+
+
+def test_distinct_images_do_not_match():
+    index = NearDuplicateIndex(threshold=12, max_entries=16, ttl=3600)
+    index.add(image_key(_textured(0)), "first")
+    assert index.lookup(image_key(_textured(1))) is None
+
+
+def test_expired_nearest_match_falls_back_to_live_candidate(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.services.phash.time.time", lambda: clock[0])
+    index = NearDuplicateIndex(threshold=12, max_entries=16, ttl=60)
+    original = image_key(_textured())
+    one_bit_off = (original[0], original[1] ^ 1)
+
+    index.add(original, "stale")
+    clock[0] += 50
+    index.add(one_bit_off, "fresh")
+    clock[0] += 20
+
+    assert index.lookup(original) == "fresh"
+    assert index.stats()["entries"] == 1
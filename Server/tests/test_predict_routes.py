@@ -0,0 +1,113 @@
+"""Batch, stream and single-image uploads: zip extraction failures, upload validation and item encoding."""
+
+import io
+import json
+import zipfile
+
+import numpy as np
+from PIL import Image
+
+
+def _jpeg(seed: int = 0) -> bytes:
+    rgb = np.random.default_rng(seed).integers(0, 256, (64, 64, 3), dtype=np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(rgb).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def _zip(entries: dict[str, bytes], compression: int = zipfile.ZIP_DEFLATED) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return buf.getvalue()
+
+
+def _corrupt_entry(archive: bytes, name: str) -> bytes:
+    """Flip bytes inside ``name``'s deflate stream so inflating it fails."""
+    data = bytearray(archive)
+    info = zipfile.ZipFile(io.BytesIO(archive)).getinfo(name)
+    start = info.header_offset + 30 + len(name.encode()) + len(info.extra)
+    for i in range(start + 10, start + 40):
+        data[i] ^= 0xFF
+    return bytes(data)
+
+
+def _mark_encrypted(archive: bytes, name: str) -> bytes:
+    """Set the encryption flag on ``name``; zipfile cannot write encrypted entries itself."""
+    data = bytearray(archive)
+    info = zipfile.ZipFile(io.BytesIO(archive)).getinfo(name)
+    data[info.header_offset + 6] |= 0x1  # local file header
+    central = data.index(b"PK\x01\x02")
+    while data[central + 46:central + 46 + len(name)] != name.encode():
+        central = data.index(b"PK\x01\x02", central + 4)
+    data[central + 8] |= 0x1  # central directory header
+    return bytes(data)
+
+
+def _results(client, archive: bytes) -> dict[str, str | None]:
+    response = client.post("/api/predict/batch", files=[("files", ("plot.zip", archive, "application/zip"))])
+    assert response.status_code == 200
+    return {r["filename"]: r["error"] for r in response.json()["results"]}
+
+
+def test_corrupt_entry_fails_alone(client):
+    noise = np.random.default_rng(1).integers(0, 256, 20000, dtype=np.uint8).tobytes()
+    archive = _corrupt_entry(_zip({"bad.jpg": noise, "good.jpg": _jpeg()}), "bad.jpg")
+    results = _results(client, archive)
+    assert results["good.jpg"] is None
+    assert "extracted" in results["bad.jpg"]
+
+
+def test_encrypted_entry_fails_alone(client):
+    archive = _mark_encrypted(_zip({"secret.jpg": _jpeg(1), "good.jpg": _jpeg()}), "secret.jpg")
+    results = _results(client, archive)
+    assert results["good.jpg"] is None
+    assert "extracted" in results["secret.jpg"]
+
+
+def test_endpoints_apply_the_same_type_rule(client):
+    # A real JPEG, but not declared as an image: rejected everywhere
+    upload = ("leaf.jpg", _jpeg(), "application/octet-stream")
+
+    single = client.post("/api/predict", files={"file": upload})
+    assert single.status_code == 400
+    expected = single.json()["detail"]
+
+    batch = client.post("/api/predict/batch", files=[("files", upload)])
+    assert batch.json()["results"][0]["error"] == expected
+
+    stream = client.post("/api/predict/batch/stream", files=[("files", upload)])
+    first = json.loads(stream.text.splitlines()[0])
+    assert first["error"] == expected
+
+    gif = ("leaf.gif", _jpeg(), "image/gif")
+    assert client.post("/api/predict", files={"file": gif}).status_code == 400
+    assert "Unsupported file type '.gif'" in client.post("/api/predict/batch", files=[("files", gif)]).json()["results"][0]["error"]
+
+
+def test_endpoints_render_items_identically(client, monkeypatch):
+    from app.routes import predict_routes
+    from app.services import ml_service
+    from app.services.payloads import dumps
+
+    # Rice blast's text has en/em dashes and a degree sign
+    result = {**ml_service._DISEASE_FIELDS["Rice___Blast"], "confidence": 91, "class_key": "Rice___Blast",
+              "model_version": "test"}
+    monkeypatch.setattr(predict_routes, "predict", lambda data: dict(result))
+    monkeypatch.setattr(predict_routes, "predict_many", lambda items: [dict(result) for _ in items])
+    upload = ("leaf.jpg", _jpeg(), "image/jpeg")
+
+    single = client.post("/api/predict", files={"file": upload})
+    batch = client.post("/api/predict/batch", files=[("files", upload)])
+    stream = client.post("/api/predict/batch/stream", files=[("files", upload)])
+    assert single.status_code == batch.status_code == stream.status_code == 200
+
+    description = dumps(result["description"])
+    for body in (single.content, batch.content, stream.content):
+        assert description in body
+
+    expected = single.json()
+    expected.pop("created_at")
+    for item in (batch.json()["results"][0], json.loads(stream.content.splitlines()[0])):
+        assert {k: item[k] for k in expected} == expected
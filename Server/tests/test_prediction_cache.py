@@ -0,0 +1,35 @@
+"""Prediction cache keys: everything that changes a result changes the key."""
+
+from app.services import ml_service, prediction_cache
+from app.services.model_registry import ModelHandle
+from app.services.prediction_cache import PredictionCache
+
+IMAGE = b"leaf-bytes"
+
+
+def _handle(tmp_path, class_map: dict) -> ModelHandle:
+    source = tmp_path / "model.pt"
+    if not source.exists():
+        source.write_bytes(b"weights")
+    return ModelHandle(None, class_map, source, batching=False, classes=ml_service._resolve_classes(class_map))
+
+
+def test_class_map_changes_the_key(tmp_path):
+    original = _handle(tmp_path, {"0": "Rice___Blast", "1": "Rice___Healthy"})
+    reordered = _handle(tmp_path, {"0": "Rice___Healthy", "1": "Rice___Blast"})
+    assert original.version == reordered.version
+    assert PredictionCache.make_key(IMAGE, original.version, original.classes_digest) != \
+        PredictionCache.make_key(IMAGE, reordered.version, reordered.classes_digest)
+
+
+def test_same_setup_gives_the_same_key(tmp_path):
+    first = _handle(tmp_path, {"0": "Rice___Blast"})
+    second = _handle(tmp_path, {"0": "Rice___Blast"})
+    assert PredictionCache.make_key(IMAGE, first.version, first.classes_digest) == \
+        PredictionCache.make_key(IMAGE, second.version, second.classes_digest)
+
+
+def test_resize_mode_changes_the_key(monkeypatch):
+    lanczos = PredictionCache.make_key(IMAGE, "model.pt@1", "digest")
+    monkeypatch.setattr(prediction_cache, "DEFAULT_RESIZE_MODE", "bilinear")
+    assert PredictionCache.make_key(IMAGE, "model.pt@1", "digest") != lanczos